@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Benchmark del registro SensorReading del Sistema SIEPA
+Compara, por ciclo, el flujo anterior basado en diccionarios (dict de lectura nuevo,
+copia al publicar y seis dicts individuales, cada uno con json.dumps) contra el
+registro con __slots__, to_payload() en el borde y las plantillas de MQTTManager
+reutilizadas: tiempo, memoria transitoria por ciclo (tracemalloc), colecciones del GC
+por generación (gc.get_stats) y memoria retenida al conservar lecturas.
+Ambos flujos producen los mismos mensajes
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+# Agregar el directorio actual al path para imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from core.sensors.reading import SensorReading
+from core.mqtt.mqtt_manager import MQTTManager
+
+# Valores de una lectura típica
+VALUES = {
+    'temperature': 24.0, 'humidity': 55.0, 'dht11_timestamp': 1.7e9, 'dht11_age': 0.4,
+    'dht11_stale': False, 'dht11_from_cache': True, 'distance': 120.5, 'distance_spread': None,
+    'light': False, 'light_lux': 850.0, 'light_voltage': 1.9, 'air_quality_bad': False,
+    'air_quality_ppm': 320, 'air_quality_voltage': 1.2, 'pressure': 1012.4, 'no_hay_luz': True,
+    'mode': 'testing', 'buzzer_state': False, 'buzzer_manual_control': False,
+    'acquisition_mode': 'sequential',
+}
+AGES = {'dht11': 0.4, 'ultrasonic': 0.0, 'ldr': 0.0, 'mq135': 0.0, 'bmp180': 0.0}
+
+
+def sink(topic_key, data):
+    """Destino de publicación del flujo anterior: solo serializa"""
+    return json.dumps(data)
+
+
+
+
+def legacy_cycle(v):
+    """Flujo anterior: dict nuevo por ciclo, copia al publicar y un dict por tópico"""
+    sensor_data = {**v, 'timestamp': time.time(), 'reading_age': AGES}
+    sensor_data['buzzer_state'] = False
+    sensor_data['motor_state'] = False
+    json.dumps({**sensor_data, 'mode': 'testing', 'timestamp': time.time(), 'system': 'SIEPA'})
+    now = time.time()
+    sink('TEMPERATURE', {'valor': round(sensor_data.get('temperature'), 2), 'unidad': '°C', 'timestamp': now,
+                         'sensor_type': 'Temperatura', 'evaluationType': 'temperature', 'sample_rate_hz': None,
+                         'evalValue': sensor_data.get('temperature'),
+                         'sample_timestamp': sensor_data.get('dht11_timestamp'),
+                         'stale': sensor_data.get('dht11_stale', False)})
+    sink('HUMIDITY', {'valor': round(sensor_data.get('humidity'), 2), 'unidad': '%', 'timestamp': now,
+                      'sensor_type': 'Humedad', 'evaluationType': 'humidity', 'sample_rate_hz': None,
+                      'evalValue': sensor_data.get('humidity'),
+                      'sample_timestamp': sensor_data.get('dht11_timestamp'),
+                      'stale': sensor_data.get('dht11_stale', False)})
+    sink('DISTANCE', {'valor': round(sensor_data.get('distance'), 2), 'unidad': 'cm', 'timestamp': now,
+                      'sensor_type': 'Distancia', 'evaluationType': 'distance', 'sample_rate_hz': None,
+                      'evalValue': sensor_data.get('distance')})
+    sink('LIGHT', {'valor': round(sensor_data.get('light_lux', 0), 1), 'unidad': 'lux', 'timestamp': now,
+                   'sensor_type': 'Luz', 'evaluationType': 'light', 'evalValue': sensor_data.get('light_lux', 0),
+                   'sample_rate_hz': None,
+                   'detectada': sensor_data.get('light', False),
+                   'voltage': round(sensor_data.get('light_voltage', 0), 3),
+                   'extra_data': {'lux_value': sensor_data.get('light_lux', 0),
+                                  'detection_status': sensor_data.get('light', False),
+                                  'raw_voltage': sensor_data.get('light_voltage', 0)}})
+    sink('AIR_QUALITY', {'valor': round(sensor_data.get('air_quality_ppm', 0), 1), 'unidad': 'ppm',
+                         'timestamp': now, 'sensor_type': 'Calidad del Aire', 'evaluationType': 'air_quality',
+                         'evalValue': sensor_data.get('air_quality_ppm', 0), 'sample_rate_hz': None,
+                         'malo': sensor_data.get('air_quality_bad', False),
+                         'voltage': round(sensor_data.get('air_quality_voltage', 0), 3),
+                         'extra_data': {'ppm_value': sensor_data.get('air_quality_ppm', 0),
+                                        'bad_air_status': sensor_data.get('air_quality_bad', False),
+                                        'raw_voltage': sensor_data.get('air_quality_voltage', 0)}})
+    sink('PRESSURE', {'valor': round(sensor_data.get('pressure'), 1), 'unidad': 'hPa', 'timestamp': now,
+                      'sensor_type': 'Presión', 'evaluationType': 'pressure', 'sample_rate_hz': None,
+                      'evalValue': sensor_data.get('pressure')})
+
+
+def make_record_cycle():
+    """Flujo actual: un SensorReading por ciclo (como el runtime asyncio), to_payload() y plantillas MQTT"""
+    publisher = MQTTManager.__new__(MQTTManager)
+    publisher.mode = 'testing'
+    publisher._topic_payloads = MQTTManager._build_topic_payloads()
+    publisher._publish_topic_data = sink
+
+    def record_cycle(v):
+        r = SensorReading()
+        r.temperature = v['temperature']
+        r.humidity = v['humidity']
+        r.dht11_timestamp = v['dht11_timestamp']
+        r.dht11_age = v['dht11_age']
+        r.dht11_stale = v['dht11_stale']
+        r.dht11_from_cache = v['dht11_from_cache']
+        r.distance = v['distance']
+        r.distance_spread = v['distance_spread']
+        r.light = v['light']
+        r.light_lux = v['light_lux']
+        r.light_voltage = v['light_voltage']
+        r.air_quality_bad = v['air_quality_bad']
+        r.air_quality_ppm = v['air_quality_ppm']
+        r.air_quality_voltage = v['air_quality_voltage']
+        r.pressure = v['pressure']
+        r.no_hay_luz = v['no_hay_luz']
+        r.mode = v['mode']
+        r.timestamp = time.time()
+        r.buzzer_state = v['buzzer_state']
+        r.buzzer_manual_control = v['buzzer_manual_control']
+        r.acquisition_mode = v['acquisition_mode']
+        r.reading_age = AGES
+        r.motor_state = False
+        json.dumps(r.to_payload(mode='testing', timestamp=time.time(), system='SIEPA'))
+        publisher._publish_individual_readings(r)
+
+    return record_cycle
+
+
+def gc_collections(cycle, cycles):
+    """
+    Colecciones del GC por generación (gc.get_stats) al ejecutar cycles ciclos con los
+    umbrales normales: mide cuánto trabajo extra genera cada flujo para el GC cíclico
+    """
+    gc.collect()
+    before = [generation['collections'] for generation in gc.get_stats()]
+    for _ in range(cycles):
+        cycle(VALUES)
+    return [generation['collections'] - count for generation, count in zip(gc.get_stats(), before)]
+
+
+def run(name, cycle, cycles):
+    """Ejecuta un flujo y mide tiempo, pico de memoria transitoria y churn del GC por ciclo"""
+    cycle(VALUES)  # Calentamiento: crea las estructuras reutilizables
+    gc.collect()
+    best = None
+    for _ in range(3):  # Mejor de tres rondas (menos ruido del sistema)
+        started = time.perf_counter()
+        for _ in range(cycles):
+            cycle(VALUES)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+
+    # Pico transitorio de un ciclo y bloques que siguen vivos tras 1000 ciclos (fugas)
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+    cycle(VALUES)
+    peak = tracemalloc.get_traced_memory()[1] - base
+    for _ in range(1000):
+        cycle(VALUES)
+    gc.collect()
+    growth = sum(stat.count_diff for stat in tracemalloc.take_snapshot().compare_to(before, 'filename')
+                 if stat.count_diff > 0 and 'tracemalloc' not in str(stat.traceback))
+    tracemalloc.stop()
+
+    collections = gc_collections(cycle, 10000)
+    print(f"{name:<14} {best / cycles * 1e6:8.1f} µs/ciclo   pico por ciclo: {peak:6d} B   "
+          f"bloques retenidos tras 1000 ciclos: {growth}   "
+          f"colecciones GC gen0/1/2 en 10000 ciclos: {'/'.join(map(str, collections))}")
+    return best, peak, collections
+
+
+def retained(make, count):
+    """Memoria retenida al conservar count lecturas"""
+    gc.collect()
+    tracemalloc.start()
+    kept = [make() for _ in range(count)]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark dict vs SensorReading por ciclo')
+    parser.add_argument('--cycles', type=int, default=100000, help='Ciclos por flujo')
+    parser.add_argument('--keep', type=int, default=1000, help='Lecturas conservadas para medir memoria retenida')
+    args = parser.parse_args()
+
+    legacy_dict = {**VALUES, 'timestamp': 0.0, 'reading_age': AGES, 'motor_state': False}
+    record = SensorReading(**legacy_dict)
+    print(f"📏 Tamaño del contenedor: dict {sys.getsizeof(legacy_dict)} B, "
+          f"SensorReading {sys.getsizeof(record)} B")
+    print(f"🔁 {args.cycles} ciclos por flujo\n")
+
+    legacy_time, legacy_peak, legacy_gc = run('dict', legacy_cycle, args.cycles)
+    record_time, record_peak, record_gc = run('SensorReading', make_record_cycle(), args.cycles)
+
+    legacy_kept = retained(lambda: dict(legacy_dict), args.keep)
+    record_kept = retained(record.copy, args.keep)
+    print(f"\n💾 {args.keep} lecturas conservadas: dict {legacy_kept / 1024:.1f} KiB, "
+          f"SensorReading {record_kept / 1024:.1f} KiB")
+    print(f"⚡ Tiempo: {legacy_time / record_time:.2f}x   "
+          f"Pico por ciclo: {legacy_peak} B -> {record_peak} B   "
+          f"Colecciones gen0: {legacy_gc[0]} -> {record_gc[0]}")
+
+
+if __name__ == "__main__":
+    main()
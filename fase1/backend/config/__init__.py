@@ -8,6 +8,9 @@ from .settings import (
     MQTT_CONFIG,
     SYSTEM_CONFIG,
     SIMULATION_RANGES,
+    SIMULATION_CONFIG,
+    EMULATION_CONFIG,
+    CALIBRATION_CONFIG,
     ALERT_CONFIG,
     SENSOR_THRESHOLDS
 )
@@ -18,6 +21,9 @@ __all__ = [
     'MQTT_CONFIG',
     'SYSTEM_CONFIG',
     'SIMULATION_RANGES',
+    'SIMULATION_CONFIG',
+    'EMULATION_CONFIG',
+    'CALIBRATION_CONFIG',
     'ALERT_CONFIG',
     'SENSOR_THRESHOLDS'
 ] 
\ No newline at end of file
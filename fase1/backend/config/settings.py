@@ -6,10 +6,16 @@ Configuración centralizada del Sistema SIEPA
 SENSOR_CONFIG = {
     # DHT11 - Temperatura y Humedad
     'DHT11_PIN': 4,
+    'DHT11_MIN_INTERVAL': 1.0,  # s - el DHT11 no admite consultas más frecuentes
+    'DHT11_STALE_AFTER': 5.0,   # s - la lectura en caché se marca como vieja
+    'DHT11_MAX_AGE': 60.0,      # s - la lectura en caché se descarta
     
     # HC-SR04 - Ultrasonico
     'ULTRASONIC_TRIG_PIN': 23,
     'ULTRASONIC_ECHO_PIN': 24,
+    'ULTRASONIC_TIMEOUT': 0.04,        # s - espera máxima del eco (~38 ms sin obstáculo)
+    'ULTRASONIC_BURST_SIZE': 1,        # Disparos por lectura; > 1 devuelve la mediana
+    'ULTRASONIC_PING_INTERVAL': 0.06,  # s - separación entre disparos de una ráfaga
     
     # LDR - Fotorresistencia (MCP3008 Canal 0)
     'LDR_CHANNEL': 0,
@@ -17,6 +23,12 @@ SENSOR_CONFIG = {
     # MQ135 - Calidad del aire (MCP3008 Canal 1)
     'MQ135_CHANNEL': 1,
     
+    # MCP3008 - Front-end del ADC (todos los canales en una ráfaga por ciclo)
+    'ADC_EXTRA_CHANNELS': {},   # Canales adicionales: {'nombre': canal}
+    'ADC_VREF': 3.3,            # V - referencia del MCP3008
+    'ADC_OVERSAMPLE': 8,        # Conversiones por canal (promedio recortado)
+    'ADC_BURST_MAX_AGE': 0.05,  # s - reutilizar la ráfaga si es más reciente que esto
+    
     # Buzzer
     'BUZZER_PIN': 22,
     
@@ -31,12 +43,114 @@ SENSOR_CONFIG = {
     'LED_AIRE': 19,     # LED Azul - Calidad del aire
     
     # BMP180 - Sensor de presión
+    'BMP180_I2C_BUS': 1,
     'BMP180_SEA_LEVEL_PRESSURE': 1013.25,  # hPa
     
+    # Circuit breaker de dispositivos (BMP180, DHT11, MCP3008)
+    'CIRCUIT_BREAKER': {
+        'FAILURE_THRESHOLD': 3,  # Fallos consecutivos que abren el circuito
+        'BASE_BACKOFF': 2.0,     # s - primera espera antes de reintentar
+        'MAX_BACKOFF': 120.0,    # s - espera máxima (se duplica en cada apertura)
+    },
+    
+    # Adquisición: 'sequential' (todos los sensores en el loop), 'concurrent' (un hilo por sensor)
+    # 'scheduled' (un hilo con cola de vencimientos, cada sensor con su intervalo) o 'adaptive'
+    # (como 'scheduled', con intervalos que siguen la velocidad de cambio de cada señal)
+    'ACQUISITION_MODE': 'sequential',
+    
+    # Intervalo de muestreo por sensor (segundos) para los modos 'concurrent' y 'scheduled'
+    'SAMPLE_INTERVALS': {
+        'dht11': 2.0,
+        'ultrasonic': 1.0,
+        'ldr': 1.0,
+        'mq135': 0.25,
+        'bmp180': 10.0,
+    },
+    'MIN_SAMPLE_INTERVAL': 0.05,  # Límite inferior aceptado por comando MQTT
+    
+    # Muestreo adaptativo (modo 'adaptive'): el intervalo se multiplica por SPEEDUP cuando la
+    # señal cambia más rápido que CHANGE_THRESHOLD (unidades/s) y por SLOWDOWN cuando cambia
+    # más lento que STABLE_THRESHOLD, entre MIN_INTERVAL y MAX_INTERVAL.
+    # Luz y aire se miden en voltaje (V/s); DHT11 en °C/s y %/s.
+    'ADAPTIVE_SAMPLING': {
+        'dht11': {'MIN_INTERVAL': 2.0, 'MAX_INTERVAL': 30.0, 'CHANGE_THRESHOLD': 0.05, 'STABLE_THRESHOLD': 0.01},
+        'ultrasonic': {'MIN_INTERVAL': 0.25, 'MAX_INTERVAL': 5.0, 'CHANGE_THRESHOLD': 5.0, 'STABLE_THRESHOLD': 0.5},
+        'ldr': {'MIN_INTERVAL': 0.5, 'MAX_INTERVAL': 10.0, 'CHANGE_THRESHOLD': 0.05, 'STABLE_THRESHOLD': 0.005},
+        'mq135': {'MIN_INTERVAL': 0.25, 'MAX_INTERVAL': 10.0, 'CHANGE_THRESHOLD': 0.01, 'STABLE_THRESHOLD': 0.002},
+        'bmp180': {'MIN_INTERVAL': 5.0, 'MAX_INTERVAL': 60.0, 'CHANGE_THRESHOLD': 0.05, 'STABLE_THRESHOLD': 0.005},
+    },
+    
+    # Plazo máximo por lectura de dispositivo (segundos); al vencer la lectura se abandona,
+    # se reporta como timeout y el ciclo publica el resto de los datos
+    'READ_DEADLINES': {
+        'dht11': 1.0,
+        'ultrasonic': 0.3,
+        'ldr': 0.3,
+        'mq135': 0.3,
+        'bmp180': 0.5,
+    },
+    'READ_DEADLINE_DEFAULT': 1.0,
+    'READ_WORKERS': None,  # Hilos del pool de lecturas (None = una por fuente + 1)
+    
+    # Salud de sensores: contadores y latencias por fuente en una ventana deslizante.
+    # Una fuente está 'degraded' o 'failing' según la fracción de lecturas sin éxito
+    'HEALTH': {
+        'WINDOW': 300.0,          # s - ventana de los contadores y percentiles
+        'BUCKET': 10.0,           # s - resolución de la ventana
+        'DEGRADED_RATE': 0.1,
+        'FAILING_RATE': 0.5,
+        'STALE_FACTOR': 3.0,      # Valor viejo: edad mayor a STALE_FACTOR x su intervalo de muestreo
+        'PUBLISH_INTERVAL': 30.0, # s - publicación en TOPICS['HEALTH']
+        'LOG_INTERVAL': 10,       # s - resumen en consola de fuentes con problemas
+    },
+    
+    # Filtrado entre adquisición y evaluación de alertas, por sensor lógico.
+    # Etapa o lista de etapas: {'type': 'median', 'window': N}, {'type': 'ema', 'alpha': a}
+    # o {'type': 'hampel', 'window': N, 'threshold': k, 'min_deviation': d}.
+    # Luz y aire se filtran en voltaje.
+    'FILTERS': {
+        'temperature': {'type': 'median', 'window': 3},
+        'humidity': {'type': 'median', 'window': 3},
+        'distance': {'type': 'hampel', 'window': 7, 'threshold': 3.0, 'min_deviation': 2.0},
+        'light': {'type': 'median', 'window': 3},
+        'air_quality': [
+            {'type': 'hampel', 'window': 9, 'threshold': 3.0, 'min_deviation': 0.05},
+            {'type': 'ema', 'alpha': 0.5},
+        ],
+        'pressure': {'type': 'ema', 'alpha': 0.3},
+    },
+    
     # Intervalos de lectura (segundos)
-    'READ_INTERVAL': 2,
+    'READ_INTERVAL': 1,         # Periodo del loop principal
     'DISPLAY_REFRESH': 2,
     'ALERT_DURATION': 5,  # Duración de activación de LEDs
+    'BUZZER_HOLD': 10.0,  # s - el buzzer automático se apaga si no se renueva en este plazo
+    
+    # Rueda de temporizadores de salidas (apagado de LEDs de alerta y buzzer)
+    'TIMER_TICK': 0.01,   # s - resolución de la rueda
+    'TIMER_SLOTS': 512,   # Ranuras de la rueda (una vuelta = TICK * SLOTS)
+    
+    # Patrones animados de LEDs (chase, blink, breathe, strobe o tablas de cuadros por MQTT)
+    'LED_PWM_PERIOD': 0.01,         # s - periodo del PWM por software (respiración)
+    'LED_PATTERN_MAX_FRAMES': 256,  # Cuadros máximos de un patrón recibido por MQTT
+    
+    # Inyección de fallos (pruebas de degradación): por dispositivo, probabilidad por operación
+    # de IO_ERROR, LATENCY (+LATENCY_S), STUCK (valor congelado STUCK_S), OUT_OF_RANGE y
+    # DISCONNECT (DISCONNECT_S sin responder, también al re-inicializar). Dispositivos:
+    # dht11, ultrasonic, ldr, mq135, bmp180 y las salidas buzzer, motor y leds (modo real)
+    'FAULT_INJECTION': {
+        'ENABLED': False,
+        'SEED': None,
+        'TARGETS': {
+            'dht11': {'IO_ERROR': 0.2},
+            'ultrasonic': {'IO_ERROR': 0.05, 'OUT_OF_RANGE': 0.02},
+            'ldr': {'IO_ERROR': 0.02, 'OUT_OF_RANGE': 0.02},
+            'mq135': {'IO_ERROR': 0.02, 'STUCK': 0.01, 'STUCK_S': 15.0},
+            'bmp180': {'IO_ERROR': 0.05, 'LATENCY': 0.05, 'LATENCY_S': 0.8, 'DISCONNECT': 0.005},
+            'buzzer': {'IO_ERROR': 0.01},
+            'motor': {'STUCK': 0.01, 'STUCK_S': 20.0},
+        },
+    },
 }
 
 # ============== CONFIGURACIÓN DE DISPLAY ==============
@@ -44,6 +158,8 @@ DISPLAY_CONFIG = {
     'LCD_I2C_ADDRESS': 0x27,
     'LCD_COLS': 20,
     'LCD_ROWS': 4,
+    'LCD_I2C_BUS': 1,          # Bus compartido con el BMP180 (mismo gestor de bus)
+    'LCD_BATCH_WRITES': True,  # Agrupar los bytes del PCF8574 en una transacción por actualización
 }
 
 # ============== CONFIGURACIÓN MQTT ==============
@@ -69,6 +185,7 @@ MQTT_CONFIG = {
         'MOTOR': 'GRUPO2/actuadores/rasp01/motor',
         'FAN': 'GRUPO2/actuadores/rasp01/fan',  # Alias para el motor
         'HISTORY': 'GRUPO2/history/rasp01',  # Para datos históricos
+        'HEALTH': 'GRUPO2/status/rasp01/health',  # Salud de sensores (retenido)
     },
     'QOS': 1,
     'RETAIN': False,
@@ -80,6 +197,16 @@ SYSTEM_CONFIG = {
     'DEBUG': True,
     'LOG_LEVEL': 'INFO',
     'VERSION': '1.0.0',
+    'DEVICE_ID': 'rasp01',  # Selecciona los ajustes de CALIBRATION_CONFIG['DEVICES']
+    'RUNTIME': 'asyncio',   # 'asyncio' (tareas en un event loop) o 'threaded' (loop bloqueante)
+    'ASYNC_RUNTIME': {
+        'HOUSEKEEPING_INTERVAL': 1.0,  # s - revisión de tareas periódicas (salud de sensores)
+    },
+    'LOOP': {
+        # Periodo fijo SENSOR_CONFIG['READ_INTERVAL'] sobre vencimientos monotónicos
+        'OVERRUN_POLICY': 'skip',  # 'skip' (saltar ciclos perdidos) o 'compress' (recuperarlos seguidos)
+        'MAX_CATCH_UP': 3,         # Ciclos atrasados que 'compress' recupera antes de saltar el resto
+    },
 }
 
 # ============== RANGOS DE SIMULACIÓN ==============
@@ -92,14 +219,105 @@ SIMULATION_RANGES = {
     'PRESSURE': {'min': 1000, 'max': 1030},  # hPa
 }
 
+# ============== CALIBRACIÓN DE SENSORES ANALÓGICOS ==============
+CALIBRATION_CONFIG = {
+    'LDR': {
+        'VCC': 3.3,            # Voltaje de alimentación del divisor
+        'MAX_LUX': 2000,       # Lux con voltaje mínimo (luz intensa)
+        'BRIGHT_MARGIN': 0.1,  # Voltajes <= margen = máxima luz
+        'DARK_MARGIN': 0.1,    # Voltajes >= VCC - margen = sin luz
+    },
+    'MQ135': {
+        'VC': 3.3,             # Voltaje del circuito del sensor
+        'RL': 10.0,            # Resistencia de carga (kΩ)
+        'R0': 23.41,           # Resistencia en aire limpio (kΩ); 1.32V ≈ 400 ppm
+        'A': 116.6020682,      # Curva ppm = A * (Rs/R0)^B (datasheet, CO2)
+        'B': -2.769034857,
+        'MAX_PPM': 2000,       # Saturación de la curva
+    },
+    # Ajustes por dispositivo (SYSTEM_CONFIG['DEVICE_ID']), p. ej. R0 medido en aire limpio
+    'DEVICES': {
+        'rasp01': {},
+    },
+}
+
+# ============== MOTOR DE SIMULACIÓN ==============
+SIMULATION_CONFIG = {
+    'ENGINE': 'realistic',        # 'realistic' (NumPy, series correlacionadas) o 'uniform'
+    'SEED': None,                 # Semilla para reproducir una simulación
+    'BLOCK_SIZE': 256,            # Pasos generados por bloque
+    'TIME_STEP': 1.0,             # s - resolución de la serie
+    'WALK_PERSISTENCE': 0.98,     # Coeficiente AR(1) del paseo aleatorio
+    'CORRELATIONS': {             # Correlación del ruido entre sensores
+        ('temperature', 'humidity'): -0.6,
+        ('temperature', 'light'): 0.4,
+        ('humidity', 'light'): -0.3,
+        ('humidity', 'pressure'): -0.2,
+    },
+    'POLLUTION_EVENT_RATE': 1 / 900,  # Eventos por segundo (~1 cada 15 min)
+    'POLLUTION_EVENT_PPM': 400,       # ppm medios añadidos por evento
+    'POLLUTION_EVENT_DECAY': 120,     # s - constante de caída del evento
+}
+
+# ============== HARDWARE EMULADO ==============
+EMULATION_CONFIG = {
+    'TIME_SCALE': 1.0,            # 1 = tiempos reales del hardware, 0 = sin esperas (distancias sin sentido)
+    'SEED': None,                 # Semilla de ruido y fallos
+    'I2C_FREQUENCY': 100000,      # Hz - I2C estándar
+    'I2C_OVERHEAD': 0.00005,      # s por transacción (ioctl, start/stop)
+    'SPI_FREQUENCY': 1350000,     # Hz - máximo del MCP3008 a 3.3 V
+    'SPI_OVERHEAD': 0.00002,      # s por transacción
+    'LCD_ADDRESS': 0x27,          # PCF8574 del LCD
+    'BMP180_ADDRESS': 0x77,
+    'DHT_START_SIGNAL': 0.018,    # s - pulso bajo de inicio del host
+    'DHT_BIT_TIME': 0.0001,       # s - respuesta + 40 bits de ~100 us
+    'DHT_FAILURE_RATE': 0.05,     # Fracción de lecturas con error de checksum
+    'DHT_MIN_INTERVAL': 2.0,      # s - la librería no vuelve a medir antes
+    'BMP180_TEMP_CONVERSION': 0.0045,
+    'BMP180_PRESSURE_CONVERSION': 0.0075,
+    'ULTRASONIC_TRIGGER_DELAY': 0.0005,  # s - ráfaga de 40 kHz antes de subir ECHO
+    'ULTRASONIC_MAX_RANGE': 400,         # cm - más lejos no hay eco
+    'ULTRASONIC_NO_ECHO_PULSE': 0.038,   # s - pulso de ECHO sin obstáculo
+}
+
 # ============== CONFIGURACIÓN DE ALERTAS ==============
 ALERT_CONFIG = {
-    'TEMPERATURE': {'min': 15, 'max': 30},  # °C - Activar LED si está fuera del rango
-    'HUMIDITY': {'min': 30, 'max': 80},     # % - Activar LED si está fuera del rango
-    'LIGHT': {'max': 900},                  # lux - Activar LED si > 900
-    'AIR_QUALITY': {'max': 400},            # ppm - Activar LED y buzzer si > 400
-    'BUZZER_ON_BAD_AIR': True,
-    'LED_ALERT_DURATION': 5,  # segundos
+    # Reglas declarativas, compiladas por core.alerts.AlertEngine en una tabla plana y
+    # evaluadas todas en una pasada por lectura (recargables sin reiniciar)
+    #   sensor: grupo de la alerta (estado de LED publicado, campo 'sensor' de la alerta MQTT)
+    #   field: atributo de la lectura comparado (por defecto el sensor)
+    #   op / threshold: comparación ('>', '>=', '<', '<=', '==', '!=')
+    #   severity: 'info', 'warning' o 'danger'
+    #   led: pin o clave de SENSOR_CONFIG; lcd: texto del LCD y la consola
+    #   message: texto de la alerta MQTT ({value}, {threshold})
+    #   actions: 'led', 'lcd', 'mqtt', 'buzzer', 'motor' (por defecto led y mqtt)
+    #   hysteresis: banda de normalización: una alerta '>' activa se normaliza por debajo de
+    #               threshold - hysteresis (y '<' por encima de threshold + hysteresis)
+    #   cooldown / reminder: reemplazan COOLDOWN / REMINDER_INTERVAL para la regla
+    'RULES': [
+        {'id': 'temperature_high', 'sensor': 'temperature', 'op': '>', 'threshold': 30, 'hysteresis': 1.0,
+         'severity': 'danger', 'led': 'LED_TEMP', 'lcd': 'Temp. muy alta',
+         'message': '🔥 Temperatura muy alta: {value}°C - ¡Riesgo de sobrecalentamiento!'},
+        {'id': 'humidity_high', 'sensor': 'humidity', 'op': '>', 'threshold': 60, 'hysteresis': 3.0,
+         'severity': 'warning', 'led': 'LED_HUM', 'lcd': 'Humedad alta',
+         'message': '☔ Humedad alta: {value}% - Ambiente húmedo'},
+        {'id': 'light_none', 'sensor': 'light', 'field': 'light_voltage', 'op': '>=', 'threshold': 1.2, 'hysteresis': 0.1,
+         'severity': 'info', 'led': 'LED_LUZ', 'lcd': 'No hay luz',  # 1.2V o más en el LDR = no hay luz
+         'message': '💡 No hay luz detectada en el ambiente'},
+        {'id': 'air_quality_bad', 'sensor': 'air_quality', 'field': 'air_quality_ppm', 'op': '>', 'threshold': 400,
+         'hysteresis': 25, 'severity': 'danger', 'led': 'LED_AIRE', 'lcd': 'Aire contaminado',
+         'message': '💨 Aire contaminado detectado: {value:.0f} ppm - ¡Ventilación activada!',
+         'actions': ['led', 'lcd', 'mqtt', 'buzzer', 'motor']},
+        {'id': 'pressure_low', 'sensor': 'pressure', 'op': '<', 'threshold': 980, 'hysteresis': 2.0,
+         'severity': 'danger', 'led': 'LED_AIRE', 'lcd': 'Presion anormal',  # LED azul también para presión
+         'message': '⚠️ Presión atmosférica anormal: {value:.1f} hPa - Presión muy baja'},
+        {'id': 'pressure_high', 'sensor': 'pressure', 'op': '>', 'threshold': 1030, 'hysteresis': 2.0,
+         'severity': 'danger', 'led': 'LED_AIRE', 'lcd': 'Presion anormal',
+         'message': '⚠️ Presión atmosférica anormal: {value:.1f} hPa - Presión muy alta'},
+    ],
+    # Avisos (MQTT y consola) solo en las transiciones activa / normalizada
+    'COOLDOWN': 60.0,            # s - tiempo normal antes de anunciar la normalización (una reactivación antes es el mismo episodio)
+    'REMINDER_INTERVAL': 300.0,  # s - recordatorio mientras la alerta siga activa (0 = nunca)
 }
 
 # ============== UMBRALES DE SENSORES ==============
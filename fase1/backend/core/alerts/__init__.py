@@ -0,0 +1,8 @@
+"""
+Módulo de alertas del Sistema SIEPA
+"""
+
+from .rules import AlertEngine, AlertResult, AlertRule, compile_rules
+from .state import AlertTracker
+
+__all__ = ['AlertEngine', 'AlertResult', 'AlertRule', 'AlertTracker', 'compile_rules']
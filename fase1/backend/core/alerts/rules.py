@@ -0,0 +1,249 @@
+"""
+Motor de reglas de alerta del Sistema SIEPA
+Compila las reglas declarativas de ALERT_CONFIG['RULES'] una sola vez en una tabla plana
+(sensor, comparador, umbral, severidad, LED, acciones) y las evalúa todas en una pasada
+por lectura. El mismo resultado alimenta LEDs, buzzer, motor, LCD y publish_alert.
+La tabla se reemplaza atómicamente al recargar, sin reiniciar el sistema
+"""
+
+import operator
+import runpy
+import threading
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Tuple
+
+from config import ALERT_CONFIG, SENSOR_CONFIG
+
+COMPARATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    '>': operator.gt,
+    '>=': operator.ge,
+    '<': operator.lt,
+    '<=': operator.le,
+    '==': operator.eq,
+    '!=': operator.ne,
+}
+SEVERITIES = ('info', 'warning', 'danger')
+ACTIONS = ('led', 'lcd', 'mqtt', 'buzzer', 'motor')
+DEFAULT_ACTIONS = ('led', 'mqtt')
+
+
+class AlertRule(NamedTuple):
+    """Fila compilada de la tabla de evaluación"""
+    id: str
+    sensor: str                      # Grupo de la alerta (estado de LED, campo 'sensor' de publish_alert)
+    field: str                       # Atributo de SensorReading (o clave del dict) comparado
+    op: str
+    compare: Callable[[Any, Any], bool]
+    threshold: float
+    clear_threshold: float           # Umbral de normalización (threshold desplazado por la histéresis)
+    severity: str
+    led: Optional[int]               # Pin GPIO resuelto
+    lcd: str                         # Texto del LCD / consola
+    message: str                     # Plantilla del mensaje MQTT ({value}, {threshold})
+    actions: FrozenSet[str]
+    cooldown: Optional[float]        # Intervalo mínimo entre avisos (None = el global)
+    reminder: Optional[float]        # Recordatorio mientras siga activa (None = el global, 0 = nunca)
+
+    def format_message(self, value: Any) -> str:
+        try:
+            return self.message.format(value=value, threshold=self.threshold)
+        except (ValueError, TypeError):
+            return self.message.format(value=str(value), threshold=self.threshold)
+
+
+class AlertResult:
+    """Reglas disparadas por una lectura y las decisiones derivadas"""
+
+    __slots__ = ('fired', 'active', 'buzzer', 'motor', 'lcd_messages', 'events')
+
+    def __init__(self, fired: List[Tuple[AlertRule, Any]], sensors: Iterable[str],
+                 events: Optional[List[Tuple[str, AlertRule, Any]]] = None):
+        self.fired = fired  # [(regla, valor)] en el orden de la tabla
+        self.events = events or []  # [(evento, regla, valor)] a notificar (ver AlertTracker)
+        self.active = dict.fromkeys(sensors, False)
+        for rule, _ in fired:
+            self.active[rule.sensor] = True
+        self.buzzer = any('buzzer' in rule.actions for rule, _ in fired)
+        self.motor = any('motor' in rule.actions for rule, _ in fired)
+        # Avisos del LCD por severidad (la más grave primero)
+        lcd = [rule for rule, _ in fired if 'lcd' in rule.actions]
+        lcd.sort(key=lambda rule: -SEVERITIES.index(rule.severity))
+        self.lcd_messages = [rule.lcd for rule in lcd]
+
+    def with_action(self, action: str) -> List[Tuple[AlertRule, Any]]:
+        return [(rule, value) for rule, value in self.fired if action in rule.actions]
+
+
+def _resolve_led(led: Any, sensor_config: Dict[str, Any]) -> Optional[int]:
+    """Pin de un LED: número o clave de SENSOR_CONFIG ('LED_TEMP')"""
+    if led is None or isinstance(led, int):
+        return led
+    if led in sensor_config:
+        return sensor_config[led]
+    raise ValueError(f"LED desconocido: {led}")
+
+
+def compile_rules(rules: Iterable[Dict[str, Any]], sensor_config: Dict[str, Any] = None) -> Tuple[AlertRule, ...]:
+    """
+    Valida y compila reglas declarativas
+
+    Args:
+        rules: [{'id', 'sensor', 'op', 'threshold', y opcionales 'field', 'severity',
+                'led', 'lcd', 'message', 'actions', 'hysteresis', 'cooldown', 'reminder'}]
+        sensor_config: configuración con los pines de los LEDs (por defecto SENSOR_CONFIG)
+
+    Raises:
+        ValueError: si alguna regla es inválida (ninguna regla se aplica a medias)
+    """
+    sensor_config = SENSOR_CONFIG if sensor_config is None else sensor_config
+    table = []
+    seen = set()
+    for index, spec in enumerate(rules):
+        rule_id = spec.get('id') or f"rule_{index}"
+        if rule_id in seen:
+            raise ValueError(f"Regla duplicada: {rule_id}")
+        seen.add(rule_id)
+        if 'sensor' not in spec or 'threshold' not in spec:
+            raise ValueError(f"Regla {rule_id}: faltan 'sensor' o 'threshold'")
+        op = spec.get('op', '>')
+        if op not in COMPARATORS:
+            raise ValueError(f"Regla {rule_id}: comparador desconocido {op} (use {' '.join(COMPARATORS)})")
+        severity = spec.get('severity', 'warning')
+        if severity not in SEVERITIES:
+            raise ValueError(f"Regla {rule_id}: severidad desconocida {severity} (use {', '.join(SEVERITIES)})")
+        actions = frozenset(spec.get('actions', DEFAULT_ACTIONS))
+        unknown = actions - set(ACTIONS)
+        if unknown:
+            raise ValueError(f"Regla {rule_id}: acciones desconocidas {sorted(unknown)}")
+        try:
+            threshold = float(spec['threshold'])
+        except (TypeError, ValueError):
+            raise ValueError(f"Regla {rule_id}: umbral inválido {spec['threshold']!r}")
+        hysteresis = spec.get('hysteresis', 0.0)
+        if not isinstance(hysteresis, (int, float)) or hysteresis < 0:
+            raise ValueError(f"Regla {rule_id}: histéresis inválida {hysteresis!r}")
+        # La alerta se normaliza al cruzar el umbral desplazado hacia el lado normal
+        if op in ('>', '>='):
+            clear_threshold = threshold - hysteresis
+        elif op in ('<', '<='):
+            clear_threshold = threshold + hysteresis
+        else:
+            clear_threshold = threshold
+        led = _resolve_led(spec.get('led'), sensor_config)
+        if 'led' in actions and led is None:
+            raise ValueError(f"Regla {rule_id}: la acción 'led' requiere 'led'")
+
+        sensor = spec['sensor']
+        lcd = spec.get('lcd', rule_id)
+        table.append(AlertRule(
+            id=rule_id,
+            sensor=sensor,
+            field=spec.get('field', sensor),
+            op=op,
+            compare=COMPARATORS[op],
+            threshold=threshold,
+            clear_threshold=clear_threshold,
+            severity=severity,
+            led=led,
+            lcd=lcd,
+            message=spec.get('message', f"{lcd}: {{value}} ({op} {{threshold}})"),
+            actions=actions,
+            cooldown=spec.get('cooldown'),
+            reminder=spec.get('reminder'),
+        ))
+    return tuple(table)
+
+
+def load_rules_from_settings() -> List[Dict[str, Any]]:
+    """
+    Vuelve a leer config/settings.py y devuelve sus reglas
+
+    El archivo se ejecuta aparte (el módulo importado no cambia) y solo se actualiza en
+    sitio ALERT_CONFIG['RULES'], así todos los módulos ven las reglas nuevas.
+    """
+    from config import settings
+    fresh = runpy.run_path(settings.__file__)['ALERT_CONFIG']
+    ALERT_CONFIG['RULES'] = fresh.get('RULES', [])
+    return ALERT_CONFIG['RULES']
+
+
+class AlertEngine:
+    """Evalúa la tabla compilada de reglas de alerta"""
+
+    def __init__(self, rules: Optional[Iterable[Dict[str, Any]]] = None, sensor_config: Dict[str, Any] = None):
+        """
+        Args:
+            rules: reglas declarativas (por defecto ALERT_CONFIG['RULES'])
+            sensor_config: configuración con los pines de los LEDs (por defecto SENSOR_CONFIG)
+        """
+        self.sensor_config = sensor_config
+        self._lock = threading.Lock()
+        self.rules: Tuple[AlertRule, ...] = ()
+        self.sensors: Tuple[str, ...] = ()
+        self.reloads = 0
+        self._install(compile_rules(ALERT_CONFIG.get('RULES', []) if rules is None else rules, sensor_config))
+
+    def table(self) -> Tuple[Tuple[AlertRule, ...], Tuple[str, ...]]:
+        """Tabla vigente y grupos de sensores (una sola lectura atómica)"""
+        return self._table
+
+    def _install(self, table: Tuple[AlertRule, ...]):
+        # Una sola asignación: una evaluación en curso sigue con la tabla anterior completa
+        sensors = tuple(dict.fromkeys(rule.sensor for rule in table))
+        self._table = (table, sensors)
+        self.rules, self.sensors = table, sensors
+
+    def evaluate(self, source: Any) -> AlertResult:
+        """
+        Evalúa todas las reglas sobre una lectura en una pasada
+
+        Args:
+            source: SensorReading o dict campo -> valor (un campo ausente o None no dispara)
+        """
+        table, sensors = self._table
+        get = source.get if isinstance(source, dict) else (lambda field: getattr(source, field, None))
+        fired = []
+        for rule in table:
+            value = get(rule.field)
+            if value is not None and rule.compare(value, rule.threshold):
+                fired.append((rule, value))
+        return AlertResult(fired, sensors)
+
+    def reload(self, rules: Optional[Iterable[Dict[str, Any]]] = None) -> bool:
+        """
+        Recompila la tabla sin reiniciar
+
+        Args:
+            rules: reglas nuevas; None vuelve a leer ALERT_CONFIG de config/settings.py
+
+        Returns:
+            True si se instaló la tabla nueva (con reglas inválidas se conserva la anterior)
+        """
+        with self._lock:
+            try:
+                specs = load_rules_from_settings() if rules is None else list(rules)
+                table = compile_rules(specs, self.sensor_config)
+            except Exception as e:
+                print(f"❌ Reglas de alerta no recargadas: {e}")
+                return False
+            self._install(table)
+            self.reloads += 1
+        print(f"🔁 Reglas de alerta recargadas: {len(table)} reglas ({', '.join(rule.id for rule in table)})")
+        return True
+
+    def get_rules(self) -> List[Dict[str, Any]]:
+        """Tabla vigente en forma serializable"""
+        return [
+            {
+                'id': rule.id,
+                'sensor': rule.sensor,
+                'field': rule.field,
+                'op': rule.op,
+                'threshold': rule.threshold,
+                'clear_threshold': rule.clear_threshold,
+                'severity': rule.severity,
+                'led': rule.led,
+                'lcd': rule.lcd,
+                'actions': sorted(rule.actions),
+            }
+            for rule in self.rules
+        ]
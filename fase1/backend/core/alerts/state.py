@@ -0,0 +1,174 @@
+"""
+Estado de las alertas del Sistema SIEPA
+Sigue cada regla del AlertEngine como activa o normal con bandas de histéresis (se
+activa al cruzar threshold y se normaliza al cruzar clear_threshold) y decide qué
+notificar: solo las transiciones, más un recordatorio periódico mientras la condición
+persista. Cada activación se anuncia de inmediato; la normalización se anuncia tras un
+intervalo mínimo en estado normal, y una reactivación dentro de ese intervalo sigue
+siendo el mismo episodio (absorbe las oscilaciones sin ocultar ninguna activación)
+"""
+
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import ALERT_CONFIG
+from .rules import AlertEngine, AlertResult, AlertRule
+
+EVENT_RAISED = 'raised'
+EVENT_REMINDER = 'reminder'
+EVENT_CLEARED = 'cleared'
+
+
+class _RuleState:
+    """Estado de una regla"""
+
+    __slots__ = ('active', 'since', 'value', 'announced', 'clear_pending', 'last_notified', 'notifications',
+                 'suppressed')
+
+    def __init__(self):
+        self.active = False
+        self.since: Optional[float] = None
+        self.value: Any = None
+        self.announced = False               # Hay una activación notificada sin normalización notificada
+        self.clear_pending: Optional[float] = None  # Normal desde este instante, aún sin anunciar
+        self.last_notified: Optional[float] = None
+        self.notifications = 0
+        self.suppressed = 0                  # Reactivaciones absorbidas por un episodio aún abierto
+
+
+class AlertTracker:
+    """Alertas con histéresis, normalización confirmada tras un intervalo mínimo y recordatorios"""
+
+    def __init__(self, engine: AlertEngine, cooldown: Optional[float] = None,
+                 reminder: Optional[float] = None, clock=time.monotonic):
+        """
+        Args:
+            engine: reglas compiladas (las recargas se ven en la siguiente lectura)
+            cooldown: tiempo en estado normal antes de anunciar la normalización de una regla
+                      (por defecto ALERT_CONFIG['COOLDOWN'])
+            reminder: recordatorio mientras la alerta siga activa (por defecto
+                      ALERT_CONFIG['REMINDER_INTERVAL']; 0 = sin recordatorios)
+            clock: reloj monotónico (inyectable para pruebas)
+        """
+        self.engine = engine
+        self.cooldown = ALERT_CONFIG.get('COOLDOWN', 60.0) if cooldown is None else cooldown
+        self.reminder = ALERT_CONFIG.get('REMINDER_INTERVAL', 300.0) if reminder is None else reminder
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._states: Dict[str, _RuleState] = {}
+        self.evaluations = 0
+        self.events = {EVENT_RAISED: 0, EVENT_REMINDER: 0, EVENT_CLEARED: 0}
+
+    def update(self, source: Any) -> AlertResult:
+        """
+        Evalúa una lectura y actualiza el estado de cada regla
+
+        Args:
+            source: SensorReading o dict campo -> valor (un campo ausente conserva el estado)
+
+        Returns:
+            resultado con las reglas activas (con histéresis) y los eventos a notificar
+        """
+        table, sensors = self.engine.table()
+        get = source.get if isinstance(source, dict) else (lambda field: getattr(source, field, None))
+        now = self.clock()
+        fired: List[Tuple[AlertRule, Any]] = []
+        events: List[Tuple[str, AlertRule, Any]] = []
+
+        with self._lock:
+            self.evaluations += 1
+            for rule in table:
+                state = self._states.get(rule.id)
+                if state is None:
+                    state = self._states[rule.id] = _RuleState()
+
+                cleared = False
+                value = get(rule.field)
+                if value is not None:
+                    state.value = value
+                    if not state.active and rule.compare(value, rule.threshold):
+                        state.active = True
+                        state.since = now
+                    elif state.active and not rule.compare(value, rule.clear_threshold):
+                        state.active = False
+                        state.since = now
+                        cleared = True
+
+                event = self._notification(rule, state, now, cleared)
+                if event is not None:
+                    events.append((event, rule, state.value))
+                    self.events[event] += 1
+                if state.active:
+                    fired.append((rule, state.value))
+
+            # Reglas que ya no existen tras una recarga
+            if len(self._states) > len(table):
+                ids = {rule.id for rule in table}
+                for rule_id in [rule_id for rule_id in self._states if rule_id not in ids]:
+                    del self._states[rule_id]
+
+        return AlertResult(fired, sensors, events)
+
+    def _notification(self, rule: AlertRule, state: _RuleState, now: float, cleared: bool) -> Optional[str]:
+        """
+        Evento a notificar para una regla en este ciclo (llamar con lock)
+
+        Una activación siempre se notifica en el ciclo en que ocurre. La normalización
+        espera el intervalo mínimo: si la regla se reactiva antes, el episodio notificado
+        continúa (no hay 'cleared' ni un segundo 'raised') y el panel nunca pierde una
+        activación, aunque dure menos que el intervalo.
+        """
+        cooldown = self.cooldown if rule.cooldown is None else rule.cooldown
+        reminder = self.reminder if rule.reminder is None else rule.reminder
+        if state.active:
+            if not state.announced:
+                state.announced = True
+                return self._notified(state, now, EVENT_RAISED)
+            if state.clear_pending is not None:
+                # Se reactivó antes de confirmar la normalización: mismo episodio
+                state.clear_pending = None
+                state.suppressed += 1
+            if reminder and now - state.last_notified >= reminder:
+                return self._notified(state, now, EVENT_REMINDER)
+        elif state.announced:
+            if cleared:
+                state.clear_pending = now
+            if state.clear_pending is not None and now - state.clear_pending >= cooldown:
+                state.clear_pending = None
+                state.announced = False
+                return self._notified(state, now, EVENT_CLEARED)
+        return None
+
+    @staticmethod
+    def _notified(state: _RuleState, now: float, event: str) -> str:
+        state.last_notified = now
+        state.notifications += 1
+        return event
+
+    def reset(self):
+        """Olvida el estado de todas las reglas"""
+        with self._lock:
+            self._states.clear()
+
+    def get_status(self) -> Dict[str, Any]:
+        """Estado por regla, avisos enviados y transiciones absorbidas"""
+        now = self.clock()
+        with self._lock:
+            return {
+                'cooldown_s': self.cooldown,
+                'reminder_s': self.reminder,
+                'evaluations': self.evaluations,
+                'events': dict(self.events),
+                'rules': {
+                    rule_id: {
+                        'active': state.active,
+                        'for_s': round(now - state.since, 1) if state.since is not None else None,
+                        'value': state.value,
+                        'clear_pending': state.clear_pending is not None,
+                        'notifications': state.notifications,
+                        'suppressed': state.suppressed,
+                    }
+                    for rule_id, state in self._states.items()
+                },
+            }
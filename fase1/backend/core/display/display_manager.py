@@ -2,11 +2,19 @@
 Gestor de display del Sistema SIEPA
 Abstrae la lógica de display LCD real y simulado
 Implementa el sistema de pantallas rotativas exactamente como allin_w_display.py
+
+Las escrituras van a un frame buffer; flush() envía al LCD solo las celdas que cambiaron,
+en una sola transacción del bus I2C compartido con el BMP180 (prioridad de display)
 """
 
+import threading
 import time
-from typing import Dict, Any
+from contextlib import nullcontext
+from typing import Dict, Any, List, Optional, Tuple
 from config import DISPLAY_CONFIG
+from ..sensors.reading import SensorReading
+from ..alerts import AlertResult
+from ..hardware.i2c_bus import BatchedI2CWriter, PRIORITY_DISPLAY, get_i2c_bus
 
 
 class DisplayManager:
@@ -16,6 +24,18 @@ class DisplayManager:
         self.mode = mode
         self.config = DISPLAY_CONFIG
         self.pantalla_actual = 0  # Variable para rotación de pantallas (0-5)
+        self.time_scale = 1.0  # Escala de las pausas (replay acelerado)
+        
+        # Frame buffer: contenido deseado y contenido actual del LCD (None = desconocido)
+        self.cols = self.config['LCD_COLS']
+        self.rows = self.config['LCD_ROWS']
+        self._frame = [[' '] * self.cols for _ in range(self.rows)]
+        self._shown = None
+        self._cursor = (0, 0)
+        self._frame_lock = threading.Lock()
+        self._flush_pending = None  # Transacción del display en la cola del bus
+        self.bus = None
+        self.writer = None
         
         if mode == 'real':
             self._init_real_display()
@@ -29,14 +49,29 @@ class DisplayManager:
         """Inicializa LCD real"""
         try:
             from RPLCD.i2c import CharLCD
-            self.lcd = CharLCD(
+        except ImportError:
+            raise ImportError("Librería RPLCD no disponible. Use modo 'testing'")
+        
+        # El LCD comparte el bus I2C con el BMP180: toda transacción pasa por su gestor
+        bus_id = self.config.get('LCD_I2C_BUS', 1)
+        self.bus = get_i2c_bus(bus_id)
+        self.lcd = self.bus.execute(
+            lambda: CharLCD(
                 'PCF8574', 
                 self.config['LCD_I2C_ADDRESS'],
+                port=bus_id,
                 cols=self.config['LCD_COLS'],
                 rows=self.config['LCD_ROWS']
-            )
-        except ImportError:
-            raise ImportError("Librería RPLCD no disponible. Use modo 'testing'")
+            ),
+            priority=PRIORITY_DISPLAY,
+            client='lcd'
+        )
+        self._shown = [[' '] * self.cols for _ in range(self.rows)]  # CharLCD limpia al iniciar
+        
+        # Bytes del PCF8574 agrupados en una transacción por actualización
+        if self.config.get('LCD_BATCH_WRITES', True) and hasattr(self.lcd, 'bus'):
+            self.writer = BatchedI2CWriter(self.lcd.bus)
+            self.lcd.bus = self.writer
     
     def _init_simulated_display(self):
         """Inicializa LCD simulado"""
@@ -51,46 +86,118 @@ class DisplayManager:
         self.write_string("Bienvenido a SIEPA")
         self.set_cursor(1, 0)
         self.write_string("Sistema iniciado...")
+        self.flush()
         time.sleep(3)
         self.clear()
+        self.flush()
     
     def clear(self):
-        """Limpia el display"""
-        self.lcd.clear()
+        """Limpia el display (en el frame buffer)"""
+        with self._frame_lock:
+            for row in self._frame:
+                row[:] = [' '] * self.cols
+            self._cursor = (0, 0)
     
     def set_cursor(self, row: int, col: int = 0):
         """Posiciona el cursor"""
-        if self.mode == 'real':
-            self.lcd.cursor_pos = (row, col)
-        else:
-            self.lcd.cursor_pos((row, col))
+        self._cursor = (row, col)
     
     def write_string(self, text: str):
-        """Escribe texto en la posición actual"""
-        if self.mode == 'real':
-            self.lcd.write_string(text)
-        else:
-            self.lcd.write_string(text)
+        """Escribe texto en la posición actual (lo que excede la fila se descarta)"""
+        row, col = self._cursor
+        if not 0 <= row < self.rows:
+            return
+        with self._frame_lock:
+            chars = list(text[:max(0, self.cols - col)])
+            self._frame[row][col:col + len(chars)] = chars
+            self._cursor = (row, col + len(chars))
+    
+    def flush(self, wait: bool = False):
+        """
+        Envía al LCD los cambios del frame buffer
+        
+        En modo real se encola una sola transacción en el bus I2C; si ya hay una en cola
+        no se agrega otra: al ejecutarse toma el contenido más reciente del buffer.
+        """
+        if self.mode != 'real':
+            with self._frame_lock:
+                lines = [''.join(row).rstrip() for row in self._frame]
+                changed = lines != self._shown
+                self._shown = lines
+            if changed:
+                self.lcd.show_frame(lines)
+            return
+        
+        with self._frame_lock:
+            pending = self._flush_pending
+            if pending is None or pending.done():
+                pending = self._flush_pending = self.bus.submit(
+                    self._flush_transaction, priority=PRIORITY_DISPLAY, client='lcd'
+                )
+        if wait:
+            try:
+                pending.result(timeout=2.0)
+            except Exception as e:
+                print(f"⚠️ LCD: error al actualizar - {e}")
+    
+    def _diff_runs(self, target: List[List[str]]) -> List[Tuple[int, int, str]]:
+        """Tramos (fila, columna, texto) que difieren entre el LCD y target"""
+        runs = []
+        for row in range(self.rows):
+            wanted = target[row]
+            current = self._shown[row] if self._shown is not None else None
+            col = 0
+            while col < self.cols:
+                if current is not None and wanted[col] == current[col]:
+                    col += 1
+                    continue
+                start = col
+                while col < self.cols and (current is None or wanted[col] != current[col]):
+                    col += 1
+                runs.append((row, start, ''.join(wanted[start:col])))
+        return runs
+    
+    def _flush_transaction(self):
+        """Transacción del bus: escribe en el LCD solo los tramos modificados"""
+        with self._frame_lock:
+            target = [row[:] for row in self._frame]
+        runs = self._diff_runs(target)
+        if not runs:
+            return
+        try:
+            with self.writer.batch() if self.writer is not None else nullcontext():
+                for row, col, text in runs:
+                    self.lcd.cursor_pos = (row, col)
+                    self.lcd.write_string(text)
+        except Exception:
+            self._shown = None  # Estado del LCD desconocido: reescribir todo la próxima vez
+            raise
+        self._shown = target
     
     def write_at(self, row: int, col: int, text: str):
         """Escribe texto en una posición específica"""
         self.set_cursor(row, col)
         self.write_string(text)
 
-    def display_sensor_data(self, sensor_data: Dict[str, Any]):
-        """Muestra datos de sensores exactamente igual que allin_w_display.py"""
+    def display_sensor_data(self, sensor_data: SensorReading, alerts: Optional[List[str]] = None):
+        """
+        Muestra datos de sensores exactamente igual que allin_w_display.py
+        
+        Args:
+            alerts: avisos de las reglas con acción 'lcd', el más grave primero
+                    (None: solo el aire contaminado de la lectura)
+        """
         # Extraer datos del sensor_data
-        temp = sensor_data.get('temperature')
-        hum = sensor_data.get('humidity')
-        distancia = sensor_data.get('distance')
-        lux = sensor_data.get('light_lux')
-        voltaje_ldr = sensor_data.get('light_voltage', 0)
-        ppm = sensor_data.get('air_quality_ppm')
-        voltaje_mq135 = sensor_data.get('air_quality_voltage', 0)
-        presion = sensor_data.get('pressure')
-        hay_luz = sensor_data.get('light', False)
-        aire_malo = sensor_data.get('air_quality_bad', False)
-        buzzer_state = sensor_data.get('buzzer_state', False)
+        temp = sensor_data.temperature
+        hum = sensor_data.humidity
+        distancia = sensor_data.distance
+        lux = sensor_data.light_lux
+        voltaje_ldr = sensor_data.light_voltage
+        ppm = sensor_data.air_quality_ppm
+        presion = sensor_data.pressure
+        hay_luz = sensor_data.light
+        aire_malo = sensor_data.air_quality_bad
+        buzzer_state = sensor_data.buzzer_state
 
         # Mostrar en consola EXACTAMENTE igual que allin_w_display.py
         print("----- Lectura actual -----")
@@ -100,7 +207,7 @@ class DisplayManager:
         
         # Mostrar luz igual que allin_w_display.py
         if lux is not None and voltaje_ldr is not None:
-            no_hay_luz = sensor_data.get('no_hay_luz', False)
+            no_hay_luz = sensor_data.no_hay_luz
             estado_luz = "SI" if hay_luz else ("NO" if no_hay_luz else "INTERMEDIA")
             print(f"💡 Luz: {estado_luz} ({lux} lux | {voltaje_ldr:.2f}V)")
         else:
@@ -116,14 +223,16 @@ class DisplayManager:
         print(f"🔔 Buzzer: {'ON' if buzzer_state else 'OFF'}")
         print("--------------------------\n")
 
-        # Mostrar ALERTA si hay aire contaminado (igual que allin_w_display.py)
-        if aire_malo:
-            self.activar_alerta("Aire contaminado")
+        # Mostrar ALERTA en lugar de la pantalla rotativa (igual que allin_w_display.py)
+        if alerts is None:
+            alerts = ["Aire contaminado"] if aire_malo else []
+        if alerts:
+            self.activar_alerta(alerts[0])
             self.clear()
-            self.write_string("⚠️ Aire contaminado ⚠️")
+            self.write_string(f"⚠️ {alerts[0]} ⚠️")
             self.set_cursor(1, 0)
             self.write_string("Toma precauciones")
-            time.sleep(0.5)
+            self._pause(0.5)
             self.pantalla_actual = (self.pantalla_actual + 1) % 6
             return
 
@@ -162,45 +271,46 @@ class DisplayManager:
 
         # Avanzar a la siguiente pantalla (igual que allin_w_display.py)
         self.pantalla_actual = (self.pantalla_actual + 1) % 6
+        self.flush()
 
     def activar_alerta(self, mensaje):
         """Activa una alerta en el LCD"""
         self.clear()
         self.write_string(f"⚠️ {mensaje} ⚠️")
-        time.sleep(0.5)
+        self._pause(0.5)
 
-    def check_and_display_alerts(self, sensor_data: Dict[str, Any]):
-        """Verifica y muestra alertas críticas como en allin_w_display.py"""
-        temp = sensor_data.get('temperature')
-        hum = sensor_data.get('humidity')
-        lux = sensor_data.get('light_lux')
-        presion = sensor_data.get('pressure')
+    def _pause(self, seconds: float):
+        """Pausa para que el mensaje sea legible, escalada por time_scale"""
+        self.flush()
+        if self.time_scale > 0:
+            time.sleep(seconds * self.time_scale)
 
-        # Alertas críticas con mensajes EXACTOS de allin_w_display.py
-        if temp is not None and temp > 30:
-            self.activar_alerta("Temp. muy alta")
-
-        if hum is not None and hum > 60:  # 60% como en allin_w_display.py
-            self.activar_alerta("Humedad alta")
-
-        # Usar no_hay_luz basado en voltaje como en allin_w_display.py
-        no_hay_luz = sensor_data.get('no_hay_luz', False)
-        voltaje_ldr = sensor_data.get('light_voltage')
-        if voltaje_ldr is not None and no_hay_luz:
-            self.activar_alerta("No hay luz")
-
-        if presion is not None and (presion < 980 or presion > 1030):
-            self.activar_alerta("Presion anormal")
+    def check_and_display_alerts(self, alerts: AlertResult):
+        """Muestra los avisos de todas las reglas disparadas (resultado del AlertEngine)"""
+        for rule, _ in alerts.fired:
+            self.activar_alerta(rule.lcd)
 
     def display_message(self, message: str):
         """Muestra un mensaje simple"""
         self.clear()
         self.write_at(0, 0, message)
+        self.flush()
     
     def display_shutdown(self):
         """Muestra mensaje de apagado"""
         self.clear()
         self.write_at(0, 0, "Sistema apagado")
+        self.flush(wait=True)
+    
+    def get_bus_stats(self) -> Dict[str, Any]:
+        """Utilización del bus I2C del LCD y bytes enviados (vacío en modo simulado)"""
+        if self.bus is None:
+            return {}
+        stats = self.bus.get_stats()
+        if self.writer is not None:
+            stats['lcd_bytes'] = self.writer.bytes_written
+            stats['lcd_i2c_transactions'] = self.writer.transactions
+        return stats
 
 
 class SimulatedLCD:
@@ -226,6 +336,11 @@ class SimulatedLCD:
         if self.current_row < len(self.content):
             self.content[self.current_row] = text[:self.cols]  # Truncar si es muy largo
         self._display_lcd()
+    
+    def show_frame(self, lines):
+        """Muestra un cuadro completo de una sola vez"""
+        self.content = [line[:self.cols] for line in lines[:self.rows]]
+        self._display_lcd()
             
     def _display_lcd(self):
         """Muestra el LCD en consola"""
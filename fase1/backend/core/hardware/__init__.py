@@ -0,0 +1,12 @@
+"""
+Módulo de hardware del Sistema SIEPA
+"""
+
+from .gpio_outputs import GPIOOutputs
+from .timers import TimerWheel
+from .led_patterns import LEDPatternEngine
+from .i2c_bus import I2CBusManager, get_i2c_bus, i2c_bus_stats
+from .faults import FaultInjector
+
+__all__ = ['GPIOOutputs', 'TimerWheel', 'LEDPatternEngine', 'I2CBusManager', 'get_i2c_bus', 'i2c_bus_stats',
+           'FaultInjector']
@@ -0,0 +1,3 @@
+"""
+Paquete RPLCD emulado (ver core.hardware.emulation)
+"""
@@ -0,0 +1,121 @@
+"""
+RPLCD.i2c emulado: CharLCD sobre un PCF8574 con la misma secuencia de bytes que RPLCD
+Cada nibble se envía como tres escrituras de un byte por smbus2 (dato, E alto, E bajo)
+con las esperas de la librería, y el LCD emulado decodifica lo que llega al bus
+"""
+
+from ..environment import get_environment
+from ..smbus2 import SMBus
+
+# Bits del PCF8574
+PCF8574_RS = 0x01
+PCF8574_E = 0x04
+PCF8574_BACKLIGHT = 0x08
+
+# Comandos del HD44780
+LCD_CLEARDISPLAY = 0x01
+LCD_RETURNHOME = 0x02
+LCD_ENTRYMODESET = 0x04
+LCD_DISPLAYCONTROL = 0x08
+LCD_FUNCTIONSET = 0x20
+LCD_SETDDRAMADDR = 0x80
+ROW_OFFSETS = (0x00, 0x40, 0x14, 0x54)
+
+# Caracteres fuera de ASCII del juego A00 del HD44780
+_CHARMAP = {'°': 0xDF}
+
+
+class CharLCD:
+    """LCD de caracteres con la API de RPLCD.i2c.CharLCD"""
+
+    def __init__(self, i2c_expander, address, expander_params=None, port=1,
+                 cols=20, rows=4, dotsize=8, charmap='A02', auto_linebreaks=True,
+                 backlight_enabled=True):
+        if i2c_expander != 'PCF8574':
+            raise NotImplementedError(f'Expansor no emulado: {i2c_expander}')
+        self._address = address
+        self._port = port
+        self.cols = cols
+        self.rows = rows
+        self.auto_linebreaks = auto_linebreaks
+        self._backlight = PCF8574_BACKLIGHT if backlight_enabled else 0
+        self._environment = get_environment()
+        self._cursor = (0, 0)
+        self.bus = SMBus(port)
+
+        # Inicialización en modo de 4 bits (secuencia del datasheet)
+        self._environment.delay(0.05)
+        for _ in range(3):
+            self._write4bits(0x03 << 4)
+            self._environment.delay(0.0045)
+        self._write4bits(0x02 << 4)
+        self.command(LCD_FUNCTIONSET | 0x08)        # 4 bits, 2 líneas, 5x8
+        self.command(LCD_DISPLAYCONTROL | 0x04)     # Display encendido, sin cursor
+        self.clear()
+        self.command(LCD_ENTRYMODESET | 0x02)       # Avance a la derecha
+
+    # ============== BAJO NIVEL ==============
+
+    def _i2c_write(self, value: int):
+        self.bus.write_byte(self._address, value)
+
+    def _pulse_data(self, value: int):
+        self._i2c_write(value | PCF8574_E | self._backlight)
+        self._environment.delay(0.000001)
+        self._i2c_write((value & ~PCF8574_E) | self._backlight)
+        self._environment.delay(0.0001)
+
+    def _write4bits(self, value: int):
+        self._i2c_write(value | self._backlight)
+        self._pulse_data(value)
+
+    def _send(self, value: int, mode: int):
+        self._write4bits((value & 0xF0) | mode)
+        self._write4bits(((value << 4) & 0xF0) | mode)
+
+    def command(self, value: int):
+        self._send(value, 0)
+        if value in (LCD_CLEARDISPLAY, LCD_RETURNHOME):
+            self._environment.delay(0.002)  # Comandos lentos del HD44780
+
+    def write(self, value: int):
+        row, col = self._cursor
+        self._send(value, PCF8574_RS)
+        col += 1
+        if col >= self.cols and self.auto_linebreaks:
+            row, col = (row + 1) % self.rows, 0
+            self.cursor_pos = (row, col)
+        else:
+            self._cursor = (row, col)
+
+    # ============== API DE RPLCD ==============
+
+    @property
+    def cursor_pos(self):
+        return self._cursor
+
+    @cursor_pos.setter
+    def cursor_pos(self, value):
+        row, col = value
+        if row >= self.rows or col >= self.cols:
+            raise ValueError('Cursor position is out of range')
+        self._cursor = (row, col)
+        self.command(LCD_SETDDRAMADDR | (ROW_OFFSETS[row] + col))
+
+    def write_string(self, value: str):
+        for char in value:
+            code = _CHARMAP.get(char, ord(char) if ord(char) < 128 else ord('?'))
+            self.write(code)
+
+    def clear(self):
+        self.command(LCD_CLEARDISPLAY)
+        self._cursor = (0, 0)
+
+    def home(self):
+        self.command(LCD_RETURNHOME)
+        self._cursor = (0, 0)
+
+    def close(self, clear: bool = False):
+        if clear:
+            self.clear()
+        self.bus.close()
@@ -0,0 +1,108 @@
+"""
+RPi.GPIO emulado del Sistema SIEPA
+Misma API que RPi.GPIO para lo que usa el sistema: setmode, setup y output con pines
+sueltos o listas, input, detección de flancos con callback y cleanup
+"""
+
+from ..environment import get_environment
+
+BOARD = 10
+BCM = 11
+OUT = 0
+IN = 1
+LOW = 0
+HIGH = 1
+PUD_OFF = 20
+PUD_DOWN = 21
+PUD_UP = 22
+RISING = 31
+FALLING = 32
+BOTH = 33
+
+VERSION = '0.7.1-emulated'
+RPI_INFO = {'P1_REVISION': 3, 'TYPE': 'Emulated', 'PROCESSOR': 'x86'}
+
+_mode = None
+_warnings = True
+
+
+def _channels(channel):
+    return list(channel) if isinstance(channel, (list, tuple)) else [channel]
+
+
+def _check_mode():
+    if _mode is None:
+        raise RuntimeError('Please set pin numbering mode using GPIO.setmode(GPIO.BOARD) or GPIO.setmode(GPIO.BCM)')
+
+
+def setmode(mode):
+    global _mode
+    if mode not in (BOARD, BCM):
+        raise ValueError('An invalid mode was passed to setmode()')
+    _mode = mode
+
+
+def getmode():
+    return _mode
+
+
+def setwarnings(flag):
+    global _warnings
+    _warnings = bool(flag)
+
+
+def setup(channel, direction, pull_up_down=PUD_OFF, initial=None):
+    _check_mode()
+    environment = get_environment()
+    for pin in _channels(channel):
+        environment.gpio_setup(pin, direction, initial if direction == OUT else None)
+
+
+def output(channel, value):
+    _check_mode()
+    environment = get_environment()
+    pins = _channels(channel)
+    values = list(value) if isinstance(value, (list, tuple)) else [value] * len(pins)
+    if len(values) != len(pins):
+        raise RuntimeError('Number of channels != number of values')
+    for pin, level in zip(pins, values):
+        if environment.pin_modes.get(pin) != OUT:
+            raise RuntimeError('The GPIO channel has not been set up as an OUTPUT')
+        environment.gpio_output(pin, level)
+
+
+def input(channel):
+    _check_mode()
+    return get_environment().gpio_input(channel)
+
+
+def add_event_detect(channel, edge, callback=None, bouncetime=None):
+    _check_mode()
+    environment = get_environment()
+    if environment.pin_modes.get(channel) != IN:
+        raise RuntimeError('You must setup() the GPIO channel as an input first')
+    callbacks = environment.edge_callbacks.setdefault(channel, [])
+    if callbacks:
+        raise RuntimeError('Conflicting edge detection already enabled for this GPIO channel')
+    if callback is not None:
+        callbacks.append(callback)
+
+
+def add_event_callback(channel, callback):
+    get_environment().edge_callbacks.setdefault(channel, []).append(callback)
+
+
+def remove_event_detect(channel):
+    get_environment().edge_callbacks.pop(channel, None)
+
+
+def cleanup(channel=None):
+    global _mode
+    environment = get_environment()
+    pins = _channels(channel) if channel is not None else list(environment.pin_modes)
+    for pin in pins:
+        environment.pin_modes.pop(pin, None)
+        environment.edge_callbacks.pop(pin, None)
+        environment.pin_levels[pin] = 0
+    if channel is None:
+        _mode = None
@@ -0,0 +1,3 @@
+"""
+Paquete RPi emulado (ver core.hardware.emulation)
+"""
@@ -0,0 +1,71 @@
+"""
+Hardware emulado de la Raspberry Pi del Sistema SIEPA
+Reemplaza en sys.modules las librerías de hardware (RPi.GPIO, board, busio, digitalio,
+adafruit_dht, bmp180, adafruit_mcp3xxx, smbus2, RPLCD) por versiones que corren sobre un
+entorno físico simulado con los tiempos del hardware real. Así el modo 'real' completo
+(watchdog, arbitraje I2C, framebuffer del LCD, eco del HC-SR04) corre en cualquier Linux:
+
+    from core.hardware.emulation import install
+    env = install()          # Antes de crear SensorManager / DisplayManager
+    ...
+    env.lcd.lines()          # Texto que mostraría el LCD
+"""
+
+import importlib
+import sys
+from typing import Any, Dict, Optional
+
+from .environment import EmulatedEnvironment, get_environment, set_environment
+
+# Nombre del módulo real -> submódulo emulado
+MODULES = {
+    'RPi': 'RPi',
+    'RPi.GPIO': 'RPi.GPIO',
+    'board': 'board',
+    'busio': 'busio',
+    'digitalio': 'digitalio',
+    'adafruit_dht': 'adafruit_dht',
+    'bmp180': 'bmp180',
+    'adafruit_mcp3xxx': 'adafruit_mcp3xxx',
+    'adafruit_mcp3xxx.mcp3008': 'adafruit_mcp3xxx.mcp3008',
+    'adafruit_mcp3xxx.analog_in': 'adafruit_mcp3xxx.analog_in',
+    'smbus2': 'smbus2',
+    'RPLCD': 'RPLCD',
+    'RPLCD.i2c': 'RPLCD.i2c',
+}
+
+_replaced: Dict[str, Any] = {}
+
+
+def install(config: Optional[Dict[str, Any]] = None) -> EmulatedEnvironment:
+    """
+    Activa el hardware emulado
+
+    Args:
+        config: parámetros que reemplazan a los de EMULATION_CONFIG
+
+    Returns:
+        entorno emulado (estado de pines, buses, LCD y magnitudes físicas)
+    """
+    environment = EmulatedEnvironment(config)
+    set_environment(environment)
+    for name, submodule in MODULES.items():
+        if name not in _replaced:
+            _replaced[name] = sys.modules.get(name)
+        sys.modules[name] = importlib.import_module(f'{__name__}.{submodule}')
+    print("🧪 Hardware emulado activo (RPi.GPIO, I2C, SPI, DHT11, BMP180, MCP3008, LCD)")
+    return environment
+
+
+def uninstall():
+    """Restaura los módulos de hardware que había antes de install()"""
+    for name, module in _replaced.items():
+        if module is None:
+            sys.modules.pop(name, None)
+        else:
+            sys.modules[name] = module
+    _replaced.clear()
+    set_environment(None)
+
+
+__all__ = ['install', 'uninstall', 'get_environment', 'EmulatedEnvironment', 'MODULES']
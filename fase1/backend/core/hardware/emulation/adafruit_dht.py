@@ -0,0 +1,58 @@
+"""
+Módulo adafruit_dht emulado
+Una medición cuesta el pulso de inicio del host más los 40 bits del DHT11 y puede fallar
+por checksum como el sensor real. Igual que la librería, no vuelve a medir antes de 2 s
+"""
+
+import time
+
+from .environment import get_environment
+
+
+class DHTBase:
+    """Sensor DHT con la API de adafruit_dht"""
+
+    _resolution = 1  # Decimales que entrega el sensor
+
+    def __init__(self, pin, use_pulseio: bool = True):
+        self.pin = pin
+        self._last_called = 0.0
+        self._temperature = None
+        self._humidity = None
+        self.measurements = 0
+
+    def measure(self):
+        environment = get_environment()
+        config = environment.config
+        if self._last_called and time.monotonic() - self._last_called <= config['DHT_MIN_INTERVAL']:
+            return
+        self._last_called = time.monotonic()
+        self.measurements += 1
+
+        # Pulso de inicio + respuesta del sensor + 40 bits
+        environment.delay(config['DHT_START_SIGNAL'] + 41 * config['DHT_BIT_TIME'])
+        if environment.rng.random() < config['DHT_FAILURE_RATE']:
+            raise RuntimeError('Checksum did not validate. Try again.')
+        self._temperature = round(environment.value('temperature'), self._resolution)
+        self._humidity = round(environment.value('humidity'), self._resolution)
+
+    @property
+    def temperature(self):
+        self.measure()
+        return self._temperature
+
+    @property
+    def humidity(self):
+        self.measure()
+        return self._humidity
+
+    def exit(self):
+        pass
+
+
+class DHT11(DHTBase):
+    _resolution = 0
+
+
+class DHT22(DHTBase):
+    _resolution = 1
@@ -0,0 +1,3 @@
+"""
+Paquete adafruit_mcp3xxx emulado (ver core.hardware.emulation)
+"""
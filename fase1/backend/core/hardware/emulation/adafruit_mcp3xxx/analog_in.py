@@ -0,0 +1,19 @@
+"""
+AnalogIn emulado (API de adafruit_mcp3xxx.analog_in)
+"""
+
+
+class AnalogIn:
+    """Canal analógico del MCP3008: value en 16 bits y voltage en voltios"""
+
+    def __init__(self, mcp, positive_pin: int, negative_pin=None):
+        self._mcp = mcp
+        self._pin = positive_pin
+
+    @property
+    def value(self) -> int:
+        return self._mcp.read(self._pin) << 6
+
+    @property
+    def voltage(self) -> float:
+        return self._mcp.read(self._pin) * self._mcp.reference_voltage / 1023
@@ -0,0 +1,24 @@
+"""
+MCP3008 emulado: cada conversión es una transacción SPI de 3 bytes
+"""
+
+from ..environment import get_environment
+
+P0, P1, P2, P3, P4, P5, P6, P7 = range(8)
+
+
+class MCP3008:
+    """ADC de 10 bits y 8 canales en el bus SPI emulado"""
+
+    def __init__(self, spi_bus, cs, ref_voltage: float = 3.3):
+        self.spi = spi_bus
+        self.cs = cs
+        self.reference_voltage = ref_voltage
+        self._environment = get_environment()
+
+    def read(self, pin: int, is_differential: bool = False) -> int:
+        """Código crudo (0 - 1023) de un canal"""
+        self.cs.value = False
+        self.spi.write_readinto(bytearray(3), bytearray(3))
+        self.cs.value = True
+        return self._environment.adc_code(pin)
@@ -0,0 +1,47 @@
+"""
+Módulo bmp180 emulado
+Cada lectura de presión sigue la secuencia del datasheet por el bus I2C emulado:
+conversión de temperatura, conversión de presión y lectura de los registros de resultado
+(tiempos en EMULATION_CONFIG)
+"""
+
+from .environment import get_environment
+
+ULTRALOWPOWER = 0
+STANDARD = 1
+HIGHRES = 2
+ULTRAHIGHRES = 3
+
+
+class BMP180:
+    """BMP180 en el bus I2C (dirección 0x77)"""
+
+    def __init__(self, i2c, address: int = 0x77, mode: int = STANDARD):
+        self.i2c = i2c
+        self.address = address
+        self.mode = mode
+        self.sea_level_pressure = 1013.25
+        self._environment = get_environment()
+        # Lectura de los 22 bytes de coeficientes de calibración
+        self.i2c.writeto_then_readfrom(address, bytes([0xAA]), bytearray(22))
+
+    def _read_raw(self, command: int, conversion: float, length: int):
+        self.i2c.writeto(self.address, bytes([0xF4, command]))
+        self._environment.delay(conversion)
+        self.i2c.writeto_then_readfrom(self.address, bytes([0xF6]), bytearray(length))
+
+    @property
+    def temperature(self) -> float:
+        self._read_raw(0x2E, self._environment.config['BMP180_TEMP_CONVERSION'], 2)
+        return round(self._environment.value('temperature'), 1)
+
+    @property
+    def pressure(self) -> float:
+        """Presión en hPa (requiere la conversión de temperatura para compensar)"""
+        self._read_raw(0x2E, self._environment.config['BMP180_TEMP_CONVERSION'], 2)
+        self._read_raw(0x34 + (self.mode << 6), self._environment.config['BMP180_PRESSURE_CONVERSION'], 3)
+        return round(self._environment.value('pressure'), 2)
+
+    @property
+    def altitude(self) -> float:
+        return 44330 * (1.0 - (self.pressure / self.sea_level_pressure) ** 0.1903)
@@ -0,0 +1,34 @@
+"""
+Módulo board emulado (Blinka): nombres de pines de la Raspberry Pi
+"""
+
+
+class Pin:
+    def __init__(self, bcm_id: int):
+        self.id = bcm_id
+
+    def __repr__(self):
+        return f"board.D{self.id}"
+
+
+D2 = SDA = Pin(2)
+D3 = SCL = Pin(3)
+D4 = Pin(4)
+D5 = Pin(5)
+D6 = Pin(6)
+D7 = CE1 = Pin(7)
+D8 = CE0 = Pin(8)
+D9 = MISO = Pin(9)
+D10 = MOSI = Pin(10)
+D11 = SCK = SCLK = Pin(11)
+D13 = Pin(13)
+D17 = Pin(17)
+D18 = Pin(18)
+D19 = Pin(19)
+D21 = Pin(21)
+D22 = Pin(22)
+D23 = Pin(23)
+D24 = Pin(24)
+D27 = Pin(27)
+
+board_id = 'EMULATED_RASPBERRY_PI'
@@ -0,0 +1,74 @@
+"""
+Módulo busio emulado (Blinka): I2C y SPI con la latencia del bus emulado
+"""
+
+from .environment import get_environment
+
+
+class I2C:
+    """Bus I2C 1 de la Raspberry Pi"""
+
+    def __init__(self, scl, sda, frequency: int = 100000):
+        self.bus = get_environment().i2c_bus(1)
+        self._locked = False
+
+    def try_lock(self) -> bool:
+        if self._locked:
+            return False
+        self._locked = True
+        return True
+
+    def unlock(self):
+        self._locked = False
+
+    def scan(self):
+        return sorted(self.bus.devices)
+
+    def writeto(self, address, buffer, *, start=0, end=None):
+        self.bus.write(address, bytes(buffer[start:end]))
+
+    def readfrom_into(self, address, buffer, *, start=0, end=None):
+        end = len(buffer) if end is None else end
+        buffer[start:end] = self.bus.read(address, end - start)
+
+    def writeto_then_readfrom(self, address, buffer_out, buffer_in, *,
+                              out_start=0, out_end=None, in_start=0, in_end=None):
+        self.writeto(address, buffer_out, start=out_start, end=out_end)
+        self.readfrom_into(address, buffer_in, start=in_start, end=in_end)
+
+    def deinit(self):
+        pass
+
+
+class SPI:
+    """Bus SPI 0 de la Raspberry Pi"""
+
+    def __init__(self, clock, MOSI=None, MISO=None):
+        self.bus = get_environment().spi
+        self._locked = False
+        self.baudrate = 100000
+
+    def try_lock(self) -> bool:
+        if self._locked:
+            return False
+        self._locked = True
+        return True
+
+    def unlock(self):
+        self._locked = False
+
+    def configure(self, *, baudrate=100000, polarity=0, phase=0, bits=8):
+        self.baudrate = baudrate
+
+    def write(self, buffer, *, start=0, end=None):
+        self.bus.transfer(len(buffer[start:end]))
+
+    def readinto(self, buffer, *, start=0, end=None, write_value=0):
+        end = len(buffer) if end is None else end
+        self.bus.transfer(end - start)
+
+    def write_readinto(self, buffer_out, buffer_in, *, out_start=0, out_end=None, in_start=0, in_end=None):
+        self.bus.transfer(len(buffer_out[out_start:out_end]))
+
+    def deinit(self):
+        pass
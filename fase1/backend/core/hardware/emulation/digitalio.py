@@ -0,0 +1,32 @@
+"""
+Módulo digitalio emulado (Blinka)
+"""
+
+
+class Direction:
+    INPUT = 'input'
+    OUTPUT = 'output'
+
+
+class Pull:
+    UP = 'up'
+    DOWN = 'down'
+
+
+class DigitalInOut:
+    """Pin digital (se usa como chip select del MCP3008)"""
+
+    def __init__(self, pin):
+        self.pin = pin
+        self.direction = Direction.INPUT
+        self.value = True
+
+    def switch_to_output(self, value=False, drive_mode=None):
+        self.direction = Direction.OUTPUT
+        self.value = value
+
+    def switch_to_input(self, pull=None):
+        self.direction = Direction.INPUT
+
+    def deinit(self):
+        pass
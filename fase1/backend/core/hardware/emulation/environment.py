@@ -0,0 +1,337 @@
+"""
+Entorno físico y modelo de tiempos del hardware emulado del Sistema SIEPA
+Guarda el estado de los pines GPIO, los buses I2C/SPI con sus dispositivos y las
+magnitudes físicas que leen los sensores emulados (de la simulación realista si NumPy
+está disponible). Cada operación de bus o de sensor espera lo que tardaría en la Raspberry Pi
+"""
+
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from config import SENSOR_CONFIG, SIMULATION_CONFIG, SIMULATION_RANGES, EMULATION_CONFIG
+from ...sensors.calibration import CalibrationTables
+from ...sensors.simulation import SimulationEngine, NUMPY_AVAILABLE
+
+# Magnitud física de cada canal simulado -> clave de SIMULATION_RANGES
+_RANGE_KEYS = {
+    'temperature': 'TEMPERATURE',
+    'humidity': 'HUMIDITY',
+    'distance': 'DISTANCE',
+    'light': 'LIGHT',
+    'air_quality': 'AIR_QUALITY',
+    'pressure': 'PRESSURE',
+}
+
+SPEED_OF_SOUND_CM_S = 34300
+
+
+class EmulatedBus:
+    """Bus I2C o SPI emulado: latencia por transacción y detección de accesos simultáneos"""
+
+    def __init__(self, environment: 'EmulatedEnvironment', name: str, frequency: float,
+                 overhead: float, bits_per_byte: int):
+        """
+        Args:
+            environment: entorno dueño del bus
+            name: nombre del bus ('i2c-1', 'spi-0')
+            frequency: frecuencia del reloj del bus (Hz)
+            overhead: tiempo fijo por transacción (llamada al sistema, start/stop)
+            bits_per_byte: bits de reloj por byte (9 en I2C por el ACK, 8 en SPI)
+        """
+        self.environment = environment
+        self.name = name
+        self.frequency = frequency
+        self.overhead = overhead
+        self.bits_per_byte = bits_per_byte
+        self.devices: Dict[int, Any] = {}
+        self._lock = threading.Lock()
+
+        self.transactions = 0
+        self.bytes = 0
+        self.busy = 0.0
+        self.collisions = 0  # Transacciones que se solaparon (en hardware real se corrompen)
+
+    def transfer(self, nbytes: int, address: Optional[int] = None) -> float:
+        """
+        Realiza una transacción de nbytes (más el byte de dirección en I2C)
+
+        Returns:
+            duración emulada de la transacción (segundos)
+        """
+        if address is not None and address not in self.devices:
+            self.environment.delay(self.overhead)
+            raise OSError(121, 'Remote I/O error')
+        if not self._lock.acquire(blocking=False):
+            self.collisions += 1
+            self._lock.acquire()
+        try:
+            extra = 1 if address is not None else 0
+            duration = self.overhead + (nbytes + extra) * self.bits_per_byte / self.frequency
+            self.environment.delay(duration)
+            self.transactions += 1
+            self.bytes += nbytes
+            self.busy += duration
+            return duration
+        finally:
+            self._lock.release()
+
+    def write(self, address: int, data: bytes):
+        """Escritura I2C: la recibe el dispositivo en esa dirección"""
+        self.transfer(len(data), address)
+        device = self.devices[address]
+        if hasattr(device, 'receive'):
+            device.receive(bytes(data))
+
+    def read(self, address: int, length: int) -> bytes:
+        """Lectura I2C"""
+        self.transfer(length, address)
+        device = self.devices[address]
+        if hasattr(device, 'respond'):
+            return device.respond(length)
+        return bytes(length)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'transactions': self.transactions,
+            'bytes': self.bytes,
+            'busy_ms': round(self.busy * 1000, 2),
+            'collisions': self.collisions,
+        }
+
+
+class HD44780Display:
+    """
+    LCD HD44780 detrás de un expansor PCF8574 (interfaz de 4 bits)
+
+    Decodifica los bytes escritos en el bus (RS = bit 0, E = bit 2, datos en el nibble
+    alto) y mantiene el texto visible, de modo que las pruebas pueden verificar qué muestra.
+    """
+
+    RS = 0x01
+    ENABLE = 0x04
+    ROW_OFFSETS = (0x00, 0x40, 0x14, 0x54)
+
+    def __init__(self, cols: int = 20, rows: int = 4):
+        self.cols = cols
+        self.rows = rows
+        self.ddram = [0x20] * 0x80
+        self.address = 0
+        self.four_bit = False
+        self._high_nibble: Optional[int] = None
+        self._last = 0
+        self.commands = 0
+        self.characters = 0
+
+    def receive(self, data: bytes):
+        for value in data:
+            # El HD44780 captura los datos en el flanco de bajada de E
+            if self._last & self.ENABLE and not value & self.ENABLE:
+                self._latch(self._last)
+            self._last = value
+
+    def _latch(self, value: int):
+        nibble = value & 0xF0
+        rs = value & self.RS
+        if not self.four_bit:
+            # Modo de 8 bits (inicialización): cada pulso es un comando completo
+            self._command(nibble)
+            return
+        if self._high_nibble is None:
+            self._high_nibble = nibble
+            return
+        byte = self._high_nibble | (nibble >> 4)
+        self._high_nibble = None
+        if rs:
+            self.ddram[self.address & 0x7F] = byte
+            self.address = (self.address + 1) & 0x7F
+            self.characters += 1
+        else:
+            self._command(byte)
+
+    def _command(self, byte: int):
+        self.commands += 1
+        if byte & 0x80:                      # Set DDRAM address
+            self.address = byte & 0x7F
+        elif byte & 0x20:                    # Function set
+            self.four_bit = not byte & 0x10
+        elif byte == 0x01:                   # Clear display
+            self.ddram = [0x20] * 0x80
+            self.address = 0
+        elif byte & 0xFE == 0x02:            # Return home
+            self.address = 0
+
+    def lines(self) -> List[str]:
+        """Texto visible de cada fila"""
+        result = []
+        for offset in self.ROW_OFFSETS[:self.rows]:
+            codes = self.ddram[offset:offset + self.cols]
+            result.append(''.join(chr(c) if 32 <= c < 127 else '?' for c in codes))
+        return result
+
+
+class EmulatedEnvironment:
+    """Estado compartido de todo el hardware emulado"""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            config: parámetros que reemplazan a los de EMULATION_CONFIG
+        """
+        self.config = {**EMULATION_CONFIG, **(config or {})}
+        self.time_scale = self.config.get('TIME_SCALE', 1.0)
+        seed = self.config.get('SEED')
+        self.rng = random.Random(seed)
+        self.calibration = CalibrationTables(vref=SENSOR_CONFIG.get('ADC_VREF', 3.3))
+
+        # Magnitudes físicas: simulación correlacionada o uniforme dentro de los rangos
+        self.engine = None
+        if SIMULATION_CONFIG.get('ENGINE') == 'realistic' and NUMPY_AVAILABLE:
+            self.engine = SimulationEngine(seed=seed)
+        self.overrides: Dict[str, float] = {}  # Canal -> valor fijo (forzar escenarios en pruebas)
+
+        # GPIO
+        self._gpio_lock = threading.RLock()
+        self.pin_levels: Dict[int, int] = {}
+        self.pin_modes: Dict[int, int] = {}
+        self.edge_callbacks: Dict[int, List[Callable[[int], None]]] = {}
+        self.gpio_writes = 0
+        self.trig_pin = SENSOR_CONFIG['ULTRASONIC_TRIG_PIN']
+        self.echo_pin = SENSOR_CONFIG['ULTRASONIC_ECHO_PIN']
+
+        # Buses y dispositivos
+        self.i2c_buses: Dict[int, EmulatedBus] = {}
+        self.spi = EmulatedBus(self, 'spi-0', self.config['SPI_FREQUENCY'],
+                               self.config['SPI_OVERHEAD'], 8)
+        bus = self.i2c_bus(1)
+        self.lcd = HD44780Display()
+        bus.devices[self.config['LCD_ADDRESS']] = self.lcd
+        bus.devices[self.config['BMP180_ADDRESS']] = object()
+        self.adc_channels = {
+            SENSOR_CONFIG['LDR_CHANNEL']: 'light',
+            SENSOR_CONFIG['MQ135_CHANNEL']: 'air_quality',
+        }
+
+    # ============== TIEMPO ==============
+
+    def delay(self, seconds: float):
+        """Espera el tiempo que tomaría la operación en el hardware (escalado)"""
+        if seconds > 0 and self.time_scale > 0:
+            time.sleep(seconds * self.time_scale)
+
+    # ============== MAGNITUDES FÍSICAS ==============
+
+    def value(self, channel: str) -> float:
+        """Valor actual de una magnitud física ('temperature', 'light', 'air_quality', ...)"""
+        if channel in self.overrides:
+            return self.overrides[channel]
+        if self.engine is not None:
+            return self.engine.sample()[channel]
+        limits = SIMULATION_RANGES[_RANGE_KEYS[channel]]
+        return self.rng.uniform(limits['min'], limits['max'])
+
+    def set_value(self, channel: str, value: Optional[float]):
+        """Fija una magnitud (None vuelve a la simulación)"""
+        if value is None:
+            self.overrides.pop(channel, None)
+        else:
+            self.overrides[channel] = value
+
+    def adc_code(self, channel: int, resolution_bits: int = 10) -> int:
+        """Código del MCP3008 en un canal, con ±1 LSB de ruido"""
+        name = self.adc_channels.get(channel)
+        if name == 'light':
+            voltage = self.calibration.voltage_from_lux(self.value('light'))
+        elif name == 'air_quality':
+            voltage = self.calibration.voltage_from_ppm(self.value('air_quality'))
+        else:
+            voltage = 0.0
+        max_code = (1 << resolution_bits) - 1
+        code = round(voltage / self.calibration.vref * max_code) + self.rng.randint(-1, 1)
+        return min(max(code, 0), max_code)
+
+    # ============== BUSES ==============
+
+    def i2c_bus(self, number: int) -> EmulatedBus:
+        bus = self.i2c_buses.get(number)
+        if bus is None:
+            bus = self.i2c_buses[number] = EmulatedBus(
+                self, f'i2c-{number}', self.config['I2C_FREQUENCY'], self.config['I2C_OVERHEAD'], 9
+            )
+        return bus
+
+    # ============== GPIO ==============
+
+    def gpio_setup(self, pin: int, mode: int, initial: Optional[int] = None):
+        with self._gpio_lock:
+            self.pin_modes[pin] = mode
+            if initial is not None:
+                self.pin_levels[pin] = 1 if initial else 0
+            else:
+                self.pin_levels.setdefault(pin, 0)
+
+    def gpio_output(self, pin: int, level: int):
+        level = 1 if level else 0
+        with self._gpio_lock:
+            previous = self.pin_levels.get(pin, 0)
+            self.pin_levels[pin] = level
+            self.gpio_writes += 1
+        if pin == self.trig_pin and previous and not level:
+            self._start_echo()
+
+    def gpio_input(self, pin: int) -> int:
+        with self._gpio_lock:
+            return self.pin_levels.get(pin, 0)
+
+    def _set_input(self, pin: int, level: int):
+        """Cambia un pin de entrada y ejecuta sus callbacks de flanco"""
+        with self._gpio_lock:
+            if self.pin_levels.get(pin, 0) == level:
+                return
+            self.pin_levels[pin] = level
+            callbacks = list(self.edge_callbacks.get(pin, ()))
+        for callback in callbacks:
+            callback(pin)
+
+    def _start_echo(self):
+        """HC-SR04: tras la ráfaga de 40 kHz sube ECHO el tiempo de ida y vuelta del sonido"""
+        distance = self.value('distance')
+        if distance > self.config['ULTRASONIC_MAX_RANGE']:
+            width = self.config['ULTRASONIC_NO_ECHO_PULSE']  # Sin obstáculo: pulso de ~38 ms
+        else:
+            width = 2 * distance / SPEED_OF_SOUND_CM_S
+
+        def echo():
+            self.delay(self.config['ULTRASONIC_TRIGGER_DELAY'])
+            self._set_input(self.echo_pin, 1)
+            self.delay(width)
+            self._set_input(self.echo_pin, 0)
+
+        # Igual que RPi.GPIO, los callbacks de flanco corren en otro hilo
+        threading.Thread(target=echo, name='emulated-hcsr04', daemon=True).start()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Actividad de GPIO y de cada bus"""
+        return {
+            'gpio_writes': self.gpio_writes,
+            'spi': self.spi.get_stats(),
+            **{bus.name: bus.get_stats() for bus in self.i2c_buses.values()},
+        }
+
+
+_environment: Optional[EmulatedEnvironment] = None
+
+
+def get_environment() -> EmulatedEnvironment:
+    """Entorno emulado activo (se crea con la configuración por defecto si no existe)"""
+    global _environment
+    if _environment is None:
+        _environment = EmulatedEnvironment()
+    return _environment
+
+
+def set_environment(environment: Optional[EmulatedEnvironment]):
+    """Reemplaza el entorno activo (p. ej. uno nuevo por prueba)"""
+    global _environment
+    _environment = environment
@@ -0,0 +1,75 @@
+"""
+Módulo smbus2 emulado: acceso al bus I2C emulado con la API de SMBus e i2c_rdwr
+"""
+
+from .environment import get_environment
+
+
+class i2c_msg:
+    """Mensaje de una transacción combinada (i2c_rdwr)"""
+
+    def __init__(self, address: int, buf: bytearray, read: bool):
+        self.addr = address
+        self.buf = buf
+        self.len = len(buf)
+        self.is_read = read
+
+    @staticmethod
+    def write(address: int, buf) -> 'i2c_msg':
+        return i2c_msg(address, bytearray(buf), False)
+
+    @staticmethod
+    def read(address: int, length: int) -> 'i2c_msg':
+        return i2c_msg(address, bytearray(length), True)
+
+    def __iter__(self):
+        return iter(self.buf)
+
+    def __len__(self):
+        return self.len
+
+    def __bytes__(self):
+        return bytes(self.buf)
+
+
+class SMBus:
+    """Bus /dev/i2c-N emulado"""
+
+    def __init__(self, bus=None):
+        self.bus = get_environment().i2c_bus(bus if bus is not None else 1)
+
+    def write_byte(self, i2c_addr: int, value: int, force=None):
+        self.bus.write(i2c_addr, bytes([value & 0xFF]))
+
+    def read_byte(self, i2c_addr: int, force=None) -> int:
+        return self.bus.read(i2c_addr, 1)[0]
+
+    def write_byte_data(self, i2c_addr: int, register: int, value: int, force=None):
+        self.bus.write(i2c_addr, bytes([register, value & 0xFF]))
+
+    def read_byte_data(self, i2c_addr: int, register: int, force=None) -> int:
+        self.bus.write(i2c_addr, bytes([register]))
+        return self.bus.read(i2c_addr, 1)[0]
+
+    def write_i2c_block_data(self, i2c_addr: int, register: int, data, force=None):
+        self.bus.write(i2c_addr, bytes([register, *data]))
+
+    def read_i2c_block_data(self, i2c_addr: int, register: int, length: int, force=None):
+        self.bus.write(i2c_addr, bytes([register]))
+        return list(self.bus.read(i2c_addr, length))
+
+    def i2c_rdwr(self, *i2c_msgs):
+        for msg in i2c_msgs:
+            if msg.is_read:
+                msg.buf[:] = self.bus.read(msg.addr, msg.len)
+            else:
+                self.bus.write(msg.addr, bytes(msg.buf))
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
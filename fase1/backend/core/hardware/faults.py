@@ -0,0 +1,326 @@
+"""
+Inyección de fallos en dispositivos del Sistema SIEPA
+Envuelve los sensores (reales, emulados o simulados) y las salidas GPIO para provocar,
+con probabilidades configurables por dispositivo, errores de I/O, latencia añadida,
+valores congelados, lecturas fuera de rango y desconexiones temporales. Sirve para
+ejercitar las ramas de error y medir cómo se degrada el sistema antes de desplegarlo
+"""
+
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+# Tipos de fallo y parámetros de cada perfil (probabilidades por operación, duraciones en s)
+FAULT_KINDS = ('io_error', 'latency', 'stuck', 'out_of_range', 'disconnect')
+PROFILE_DEFAULTS = {
+    'IO_ERROR': 0.0,       # Probabilidad de que la operación lance el error del dispositivo
+    'LATENCY': 0.0,        # Probabilidad de añadir LATENCY_S antes de la operación
+    'LATENCY_S': 0.5,
+    'STUCK': 0.0,          # Probabilidad de congelar el último valor durante STUCK_S
+    'STUCK_S': 10.0,
+    'OUT_OF_RANGE': 0.0,   # Probabilidad de devolver un valor imposible
+    'DISCONNECT': 0.0,     # Probabilidad de desconectar el dispositivo durante DISCONNECT_S
+    'DISCONNECT_S': 30.0,
+}
+
+# Valor imposible por dispositivo (voltajes del MCP3008 al doble de Vref)
+OUT_OF_RANGE_VALUES = {
+    'dht11': 255.0,        # Trama corrupta del DHT11
+    'ultrasonic': 1200.0,  # cm - fuera del alcance del HC-SR04
+    'ldr': 6.6,
+    'mq135': 6.6,
+    'bmp180': 0.0,         # hPa
+}
+ADC_OUT_OF_RANGE_CODE = 2047  # Código imposible para un ADC de 10 bits
+
+
+def _device_error(target: str, disconnected: bool) -> Optional[Exception]:
+    """Excepción que lanzaría el dispositivo (None: el dispositivo falla devolviendo None)"""
+    if target == 'ultrasonic':
+        return None  # El HC-SR04 desconectado no produce eco: la medición vence
+    if target == 'dht11':
+        if disconnected:
+            return RuntimeError('DHT sensor not found, check wiring')
+        return RuntimeError('Checksum did not validate. Try again.')
+    if target in ('buzzer', 'motor', 'leds'):
+        return RuntimeError(f'GPIO write failed ({target})')
+    if disconnected:
+        return OSError(121, 'Remote I/O error')
+    return OSError(5, 'Input/output error')
+
+
+def _init_error(device: str) -> Exception:
+    """Excepción al crear un dispositivo desconectado"""
+    if device == 'bmp180':
+        return ValueError('No I2C device at address: 0x77')
+    return OSError(19, f'No such device ({device})')
+
+
+def out_of_range(target: str, value: Any) -> Any:
+    """Versión fuera de rango de una lectura, con la misma forma que la original"""
+    bad = OUT_OF_RANGE_VALUES.get(target, -1.0)
+    if value is None:
+        return None
+    if hasattr(value, '_replace') and hasattr(value, 'code'):  # ADCSample
+        return value._replace(code=ADC_OUT_OF_RANGE_CODE, voltage=bad)
+    if isinstance(value, tuple):
+        return tuple(bad if isinstance(v, (int, float)) else v for v in value)
+    return bad
+
+
+class FaultInjector:
+    """Decide e inyecta fallos por dispositivo"""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None, sleep: Callable[[float], None] = time.sleep):
+        """
+        Args:
+            config: {'ENABLED', 'SEED', 'TARGETS': dispositivo -> perfil (ver PROFILE_DEFAULTS)}
+            sleep: función de espera de la latencia inyectada (inyectable para pruebas)
+        """
+        config = config or {}
+        self.enabled = config.get('ENABLED', False)
+        self.rng = random.Random(config.get('SEED'))
+        self.sleep = sleep
+        self.profiles: Dict[str, Dict[str, float]] = {}
+        for target, profile in config.get('TARGETS', {}).items():
+            self.configure(target, profile)
+
+        self._lock = threading.Lock()
+        self._disconnected_until: Dict[str, float] = {}
+        self._stuck_until: Dict[str, float] = {}
+        self._last: Dict[str, Any] = {}   # clave (dispositivo.miembro) -> último valor bueno
+        self._counters: Dict[str, Dict[str, int]] = {}
+
+    # ============== CONFIGURACIÓN ==============
+
+    def configure(self, target: str, profile: Optional[Dict[str, float]]):
+        """Reemplaza el perfil de un dispositivo (None o {} lo deja sin fallos)"""
+        if not profile:
+            self.profiles.pop(target, None)
+            return
+        unknown = set(profile) - set(PROFILE_DEFAULTS)
+        if unknown:
+            raise ValueError(f"Parámetros de fallo desconocidos para {target}: {sorted(unknown)}")
+        self.profiles[target] = {**PROFILE_DEFAULTS, **profile}
+
+    def set_enabled(self, enabled: bool):
+        self.enabled = enabled
+
+    def reset(self):
+        """Reconecta y descongela todos los dispositivos y borra los contadores"""
+        with self._lock:
+            self._disconnected_until.clear()
+            self._stuck_until.clear()
+            self._last.clear()
+            self._counters.clear()
+
+    # ============== INYECCIÓN ==============
+
+    def _active(self, target: str) -> Optional[Dict[str, float]]:
+        return self.profiles.get(target) if self.enabled else None
+
+    def _roll(self, profile: Dict[str, float], key: str) -> bool:
+        """Sorteo de un fallo (llamar con lock)"""
+        probability = profile[key]
+        return probability > 0 and self.rng.random() < probability
+
+    def _count(self, target: str, kind: str):
+        """Incrementa un contador (llamar con lock)"""
+        counters = self._counters.get(target)
+        if counters is None:
+            counters = self._counters[target] = dict.fromkeys(('operations', 'init_failures') + FAULT_KINDS, 0)
+        counters[kind] += 1
+
+    def _decide(self, target: str, profile: Dict[str, float], now: float):
+        """Sortea desconexión, error de I/O y latencia de una operación"""
+        with self._lock:
+            self._count(target, 'operations')
+            disconnected = self._disconnected_until.get(target, 0.0) > now
+            if not disconnected and self._roll(profile, 'DISCONNECT'):
+                self._disconnected_until[target] = now + profile['DISCONNECT_S']
+                self._count(target, 'disconnect')
+                print(f"🔌 [Fallos] {target}: desconectado por {profile['DISCONNECT_S']}s")
+                disconnected = True
+            failed = disconnected or self._roll(profile, 'IO_ERROR')
+            if failed and not disconnected:
+                self._count(target, 'io_error')
+            delayed = not failed and self._roll(profile, 'LATENCY')
+            if delayed:
+                self._count(target, 'latency')
+        return failed, disconnected, delayed
+
+    def inject(self, target: str, read: Callable[[], Any], member: str = '') -> Any:
+        """
+        Ejecuta una operación de un dispositivo aplicando su perfil de fallos
+
+        Args:
+            target: dispositivo ('dht11', 'bmp180', 'ldr', ...)
+            read: operación real
+            member: miembro leído, para guardar el último valor de cada uno por separado
+        """
+        profile = self._active(target)
+        if profile is None:
+            return read()
+
+        key = f'{target}.{member}'
+        now = time.monotonic()
+        failed, disconnected, delayed = self._decide(target, profile, now)
+        if failed:
+            error = _device_error(target, disconnected)
+            if error is None:
+                return None
+            raise error
+        if delayed:
+            self.sleep(profile['LATENCY_S'])
+
+        with self._lock:
+            stuck = self._stuck_until.get(target, 0.0) > now
+            if not stuck and self._roll(profile, 'STUCK'):
+                self._stuck_until[target] = now + profile['STUCK_S']
+                self._count(target, 'stuck')
+                stuck = True
+            if stuck and key in self._last:
+                return self._last[key]
+            corrupt = self._roll(profile, 'OUT_OF_RANGE')
+            if corrupt:
+                self._count(target, 'out_of_range')
+
+        value = read()
+        if corrupt:
+            return out_of_range(target, value)
+        with self._lock:
+            self._last[key] = value
+        return value
+
+    def actuate(self, target: str) -> bool:
+        """
+        Decide una escritura de salida
+
+        Returns:
+            False si el actuador está congelado y la escritura no llega al pin
+            (lanza el error del dispositivo si la escritura falla)
+        """
+        profile = self._active(target)
+        if profile is None:
+            return True
+        now = time.monotonic()
+        failed, disconnected, delayed = self._decide(target, profile, now)
+        if failed:
+            raise _device_error(target, disconnected)
+        if delayed:
+            self.sleep(profile['LATENCY_S'])
+        with self._lock:
+            if self._stuck_until.get(target, 0.0) > now:
+                return False
+            if self._roll(profile, 'STUCK'):
+                self._stuck_until[target] = now + profile['STUCK_S']
+                self._count(target, 'stuck')
+                return False
+        return True
+
+    def check_init(self, device: str, targets: Iterable[str]):
+        """Lanza el error de inicialización si alguna fuente del dispositivo está desconectada"""
+        now = time.monotonic()
+        with self._lock:
+            for target in targets:
+                profile = self._active(target)
+                if profile is None:
+                    continue
+                if self._disconnected_until.get(target, 0.0) > now or self._roll(profile, 'IO_ERROR'):
+                    self._count(target, 'init_failures')
+                    raise _init_error(device)
+
+    def wrap(self, device: Any, members: Dict[str, Optional[str]]) -> Any:
+        """
+        Envuelve un objeto de dispositivo
+
+        Args:
+            device: objeto real o emulado (DHT11, BMP180, ADCFrontEnd, UltrasonicRanger)
+            members: propiedad o método -> dispositivo del perfil; None = el primer argumento
+                     del método es el nombre del dispositivo (p. ej. ADCFrontEnd.read('ldr'))
+        """
+        return FaultyDevice(self, device, members)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Fallos inyectados y estado (desconectado / congelado) por dispositivo"""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'targets': {
+                    target: {
+                        **self._counters.get(target, {}),
+                        'is_disconnected': self._disconnected_until.get(target, 0.0) > now,
+                        'is_stuck': self._stuck_until.get(target, 0.0) > now,
+                    }
+                    for target in sorted(set(self.profiles) | set(self._counters))
+                },
+            }
+
+
+class FaultyDevice:
+    """Objeto de dispositivo con fallos inyectados en las propiedades o métodos indicados"""
+
+    def __init__(self, injector: FaultInjector, device: Any, members: Dict[str, Optional[str]]):
+        self._injector = injector
+        self._device = device
+        self._members = members
+
+    def __getattr__(self, name: str):
+        if name not in self._members:
+            return getattr(self._device, name)
+        target = self._members[name]
+        if isinstance(getattr(type(self._device), name, None), property):
+            return self._injector.inject(target, lambda: getattr(self._device, name), name)
+
+        method = getattr(self._device, name)
+
+        def call(*args, **kwargs):
+            source = target if target is not None else args[0]
+            return self._injector.inject(source, lambda: method(*args, **kwargs), name)
+        return call
+
+    def __setattr__(self, name: str, value: Any):
+        if name.startswith('_'):
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self._device, name, value)
+
+
+class FaultyGPIO:
+    """
+    Módulo GPIO con fallos en las escrituras de salida
+
+    Un error de I/O hace que GPIO.output lance RuntimeError; un actuador congelado
+    ignora las escrituras (el pin conserva su nivel aunque el registro sombra cambie).
+    """
+
+    def __init__(self, injector: FaultInjector, gpio, pin_targets: Dict[int, str]):
+        """
+        Args:
+            gpio: módulo RPi.GPIO (real o emulado)
+            pin_targets: pin -> perfil de fallos ('buzzer', 'motor', 'leds')
+        """
+        self._injector = injector
+        self._gpio = gpio
+        self._pin_targets = pin_targets
+
+    def output(self, channel, value):
+        channels = list(channel) if isinstance(channel, (list, tuple)) else [channel]
+        values = list(value) if isinstance(value, (list, tuple)) else [value] * len(channels)
+        written_channels, written_values = [], []
+        for pin, level in zip(channels, values):
+            target = self._pin_targets.get(pin)
+            if target is None:
+                written_channels.append(pin)
+                written_values.append(level)
+                continue
+            if self._injector.actuate(target):
+                written_channels.append(pin)
+                written_values.append(level)
+        if written_channels:
+            self._gpio.output(written_channels, written_values)
+
+    def __getattr__(self, name: str):
+        return getattr(self._gpio, name)
@@ -0,0 +1,157 @@
+"""
+Salidas GPIO del Sistema SIEPA con registro sombra
+Guarda una copia del estado de cada pin de salida (LEDs, buzzer, motor) y solo escribe
+en el hardware cuando el estado cambia. Las actualizaciones de varios pines se agrupan
+en una sola llamada y el estado real de los pines queda disponible como snapshot
+"""
+
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Optional, Union
+
+
+class GPIOOutputs:
+    """Capa de salidas GPIO con registro sombra y escrituras coalescidas"""
+
+    def __init__(self, gpio=None):
+        """
+        Args:
+            gpio: módulo RPi.GPIO ya configurado (setmode); None = sin hardware
+                  (modo testing/replay: el registro sombra se mantiene igual)
+        """
+        self.gpio = gpio
+        self._lock = threading.RLock()
+        self._names: Dict[int, str] = {}       # pin -> nombre
+        self._pins: Dict[str, int] = {}        # nombre -> pin
+        self._active_low: Dict[int, bool] = {}
+        self._state: Dict[int, bool] = {}      # pin -> encendido (lógico)
+        self._pending: Optional[Dict[int, bool]] = None  # Cambios de un batch abierto
+        self.writes = 0      # Llamadas a GPIO.output (o que se harían sin hardware)
+        self.coalesced = 0   # Escrituras evitadas por no haber cambio
+        self.errors = 0      # Escrituras fallidas (el registro sombra no cambia y se reintentan)
+
+    def setup(self, pin: int, name: str, initial: bool = False, active_low: bool = False):
+        """
+        Registra un pin de salida
+
+        Args:
+            pin: número BCM
+            name: nombre lógico (p. ej. 'buzzer', 'motor', 'led_temperature')
+            initial: estado lógico inicial (True = encendido)
+            active_low: el dispositivo se enciende con nivel LOW (p. ej. el buzzer)
+        """
+        with self._lock:
+            self._names[pin] = name
+            self._pins[name] = pin
+            self._active_low[pin] = active_low
+            self._state[pin] = initial
+            if self.gpio is not None:
+                self.gpio.setup(pin, self.gpio.OUT, initial=self._level(pin, initial))
+
+    def alias(self, name: str, target: str):
+        """Nombre adicional para un pin ya registrado (p. ej. dos alertas que comparten LED)"""
+        with self._lock:
+            self._pins[name] = self._pins[target]
+
+    def pin(self, output: Union[int, str]) -> int:
+        """Pin para un nombre o número de pin"""
+        return self._pins[output] if isinstance(output, str) else output
+
+    def _level(self, pin: int, state: bool):
+        """Nivel eléctrico para un estado lógico"""
+        on = not state if self._active_low[pin] else state
+        if self.gpio is None:
+            return on
+        return self.gpio.HIGH if on else self.gpio.LOW
+
+    def set(self, output: Union[int, str], state: bool) -> bool:
+        """
+        Cambia una salida; solo escribe en el hardware si el estado es distinto
+
+        Returns:
+            True si el estado cambió
+        """
+        return bool(self.set_many({output: state}))
+
+    def set_many(self, states: Dict[Union[int, str], bool]) -> int:
+        """
+        Cambia varias salidas escribiendo solo los pines que cambian, en una sola llamada
+
+        Returns:
+            número de pines que cambiaron
+        """
+        with self._lock:
+            changes = {}
+            for output, state in states.items():
+                pin = self.pin(output)
+                state = bool(state)
+                current = self._pending.get(pin, self._state[pin]) if self._pending is not None else self._state[pin]
+                if current == state:
+                    self.coalesced += 1
+                    continue
+                changes[pin] = state
+
+            if self._pending is not None:
+                self._pending.update(changes)
+                return len(changes)
+            self._write(changes)
+            return len(changes)
+
+    def _write(self, changes: Dict[int, bool]):
+        """Escribe los cambios en el hardware y actualiza el registro sombra (llamar con lock)"""
+        # Descartar cambios que al final del batch vuelven al estado actual
+        changes = {pin: state for pin, state in changes.items() if self._state[pin] != state}
+        if not changes:
+            return
+        if self.gpio is not None:
+            pins = list(changes)
+            levels = [self._level(pin, changes[pin]) for pin in pins]
+            try:
+                if len(pins) == 1:
+                    self.gpio.output(pins[0], levels[0])
+                else:
+                    self.gpio.output(pins, levels)  # RPi.GPIO acepta listas de canales y valores
+            except (RuntimeError, OSError) as e:
+                # Sin actualizar el registro sombra: el próximo set con el mismo estado reintenta
+                self.errors += 1
+                print(f"⚠️ GPIO: Error al escribir pines {pins} - {e}")
+                return
+        self.writes += 1
+        self._state.update(changes)
+
+    @contextmanager
+    def batch(self):
+        """
+        Agrupa cambios: dentro del bloque solo se acumulan y al salir se escriben juntos
+
+        Varios cambios del mismo pin dentro del batch se reducen al último.
+        """
+        with self._lock:
+            outer = self._pending is not None
+            if not outer:
+                self._pending = {}
+            try:
+                yield self
+            finally:
+                if not outer:
+                    pending, self._pending = self._pending, None
+                    self._write(pending)
+
+    def get(self, output: Union[int, str]) -> bool:
+        """Estado lógico actual de una salida"""
+        with self._lock:
+            return self._state[self.pin(output)]
+
+    def all_off(self):
+        """Apaga todas las salidas registradas"""
+        self.set_many({pin: False for pin in list(self._state)})
+
+    def snapshot(self) -> Dict[str, bool]:
+        """Estado lógico de todas las salidas por nombre"""
+        with self._lock:
+            return {self._names[pin]: state for pin, state in self._state.items()}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Escrituras realizadas y evitadas"""
+        with self._lock:
+            return {'writes': self.writes, 'coalesced': self.coalesced, 'errors': self.errors}
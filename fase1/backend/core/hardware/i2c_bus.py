@@ -0,0 +1,240 @@
+"""
+Arbitraje del bus I2C del Sistema SIEPA
+El LCD (PCF8574) y el BMP180 comparten el bus I2C 1. Un gestor por bus físico ejecuta
+todas las transacciones en un solo hilo, en orden de prioridad (las lecturas de sensores
+antes que las escrituras del display), y mide el tiempo que el bus pasa ocupado
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+# Prioridades de transacción (menor = antes)
+PRIORITY_SENSOR = 0
+PRIORITY_DISPLAY = 10
+
+
+class I2CBusManager:
+    """Serializa las transacciones de un bus I2C físico con una cola de prioridad"""
+
+    def __init__(self, bus_id: int = 1):
+        """
+        Args:
+            bus_id: número del bus (/dev/i2c-N)
+        """
+        self.bus_id = bus_id
+        self._cond = threading.Condition()
+        self._queue: List = []  # (prioridad, seq, función, future, cliente, encolado)
+        self._seq = itertools.count()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+        self._started_at = time.monotonic()
+        self._busy = 0.0
+        self._clients: Dict[str, Dict[str, float]] = {}
+
+    # ============== API ==============
+
+    def submit(self, fn: Callable[[], Any], priority: int = PRIORITY_DISPLAY,
+               client: str = 'display') -> Future:
+        """
+        Encola una transacción sin esperarla
+
+        Args:
+            fn: función que realiza la transacción completa en el bus
+            priority: PRIORITY_SENSOR, PRIORITY_DISPLAY u otro entero (menor = antes)
+            client: nombre del dispositivo, para las estadísticas
+        """
+        future = Future()
+        if threading.current_thread() is self._thread:
+            # Transacción anidada desde el propio hilo del bus: ejecutar en línea
+            self._execute(fn, future, client, time.monotonic())
+            return future
+        with self._cond:
+            if not self._running:
+                self._start()
+            heapq.heappush(self._queue, (priority, next(self._seq), fn, future, client, time.monotonic()))
+            self._cond.notify()
+        return future
+
+    def execute(self, fn: Callable[[], Any], priority: int = PRIORITY_SENSOR,
+                client: str = 'sensor', timeout: Optional[float] = None) -> Any:
+        """Ejecuta una transacción y espera su resultado (propaga sus excepciones)"""
+        return self.submit(fn, priority, client).result(timeout)
+
+    def pending(self) -> int:
+        """Transacciones en cola"""
+        with self._cond:
+            return len(self._queue)
+
+    def stop(self):
+        """Detiene el hilo del bus (las transacciones en cola se descartan)"""
+        with self._cond:
+            self._running = False
+            for entry in self._queue:
+                entry[3].cancel()
+            self._queue.clear()
+            self._cond.notify()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1.0)
+        self._thread = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Utilización del bus y, por cliente, transacciones, tiempo ocupado y espera en cola"""
+        with self._cond:
+            elapsed = time.monotonic() - self._started_at
+            clients = {}
+            for client, stats in self._clients.items():
+                count = stats['transactions']
+                clients[client] = {
+                    'transactions': count,
+                    'busy_ms': round(stats['busy'] * 1000, 1),
+                    'mean_wait_ms': round(stats['wait'] / count * 1000, 2) if count else None,
+                    'max_wait_ms': round(stats['max_wait'] * 1000, 1),
+                }
+            return {
+                'bus': self.bus_id,
+                'utilization': round(self._busy / elapsed, 4) if elapsed > 0 else 0.0,
+                'busy_s': round(self._busy, 3),
+                'queued': len(self._queue),
+                'clients': clients,
+            }
+
+    # ============== INTERNOS ==============
+
+    def _start(self):
+        """Inicia el hilo del bus (llamar con lock)"""
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name=f'i2c-bus-{self.bus_id}', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        """Hilo del bus: ejecuta las transacciones por prioridad, una a la vez"""
+        while True:
+            with self._cond:
+                while self._running and not self._queue:
+                    self._cond.wait()
+                if not self._running:
+                    return
+                _, _, fn, future, client, queued_at = heapq.heappop(self._queue)
+            self._execute(fn, future, client, queued_at)
+
+    def _execute(self, fn: Callable[[], Any], future: Future, client: str, queued_at: float):
+        """Ejecuta una transacción registrando espera y tiempo ocupado"""
+        if not future.set_running_or_notify_cancel():
+            return
+        started = time.monotonic()
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+        else:
+            future.set_result(result)
+        finally:
+            busy = time.monotonic() - started
+            wait = started - queued_at
+            with self._cond:
+                self._busy += busy
+                stats = self._clients.get(client)
+                if stats is None:
+                    stats = self._clients[client] = {'transactions': 0, 'busy': 0.0, 'wait': 0.0, 'max_wait': 0.0}
+                stats['transactions'] += 1
+                stats['busy'] += busy
+                stats['wait'] += wait
+                if wait > stats['max_wait']:
+                    stats['max_wait'] = wait
+
+
+class BatchedI2CWriter:
+    """
+    Envoltura del objeto SMBus de RPLCD que agrupa las escrituras de un byte
+
+    Dentro de batch() los bytes dirigidos al PCF8574 se acumulan y se envían en una sola
+    transacción I2C (el PCF8574 toma cada byte recibido como nuevo estado de sus pines).
+    Fuera de batch() las escrituras pasan directo al bus. En un batch solo deben ir
+    comandos rápidos del HD44780 (posición del cursor, caracteres): clear() y home()
+    necesitan ~1.5 ms de espera que el envío agrupado no respeta.
+    """
+
+    def __init__(self, bus, max_batch: int = 256):
+        """
+        Args:
+            bus: objeto SMBus (smbus2 o smbus) creado por RPLCD
+            max_batch: bytes máximos por transacción
+        """
+        self._bus = bus
+        self.max_batch = max_batch
+        self._address: Optional[int] = None
+        self._buffer: Optional[bytearray] = None
+        try:
+            from smbus2 import i2c_msg
+            self._i2c_msg = i2c_msg if hasattr(bus, 'i2c_rdwr') else None
+        except ImportError:
+            self._i2c_msg = None
+        self.bytes_written = 0
+        self.transactions = 0
+
+    def write_byte(self, address: int, value: int, *args):
+        if self._buffer is None or self._i2c_msg is None:
+            self.bytes_written += 1
+            self.transactions += 1
+            return self._bus.write_byte(address, value, *args)
+        if self._address is not None and address != self._address:
+            self.flush()
+        self._address = address
+        self._buffer.append(value & 0xFF)
+        if len(self._buffer) >= self.max_batch:
+            self.flush()
+
+    def flush(self):
+        """Envía los bytes acumulados en una transacción"""
+        if not self._buffer:
+            return
+        self._bus.i2c_rdwr(self._i2c_msg.write(self._address, bytes(self._buffer)))
+        self.bytes_written += len(self._buffer)
+        self.transactions += 1
+        self._buffer.clear()
+
+    @contextmanager
+    def batch(self):
+        """Agrupa las escrituras del bloque"""
+        outer = self._buffer is not None
+        if not outer:
+            self._buffer = bytearray()
+        try:
+            yield self
+        finally:
+            if not outer:
+                try:
+                    self.flush()
+                finally:
+                    self._buffer = None
+                    self._address = None
+
+    def __getattr__(self, name):
+        return getattr(self._bus, name)
+
+
+# Un gestor por bus físico, compartido por todos los dispositivos del proceso
+_buses: Dict[int, I2CBusManager] = {}
+_buses_lock = threading.Lock()
+
+
+def get_i2c_bus(bus_id: int = 1) -> I2CBusManager:
+    """Gestor del bus I2C indicado (se crea la primera vez)"""
+    with _buses_lock:
+        bus = _buses.get(bus_id)
+        if bus is None:
+            bus = _buses[bus_id] = I2CBusManager(bus_id)
+        return bus
+
+
+def i2c_bus_stats() -> Dict[int, Dict[str, Any]]:
+    """Estadísticas de todos los buses I2C en uso"""
+    with _buses_lock:
+        buses = list(_buses.values())
+    return {bus.bus_id: bus.get_stats() for bus in buses}
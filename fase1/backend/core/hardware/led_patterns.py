@@ -0,0 +1,253 @@
+"""
+Motor de patrones animados de LEDs del Sistema SIEPA
+Reproduce tablas de cuadros (persecución, parpadeo a N Hz, respiración por PWM por
+software, estrobo de alerta o patrones definidos por MQTT) en un hilo propio con plazos
+monotónicos, escribiendo a través del registro sombra de GPIOOutputs. Iniciar o detener
+un patrón nunca bloquea al llamador
+"""
+
+import math
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Cuadro interno: (nivel por LED 0..1, duración en segundos)
+Frame = Tuple[Tuple[float, ...], float]
+
+
+class LEDPatternEngine:
+    """Reproductor de animaciones de LEDs en segundo plano"""
+
+    def __init__(self, outputs, leds: Sequence[str], pwm_period: float = 0.01,
+                 max_frames: int = 256):
+        """
+        Args:
+            outputs: GPIOOutputs donde están registrados los LEDs
+            leds: nombres de salida de los LEDs, en el orden de las columnas de los cuadros
+            pwm_period: periodo del PWM por software para niveles intermedios (segundos)
+            max_frames: límite de cuadros de un patrón recibido por MQTT
+        """
+        self.outputs = outputs
+        self.leds = list(leds)
+        self.pwm_period = pwm_period
+        self.max_frames = max_frames
+
+        self.patterns: Dict[str, Dict[str, Any]] = {}  # Patrones definidos por el usuario
+        self.current: Optional[str] = None
+        self.frames_played = 0
+
+        self._cond = threading.Condition()
+        self._program: Optional[Tuple[List[Frame], Optional[int]]] = None
+        self._generation = 0
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self.on_finish = None  # Callback al terminar un patrón con repeticiones finitas
+
+    # ============== PATRONES INCORPORADOS ==============
+
+    def chase(self, interval: float = 0.15) -> List[Frame]:
+        """Un LED encendido que recorre la fila"""
+        n = len(self.leds)
+        return [(tuple(1.0 if i == k else 0.0 for i in range(n)), interval) for k in range(n)]
+
+    def blink(self, hz: float = 2.0) -> List[Frame]:
+        """Todos los LEDs parpadean a hz ciclos por segundo"""
+        half = 1.0 / (2 * hz)
+        n = len(self.leds)
+        return [((1.0,) * n, half), ((0.0,) * n, half)]
+
+    def breathe(self, period: float = 2.0, steps: int = 40) -> List[Frame]:
+        """Brillo senoidal de todos los LEDs mediante PWM por software"""
+        n = len(self.leds)
+        frames = []
+        for k in range(steps):
+            level = round((1 - math.cos(2 * math.pi * k / steps)) / 2, 3)
+            frames.append(((level,) * n, period / steps))
+        return frames
+
+    def strobe(self, flash: float = 0.04, gap: float = 0.08, pause: float = 0.5) -> List[Frame]:
+        """Estrobo de alerta: doble destello y pausa"""
+        n = len(self.leds)
+        on, off = (1.0,) * n, (0.0,) * n
+        return [(on, flash), (off, gap), (on, flash), (off, pause)]
+
+    def builtin(self, name: str, options: Dict[str, Any]) -> Optional[List[Frame]]:
+        """Cuadros de un patrón incorporado con sus opciones, None si no existe"""
+        if name in ('chase', 'sequence'):
+            return self.chase(float(options.get('interval', 0.15)))
+        if name == 'blink':
+            return self.blink(float(options.get('hz', 2.0)))
+        if name == 'breathe':
+            return self.breathe(float(options.get('period', 2.0)))
+        if name == 'strobe':
+            return self.strobe()
+        return None
+
+    # ============== TABLAS DE CUADROS ==============
+
+    def parse_frames(self, spec: Dict[str, Any]) -> List[Frame]:
+        """
+        Convierte una tabla de cuadros recibida por MQTT
+
+        Formatos aceptados en spec['frames']:
+            [[1, 0, 0, 0], [0, 1, 0, 0]]  con spec['interval'] (niveles en el orden de los LEDs)
+            [{'temperature': 1, 'light': 0.5, 'duration': 0.2}, ...]  (LEDs omitidos = 0)
+        """
+        raw_frames = spec.get('frames')
+        if not isinstance(raw_frames, list) or not raw_frames:
+            raise ValueError("El patrón debe tener una lista 'frames' no vacía")
+        if len(raw_frames) > self.max_frames:
+            raise ValueError(f"El patrón excede {self.max_frames} cuadros")
+
+        interval = float(spec.get('interval', 0.2))
+        names = [led[len('led_'):] if led.startswith('led_') else led for led in self.leds]
+        frames = []
+        for raw in raw_frames:
+            if isinstance(raw, dict):
+                levels = tuple(float(raw.get(name, 0)) for name in names)
+                duration = float(raw.get('duration', interval))
+            else:
+                if len(raw) != len(self.leds):
+                    raise ValueError(f"Cada cuadro debe tener {len(self.leds)} niveles")
+                levels = tuple(float(v) for v in raw)
+                duration = interval
+            if duration <= 0:
+                raise ValueError("La duración de un cuadro debe ser positiva")
+            frames.append((tuple(min(max(v, 0.0), 1.0) for v in levels), duration))
+        return frames
+
+    def define(self, name: str, spec: Dict[str, Any]):
+        """Registra un patrón definido por el usuario para reproducirlo por nombre"""
+        self.parse_frames(spec)  # Validar antes de guardar
+        self.patterns[name] = dict(spec)
+
+    # ============== REPRODUCCIÓN ==============
+
+    def play(self, name: str, frames: List[Frame], repeat: Optional[int] = None):
+        """
+        Reproduce un patrón reemplazando al actual (no bloquea)
+
+        Args:
+            name: nombre del patrón (para estado)
+            frames: cuadros a reproducir
+            repeat: número de vueltas; None = indefinidamente
+        """
+        with self._cond:
+            self._program = (frames, repeat)
+            self._generation += 1
+            self.current = name
+            if not self._running:
+                self._running = True
+                self._thread = threading.Thread(target=self._run, name='led-patterns', daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def stop(self):
+        """Detiene el patrón actual (los LEDs quedan como los deje el llamador)"""
+        with self._cond:
+            self._program = None
+            self._generation += 1
+            self.current = None
+            self._cond.notify()
+
+    def shutdown(self):
+        """Detiene el hilo del motor"""
+        with self._cond:
+            self._running = False
+            self._program = None
+            self._generation += 1
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def is_playing(self) -> bool:
+        return self.current is not None
+
+    def _wait_until(self, deadline: float, generation: int) -> bool:
+        """Espera hasta deadline; False si el patrón cambió mientras tanto"""
+        with self._cond:
+            while self._generation == generation:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return True
+                self._cond.wait(remaining)
+            return False
+
+    def _show(self, levels: Sequence[float], generation: int, threshold: float = 0.5) -> bool:
+        """
+        Escribe un cuadro binario (niveles >= threshold = encendido)
+
+        Se escribe bajo el lock del motor para que un patrón detenido no pise los LEDs
+        que el llamador acaba de fijar.
+        """
+        with self._cond:
+            if self._generation != generation:
+                return False
+            self.outputs.set_many({led: level >= threshold for led, level in zip(self.leds, levels)})
+            return True
+
+    def _play_frame(self, levels: Sequence[float], start: float, end: float, generation: int) -> bool:
+        """Muestra un cuadro entre start y end; niveles intermedios con PWM por software"""
+        if all(level in (0.0, 1.0) for level in levels):
+            return self._show(levels, generation) and self._wait_until(end, generation)
+
+        # PWM: al inicio de cada periodo se encienden los LEDs con nivel > 0 y cada uno
+        # se apaga al cumplir su ciclo de trabajo
+        cuts = sorted(set(level for level in levels if 0.0 < level < 1.0))
+        period_start = start
+        while period_start < end:
+            if not self._show(levels, generation, threshold=1e-9):
+                return False
+            for cut in cuts:
+                if not self._wait_until(min(period_start + cut * self.pwm_period, end), generation):
+                    return False
+                if not self._show(levels, generation, threshold=cut + 1e-9):
+                    return False
+            period_start += self.pwm_period
+            if not self._wait_until(min(period_start, end), generation):
+                return False
+        return True
+
+    def _run(self):
+        """Hilo del motor: reproduce el programa actual con plazos absolutos (sin deriva)"""
+        while True:
+            with self._cond:
+                while self._running and self._program is None:
+                    self._cond.wait()
+                if not self._running:
+                    return
+                frames, repeat = self._program
+                generation = self._generation
+
+            deadline = time.monotonic()
+            loops = 0
+            completed = True
+            while repeat is None or loops < repeat:
+                for levels, duration in frames:
+                    start, deadline = deadline, deadline + duration
+                    if not self._play_frame(levels, start, deadline, generation):
+                        completed = False
+                        break
+                    self.frames_played += 1
+                if not completed:
+                    break
+                loops += 1
+
+            if completed:
+                # Terminó un patrón con repeticiones finitas
+                with self._cond:
+                    finished = self._generation == generation
+                    if finished:
+                        self._program = None
+                        self.current = None
+                if finished and self.on_finish is not None:
+                    self.on_finish()
+
+    def get_status(self) -> Dict[str, Any]:
+        """Patrón actual, patrones definidos y cuadros reproducidos"""
+        return {
+            'current': self.current,
+            'defined': sorted(self.patterns),
+            'frames_played': self.frames_played,
+        }
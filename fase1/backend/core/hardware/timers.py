@@ -0,0 +1,198 @@
+"""
+Temporizadores de salidas del Sistema SIEPA
+Rueda de temporizadores (hashed timer wheel) con un solo hilo: apaga LEDs de alerta y
+el buzzer en su plazo exacto, independiente del periodo del loop principal. Armar,
+rearmar y cancelar un temporizador es O(1)
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+
+class _Timer:
+    __slots__ = ('key', 'deadline', 'tick', 'callback')
+
+    def __init__(self, key, deadline, tick, callback):
+        self.key = key
+        self.deadline = deadline
+        self.tick = tick
+        self.callback = callback
+
+
+class TimerWheel:
+    """Rueda de temporizadores con resolución de un tick y un hilo de disparo"""
+
+    def __init__(self, tick: float = 0.01, slots: int = 512,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            tick: resolución de la rueda (segundos)
+            slots: ranuras de la rueda; plazos más largos dan varias vueltas
+            clock: reloj monotónico (inyectable para pruebas)
+        """
+        self.tick = tick
+        self.slots = slots
+        self.clock = clock
+
+        self._wheel: List[Dict[Hashable, _Timer]] = [{} for _ in range(slots)]
+        self._timers: Dict[Hashable, _Timer] = {}
+        self._origin = clock()
+        self._current_tick = 0  # Último tick procesado
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+        self.fired = 0
+        self.cancelled = 0
+        self.max_lateness = 0.0
+
+    def _tick_of(self, when: float) -> int:
+        """Tick en que vence un instante (redondeo hacia arriba: nunca antes del plazo)"""
+        ticks = (when - self._origin) / self.tick
+        whole = int(ticks)
+        return whole if whole == ticks else whole + 1
+
+    # ============== API ==============
+
+    def start(self):
+        """Inicia el hilo de disparo"""
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name='timer-wheel', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Detiene el hilo de disparo sin ejecutar los temporizadores pendientes"""
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def is_running(self) -> bool:
+        return self._running
+
+    def arm(self, key: Hashable, delay: float, callback: Callable[[], Any]):
+        """
+        Programa callback dentro de delay segundos; si key ya estaba armado se rearma
+
+        El callback se ejecuta en el hilo de la rueda.
+        """
+        deadline = self.clock() + delay
+        with self._cond:
+            self._remove(key)
+            timer = _Timer(key, deadline, max(self._tick_of(deadline), self._current_tick + 1), callback)
+            self._timers[key] = timer
+            self._wheel[timer.tick % self.slots][key] = timer
+            self._cond.notify()
+
+    def cancel(self, key: Hashable) -> bool:
+        """Cancela un temporizador; True si estaba armado"""
+        with self._cond:
+            if self._remove(key):
+                self.cancelled += 1
+                return True
+            return False
+
+    def cancel_where(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Cancela todos los temporizadores cuya clave cumple predicate"""
+        with self._cond:
+            keys = [key for key in self._timers if predicate(key)]
+            for key in keys:
+                self._remove(key)
+            self.cancelled += len(keys)
+            return len(keys)
+
+    def is_armed(self, key: Hashable) -> bool:
+        return key in self._timers
+
+    def remaining(self, key: Hashable) -> Optional[float]:
+        """Segundos hasta el plazo de un temporizador armado"""
+        with self._cond:
+            timer = self._timers.get(key)
+            return None if timer is None else max(0.0, timer.deadline - self.clock())
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Temporizadores armados, disparados, cancelados y retraso máximo observado"""
+        with self._cond:
+            return {
+                'armed': len(self._timers),
+                'fired': self.fired,
+                'cancelled': self.cancelled,
+                'max_lateness_ms': round(self.max_lateness * 1000, 1),
+            }
+
+    # ============== INTERNOS ==============
+
+    def _remove(self, key: Hashable) -> bool:
+        """Quita un temporizador de la rueda (llamar con lock)"""
+        timer = self._timers.pop(key, None)
+        if timer is None:
+            return False
+        del self._wheel[timer.tick % self.slots][key]
+        return True
+
+    def _collect_due(self, now: float) -> List[_Timer]:
+        """
+        Recorre las ranuras desde el último tick procesado hasta el actual (llamar con lock)
+
+        Los temporizadores del tick en curso cuyo plazo exacto ya pasó también se disparan,
+        así el retraso no depende de la resolución de la rueda.
+        """
+        now_tick = int((now - self._origin) / self.tick)
+        due = []
+        start = self._current_tick + 1
+        # Si el hilo se atrasó más de una vuelta basta con revisar cada ranura una vez
+        end = min(now_tick, start + self.slots - 1)
+        for tick in range(start, end + 1):
+            slot = self._wheel[tick % self.slots]
+            if not slot:
+                continue
+            for key, timer in list(slot.items()):
+                if timer.tick <= now_tick:
+                    del slot[key]
+                    del self._timers[key]
+                    due.append(timer)
+        self._current_tick = max(self._current_tick, now_tick)
+
+        upcoming = self._wheel[(now_tick + 1) % self.slots]
+        for key, timer in list(upcoming.items()):
+            if timer.tick == now_tick + 1 and timer.deadline <= now:
+                del upcoming[key]
+                del self._timers[key]
+                due.append(timer)
+        return due
+
+    def _next_wait(self) -> Optional[float]:
+        """Espera hasta el próximo plazo, None si no hay temporizadores (llamar con lock)"""
+        if not self._timers:
+            return None
+        next_deadline = min(timer.deadline for timer in self._timers.values())
+        return max(0.0, next_deadline - self.clock())
+
+    def _run(self):
+        """Hilo de la rueda: espera al próximo plazo y dispara los temporizadores vencidos"""
+        while True:
+            with self._cond:
+                if not self._running:
+                    return
+                wait = self._next_wait()
+                if wait is None or wait > 0:
+                    self._cond.wait(wait)
+                    if not self._running:
+                        return
+                now = self.clock()
+                due = self._collect_due(now)
+
+            for timer in due:
+                lateness = now - timer.deadline
+                if lateness > self.max_lateness:
+                    self.max_lateness = lateness
+                self.fired += 1
+                try:
+                    timer.callback()
+                except Exception as e:
+                    print(f"⚠️ Temporizador {timer.key}: error en callback - {e}")
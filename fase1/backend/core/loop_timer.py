@@ -0,0 +1,106 @@
+"""
+Temporizador de periodo fijo del loop principal del Sistema SIEPA
+Los ciclos se programan sobre una grilla de vencimientos monotónicos (inicio + n·periodo),
+así el periodo real no acumula el tiempo de lectura, display y publicación. Cuando un
+ciclo se pasa del siguiente vencimiento se aplica una política definida: saltar los
+ciclos perdidos o recuperarlos seguidos. Registra el retraso de cada ciclo respecto de
+su vencimiento, los desbordes y un histograma del tiempo de trabajo
+"""
+
+import math
+import time
+from typing import Any, Dict, Optional
+
+from .sensors.watchdog import LatencyHistogram
+
+OVERRUN_SKIP = 'skip'          # Descartar los vencimientos perdidos: se sigue en la grilla
+OVERRUN_COMPRESS = 'compress'  # Ejecutar los vencimientos perdidos sin espera (hasta max_catch_up)
+OVERRUN_POLICIES = (OVERRUN_SKIP, OVERRUN_COMPRESS)
+
+
+class FixedRateTimer:
+    """Cadencia de periodo fijo con métricas de retraso y desborde"""
+
+    def __init__(self, period: float, policy: str = OVERRUN_SKIP, max_catch_up: int = 3,
+                 clock=time.monotonic):
+        """
+        Args:
+            period: periodo objetivo del ciclo (s)
+            policy: OVERRUN_SKIP u OVERRUN_COMPRESS
+            max_catch_up: ciclos atrasados que 'compress' recupera; el resto se salta
+            clock: reloj monotónico (inyectable para pruebas)
+        """
+        if period <= 0:
+            raise ValueError(f"Periodo inválido: {period}")
+        if policy not in OVERRUN_POLICIES:
+            raise ValueError(f"Política de desborde desconocida: {policy} (use {', '.join(OVERRUN_POLICIES)})")
+        self.period = period
+        self.policy = policy
+        self.max_catch_up = max(0, max_catch_up)
+        self.clock = clock
+
+        self._deadline: Optional[float] = None   # Vencimiento del ciclo en curso / siguiente
+        self._cycle_start: Optional[float] = None
+        self.cycles = 0
+        self.overruns = 0            # Ciclos que terminaron después del siguiente vencimiento
+        self.skipped_cycles = 0      # Vencimientos descartados
+        self.compressed_cycles = 0   # Ciclos ejecutados sin espera para recuperar el atraso
+        self.last_lag = 0.0
+        self.lag = LatencyHistogram()
+        self.work = LatencyHistogram()
+
+    def start(self, now: Optional[float] = None):
+        """Ancla la grilla: el primer ciclo vence de inmediato"""
+        self._deadline = self.clock() if now is None else now
+        self._cycle_start = None
+
+    def begin_cycle(self) -> float:
+        """Marca el inicio de un ciclo y devuelve su retraso respecto del vencimiento (s)"""
+        now = self.clock()
+        if self._deadline is None:
+            self.start(now)
+        self.last_lag = max(0.0, now - self._deadline)
+        self.lag.record(self.last_lag)
+        self._cycle_start = now
+        return self.last_lag
+
+    def end_cycle(self) -> float:
+        """Marca el fin del ciclo, programa el siguiente y devuelve cuánto esperar (s)"""
+        now = self.clock()
+        if self._cycle_start is not None:
+            self.work.record(now - self._cycle_start)
+            self._cycle_start = None
+        self.cycles += 1
+
+        deadline = self._deadline if self._deadline is not None else now
+        following = deadline + self.period
+        if now > following:
+            # Vencimientos ya pasados después del de este ciclo
+            missed = int(math.floor((now - deadline) / self.period))
+            self.overruns += 1
+            if self.policy == OVERRUN_COMPRESS and missed <= self.max_catch_up:
+                self.compressed_cycles += 1
+            elif self.policy == OVERRUN_COMPRESS:
+                dropped = missed - self.max_catch_up
+                self.skipped_cycles += dropped
+                following = deadline + (dropped + 1) * self.period
+                self.compressed_cycles += 1 if self.max_catch_up else 0
+            else:
+                self.skipped_cycles += missed
+                following = deadline + (missed + 1) * self.period
+        self._deadline = following
+        return max(0.0, following - now)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Periodo, política, desbordes e histogramas de retraso y tiempo de trabajo"""
+        return {
+            'period_s': self.period,
+            'policy': self.policy,
+            'cycles': self.cycles,
+            'overruns': self.overruns,
+            'skipped_cycles': self.skipped_cycles,
+            'compressed_cycles': self.compressed_cycles,
+            'last_lag_ms': round(self.last_lag * 1000, 2),
+            'lag': self.lag.to_dict(),
+            'work': self.work.to_dict(),
+        }
@@ -6,7 +6,8 @@ Maneja la comunicación MQTT de forma integrada
 import json
 import time
 from typing import Dict, Any, Optional, Callable
-from config import MQTT_CONFIG
+from config import MQTT_CONFIG, SYSTEM_CONFIG
+from ..sensors.reading import SensorReading
 
 try:
     import paho.mqtt.client as mqtt
@@ -15,6 +16,16 @@ except ImportError:
     MQTT_AVAILABLE = False
     mqtt = None
 
+# Fuente de lectura (ver SENSOR_SOURCES) de cada tópico individual
+TOPIC_SOURCES = {
+    'TEMPERATURE': 'dht11',
+    'HUMIDITY': 'dht11',
+    'DISTANCE': 'ultrasonic',
+    'LIGHT': 'ldr',
+    'AIR_QUALITY': 'mq135',
+    'PRESSURE': 'bmp180',
+}
+
 class MQTTManager:
     """Gestor de comunicación MQTT"""
     
@@ -24,6 +35,7 @@ class MQTTManager:
         self.client = None
         self.connected = False
         self.on_message_callback = None
+        self._topic_payloads = self._build_topic_payloads()
         
         print(f"🔧 Inicializando MQTTManager en modo: {mode}")
         
@@ -100,7 +112,7 @@ class MQTTManager:
             self.client.loop_stop()
             self.client.disconnect()
     
-    def publish_sensor_data(self, sensor_data: Dict[str, Any]) -> bool:
+    def publish_sensor_data(self, sensor_data: SensorReading) -> bool:
         """Publica datos de sensores"""
         if not self.connected:
             print("⚠️  MQTT no conectado - no se pueden enviar datos")
@@ -108,12 +120,11 @@ class MQTTManager:
             
         try:
             # Publicar datos completos con información adicional
-            payload = json.dumps({
-                **sensor_data,
-                'mode': self.mode,
-                'timestamp': time.time(),
-                'system': 'SIEPA'
-            })
+            payload = json.dumps(sensor_data.to_payload(
+                mode=self.mode,
+                timestamp=time.time(),
+                system='SIEPA'
+            ))
             
             # Publicar en tópico principal
             result = self.client.publish(
@@ -137,94 +148,105 @@ class MQTTManager:
             print(f"❌ Error publicando datos: {e}")
             return False
     
-    def _publish_individual_readings(self, sensor_data: Dict[str, Any]):
+    @staticmethod
+    def _build_topic_payloads() -> Dict[str, Dict[str, Any]]:
+        """Plantillas de los mensajes individuales, reutilizadas en cada ciclo"""
+        def plantilla(unidad, sensor_type, evaluation_type, **extra):
+            return {
+                'valor': None,
+                'unidad': unidad,
+                'timestamp': None,
+                'sensor_type': sensor_type,
+                'evaluationType': evaluation_type,
+                'evalValue': None,
+                'sample_rate_hz': None,  # Frecuencia de muestreo vigente (None = la del loop)
+                **extra
+            }
+        return {
+            'TEMPERATURE': plantilla('°C', 'Temperatura', 'temperature', sample_timestamp=None, stale=False),
+            'HUMIDITY': plantilla('%', 'Humedad', 'humidity', sample_timestamp=None, stale=False),
+            'DISTANCE': plantilla('cm', 'Distancia', 'distance'),
+            'LIGHT': plantilla('lux', 'Luz', 'light', detectada=False, voltage=None, extra_data={
+                'lux_value': None, 'detection_status': False, 'raw_voltage': None}),
+            'AIR_QUALITY': plantilla('ppm', 'Calidad del Aire', 'air_quality', malo=False, voltage=None, extra_data={
+                'ppm_value': None, 'bad_air_status': False, 'raw_voltage': None}),
+            'PRESSURE': plantilla('hPa', 'Presión', 'pressure'),
+        }
+    
+    def _publish_individual_readings(self, sensor_data: SensorReading):
         """Publica lecturas individuales por tópico - formato mejorado para frontend"""
         current_timestamp = time.time()
+        payloads = self._topic_payloads
+        
+        # Frecuencia de muestreo de la fuente de cada tópico (permite interpretar huecos)
+        rates = sensor_data.sample_rates or {}
+        for topic_key, source in TOPIC_SOURCES.items():
+            payloads[topic_key]['sample_rate_hz'] = rates.get(source)
         
         # Temperatura
-        if sensor_data.get('temperature') is not None:
-            temp_data = {
-                'valor': round(sensor_data.get('temperature'), 2),
-                'unidad': '°C',
-                'timestamp': current_timestamp,
-                'sensor_type': 'Temperatura',
-                'evaluationType': 'temperature',
-                'evalValue': sensor_data.get('temperature')
-            }
+        if sensor_data.temperature is not None:
+            temp_data = payloads['TEMPERATURE']
+            temp_data['valor'] = round(sensor_data.temperature, 2)
+            temp_data['timestamp'] = current_timestamp
+            temp_data['evalValue'] = sensor_data.temperature
+            temp_data['sample_timestamp'] = sensor_data.dht11_timestamp
+            temp_data['stale'] = sensor_data.dht11_stale or False
             self._publish_topic_data('TEMPERATURE', temp_data)
         
         # Humedad
-        if sensor_data.get('humidity') is not None:
-            hum_data = {
-                'valor': round(sensor_data.get('humidity'), 2),
-                'unidad': '%',
-                'timestamp': current_timestamp,
-                'sensor_type': 'Humedad',
-                'evaluationType': 'humidity',
-                'evalValue': sensor_data.get('humidity')
-            }
+        if sensor_data.humidity is not None:
+            hum_data = payloads['HUMIDITY']
+            hum_data['valor'] = round(sensor_data.humidity, 2)
+            hum_data['timestamp'] = current_timestamp
+            hum_data['evalValue'] = sensor_data.humidity
+            hum_data['sample_timestamp'] = sensor_data.dht11_timestamp
+            hum_data['stale'] = sensor_data.dht11_stale or False
             self._publish_topic_data('HUMIDITY', hum_data)
         
         # Distancia
-        if sensor_data.get('distance') is not None:
-            dist_data = {
-                'valor': round(sensor_data.get('distance'), 2),
-                'unidad': 'cm',
-                'timestamp': current_timestamp,
-                'sensor_type': 'Distancia',
-                'evaluationType': 'distance',
-                'evalValue': sensor_data.get('distance')
-            }
+        if sensor_data.distance is not None:
+            dist_data = payloads['DISTANCE']
+            dist_data['valor'] = round(sensor_data.distance, 2)
+            dist_data['timestamp'] = current_timestamp
+            dist_data['evalValue'] = sensor_data.distance
             self._publish_topic_data('DISTANCE', dist_data)
         
         # Luz (con lux y voltaje)
-        if sensor_data.get('light_lux') is not None:
-            light_data = {
-                'valor': round(sensor_data.get('light_lux', 0), 1),
-                'unidad': 'lux',
-                'timestamp': current_timestamp,
-                'sensor_type': 'Luz',
-                'evaluationType': 'light',
-                'evalValue': sensor_data.get('light_lux', 0),
-                'detectada': sensor_data.get('light', False),
-                'voltage': round(sensor_data.get('light_voltage', 0), 3),
-                'extra_data': {
-                    'lux_value': sensor_data.get('light_lux', 0),
-                    'detection_status': sensor_data.get('light', False),
-                    'raw_voltage': sensor_data.get('light_voltage', 0)
-                }
-            }
+        if sensor_data.light_lux is not None:
+            voltaje = sensor_data.light_voltage or 0
+            light_data = payloads['LIGHT']
+            light_data['valor'] = round(sensor_data.light_lux, 1)
+            light_data['timestamp'] = current_timestamp
+            light_data['evalValue'] = sensor_data.light_lux
+            light_data['detectada'] = sensor_data.light
+            light_data['voltage'] = round(voltaje, 3)
+            extra = light_data['extra_data']
+            extra['lux_value'] = sensor_data.light_lux
+            extra['detection_status'] = sensor_data.light
+            extra['raw_voltage'] = voltaje
             self._publish_topic_data('LIGHT', light_data)
         
         # Calidad del aire (con ppm y voltaje)
-        if sensor_data.get('air_quality_ppm') is not None:
-            air_data = {
-                'valor': round(sensor_data.get('air_quality_ppm', 0), 1),
-                'unidad': 'ppm',
-                'timestamp': current_timestamp,
-                'sensor_type': 'Calidad del Aire',
-                'evaluationType': 'air_quality',
-                'evalValue': sensor_data.get('air_quality_ppm', 0),
-                'malo': sensor_data.get('air_quality_bad', False),
-                'voltage': round(sensor_data.get('air_quality_voltage', 0), 3),
-                'extra_data': {
-                    'ppm_value': sensor_data.get('air_quality_ppm', 0),
-                    'bad_air_status': sensor_data.get('air_quality_bad', False),
-                    'raw_voltage': sensor_data.get('air_quality_voltage', 0)
-                }
-            }
+        if sensor_data.air_quality_ppm is not None:
+            voltaje = sensor_data.air_quality_voltage or 0
+            air_data = payloads['AIR_QUALITY']
+            air_data['valor'] = round(sensor_data.air_quality_ppm, 1)
+            air_data['timestamp'] = current_timestamp
+            air_data['evalValue'] = sensor_data.air_quality_ppm
+            air_data['malo'] = sensor_data.air_quality_bad
+            air_data['voltage'] = round(voltaje, 3)
+            extra = air_data['extra_data']
+            extra['ppm_value'] = sensor_data.air_quality_ppm
+            extra['bad_air_status'] = sensor_data.air_quality_bad
+            extra['raw_voltage'] = voltaje
             self._publish_topic_data('AIR_QUALITY', air_data)
         
         # Presión (nuevo sensor BMP280)
-        if sensor_data.get('pressure') is not None:
-            pressure_data = {
-                'valor': round(sensor_data.get('pressure'), 1),
-                'unidad': 'hPa',
-                'timestamp': current_timestamp,
-                'sensor_type': 'Presión',
-                'evaluationType': 'pressure',
-                'evalValue': sensor_data.get('pressure')
-            }
+        if sensor_data.pressure is not None:
+            pressure_data = payloads['PRESSURE']
+            pressure_data['valor'] = round(sensor_data.pressure, 1)
+            pressure_data['timestamp'] = current_timestamp
+            pressure_data['evalValue'] = sensor_data.pressure
             self._publish_topic_data('PRESSURE', pressure_data)
     
     def _publish_topic_data(self, topic_key: str, data: Dict[str, Any]):
@@ -317,8 +339,14 @@ class MQTTManager:
     # Sistema simplificado - Ya no maneja datos históricos
     # Los datos se envían únicamente en tiempo real
     
-    def publish_led_status(self, led_states: Dict[str, bool]) -> bool:
-        """Publica estado de los LEDs de alerta"""
+    def publish_led_status(self, led_states: Dict[str, bool], outputs: Optional[Dict[str, bool]] = None) -> bool:
+        """
+        Publica estado de los LEDs de alerta
+        
+        Args:
+            led_states: estado de cada alerta (o de cada LED en modo manual)
+            outputs: estado real de los pines de salida (snapshot del registro sombra)
+        """
         if not self.connected:
             print("⚠️  MQTT no conectado - no se puede enviar estado de LEDs")
             return False
@@ -336,6 +364,7 @@ class MQTTManager:
                     'pressure': led_states.get('pressure', False),
                 },
                 'manual_mode': manual_control,
+                'outputs': outputs,
                 'timestamp': time.time(),
                 'mode': self.mode
             }
@@ -402,8 +431,10 @@ class MQTTManager:
             'GRUPO2/commands/rasp01/system',
             'GRUPO2/commands/rasp01/sensors/+',  # Para control individual de sensores
             'GRUPO2/commands/rasp01/sensors/enable',  # Para habilitar/deshabilitar sensores
+            'GRUPO2/commands/rasp01/sensors/interval',  # Para cambiar el intervalo de muestreo
             'GRUPO2/commands/rasp01/actuators/+',  # Para control de actuadores (motor, fan, etc.)
             'GRUPO2/commands/rasp01/leds/+',  # Para comandos de LEDs (control, individual, pattern)
+            'GRUPO2/commands/rasp01/alerts/+',  # Reglas de alerta (reload, rules)
         ]
         
         for topic in command_topics:
@@ -469,8 +500,15 @@ class MQTTManager:
         }
         return error_messages.get(rc, f"Error desconocido ({rc})")
     
-    def publish_alert(self, alert_type: str, sensor: str, message: str, value: float, threshold: float) -> bool:
-        """Publica una alerta del sistema"""
+    def publish_alert(self, alert_type: str, sensor: str, message: str, value: float, threshold: float,
+                      state: str = 'raised', rule: Optional[str] = None) -> bool:
+        """
+        Publica una alerta del sistema
+        
+        Args:
+            state: transición notificada ('raised', 'reminder' o 'cleared')
+            rule: regla de ALERT_CONFIG que la originó
+        """
         if not self.connected:
             return False
             
@@ -481,6 +519,8 @@ class MQTTManager:
                 'message': message,
                 'value': value,
                 'threshold': threshold,
+                'state': state,
+                'rule': rule,
                 'timestamp': time.time(),
                 'system': 'SIEPA_Backend'
             }
@@ -494,7 +534,7 @@ class MQTTManager:
             )
             
             if result.rc == mqtt.MQTT_ERR_SUCCESS:
-                print(f"🚨 Alerta publicada: {alert_type} - {message}")
+                print(f"🚨 Alerta publicada ({state}): {alert_type} - {message}")
                 return True
             else:
                 print(f"❌ Error publicando alerta: {result.rc}")
@@ -504,6 +544,36 @@ class MQTTManager:
             print(f"❌ Error enviando alerta: {e}")
             return False
 
+    def publish_sensor_health(self, health: Dict[str, Any]) -> bool:
+        """Publica la salud de los sensores (contadores, latencias y estado por fuente)"""
+        if not self.connected:
+            return False
+            
+        try:
+            payload = json.dumps({
+                'device': SYSTEM_CONFIG.get('DEVICE_ID', 'rasp01'),
+                'timestamp': time.time(),
+                **health
+            })
+            result = self.client.publish(
+                self.config['TOPICS']['HEALTH'],
+                payload,
+                qos=self.config['QOS'],
+                retain=True  # El último estado queda disponible para quien se suscriba después
+            )
+            
+            if result.rc == mqtt.MQTT_ERR_SUCCESS:
+                problemas = [s for s, h in health.get('sensors', {}).items() if h['status'] in ('degraded', 'failing')]
+                print(f"🩺 Salud de sensores publicada{' - con problemas: ' + ', '.join(problemas) if problemas else ''}")
+                return True
+            else:
+                print(f"❌ Error publicando salud de sensores: {result.rc}")
+                return False
+                
+        except Exception as e:
+            print(f"❌ Error publicando salud de sensores: {e}")
+            return False
+
     def is_connected(self) -> bool:
         """Verifica si está conectado"""
         return self.connected and self.client and self.client.is_connected() if MQTT_AVAILABLE else False 
\ No newline at end of file
@@ -9,6 +9,20 @@ import json
 import datetime
 import sqlite3
 import os
+import sys
+
+# Reglas de alerta compartidas con el sistema (ALERT_CONFIG), también al ejecutarse como script
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from core.alerts import AlertEngine, AlertTracker
+
+# Sensor del tópico -> campo de las reglas y clave del payload con su valor
+TOPIC_FIELDS = {
+    'temperatura': ('temperature', 'valor'),
+    'humedad': ('humidity', 'valor'),
+    'luz': ('light_voltage', 'voltage'),
+    'gas': ('air_quality_ppm', 'valor'),
+    'presion': ('pressure', 'valor'),
+}
 
 class SensorMQTTSubscriber:
     def __init__(self, broker_host="broker.hivemq.com", broker_port=1883, grupo="GRUPO1"):
@@ -31,6 +45,10 @@ class SensorMQTTSubscriber:
         self.client.on_disconnect = self.on_disconnect
         self.client.on_message = self.on_message
         
+        # Mismas reglas de alerta que el sistema, con su estado por dispositivo
+        self.alerts = AlertEngine()
+        self.trackers = {}
+        
         # Base de datos para almacenar lecturas
         self.init_database()
         
@@ -105,7 +123,7 @@ class SensorMQTTSubscriber:
                 self.guardar_lectura(grupo, dispositivo, sensor, payload)
                 
                 # Procesar alertas si es necesario
-                self.procesar_alertas(dispositivo, sensor, valor)
+                self.procesar_alertas(dispositivo, sensor, valor, payload)
                 
         except Exception as e:
             print(f"❌ Error procesando mensaje: {e}")
@@ -138,23 +156,27 @@ class SensorMQTTSubscriber:
         except Exception as e:
             print(f"❌ Error guardando en BD: {e}")
             
-    def procesar_alertas(self, dispositivo, sensor, valor):
-        """Procesa alertas basadas en umbrales de sensores"""
+    def procesar_alertas(self, dispositivo, sensor, valor, payload=None):
+        """
+        Procesa alertas con las reglas de ALERT_CONFIG (las mismas que usa el sistema)
+        
+        Solo se muestran las transiciones (activación, normalización) y los recordatorios
+        """
         alertas = []
         
         try:
-            # Definir umbrales de alerta
-            if sensor == "temperatura":
-                if valor > 30:
-                    alertas.append(f"🔥 ALERTA: Temperatura alta en {dispositivo}: {valor}°C")
-                elif valor < 10:
-                    alertas.append(f"🧊 ALERTA: Temperatura baja en {dispositivo}: {valor}°C")
-                    
-            elif sensor == "humedad":
-                if valor > 80:
-                    alertas.append(f"💧 ALERTA: Humedad alta en {dispositivo}: {valor}%")
-                elif valor < 20:
-                    alertas.append(f"🏜️ ALERTA: Humedad baja en {dispositivo}: {valor}%")
+            if sensor in TOPIC_FIELDS:
+                field, key = TOPIC_FIELDS[sensor]
+                value = valor if key == 'valor' else (payload or {}).get(key)
+                tracker = self.trackers.get(dispositivo)
+                if tracker is None:
+                    tracker = self.trackers[dispositivo] = AlertTracker(self.alerts)
+                resultado = tracker.update({field: value})
+                for evento, rule, value in resultado.events:
+                    if evento == 'cleared':
+                        alertas.append(f"✅ NORMALIZADA en {dispositivo}: {rule.lcd} ({value})")
+                    else:
+                        alertas.append(f"ALERTA [{rule.severity}/{evento}] en {dispositivo}: {rule.format_message(value)}")
                     
             elif sensor == "movimiento" and valor:
                 alertas.append(f"🚶 DETECCIÓN: Movimiento en {dispositivo}")
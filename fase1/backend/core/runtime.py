@@ -0,0 +1,233 @@
+"""
+Runtime asyncio del Sistema SIEPA
+Ejecuta el sistema como tareas cooperativas en un único event loop: adquisición,
+control (actuadores y alertas), telemetría MQTT, refresco del display, comandos del
+frontend y mantenimiento. Control y telemetría son etapas independientes: cada lectura
+se controla y se publica, y un broker lento no retrasa a los actuadores. La E/S bloqueante (lectura de dispositivos, escritura del LCD con sus
+pausas de lectura) corre en executors; los comandos MQTT llegan en el hilo de paho y
+se encolan en el loop, donde se aplican entre dos pasos de las demás tareas
+"""
+
+import asyncio
+import signal
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict
+
+from config import SYSTEM_CONFIG
+from .sensors.reading import SensorReading
+from .sensors.watchdog import LatencyHistogram
+
+
+class LatestValue:
+    """Buzón de un solo valor: un consumidor lento recibe siempre el más reciente"""
+
+    def __init__(self):
+        self._value = None
+        self._event = asyncio.Event()
+        self.dropped = 0  # Valores reemplazados antes de consumirse
+
+    def put(self, value: Any):
+        if self._event.is_set():
+            self.dropped += 1
+        self._value = value
+        self._event.set()
+
+    async def get(self) -> Any:
+        await self._event.wait()
+        self._event.clear()
+        return self._value
+
+
+class AsyncRuntime:
+    """Event loop del sistema: una tarea por responsabilidad del loop principal"""
+
+    def __init__(self, system, config: Dict[str, Any] = None):
+        """
+        Args:
+            system: SIEPASystem a ejecutar (aporta los pasos _control, _publish, _display, ...)
+            config: {'HOUSEKEEPING_INTERVAL'} (por defecto SYSTEM_CONFIG['ASYNC_RUNTIME'])
+        """
+        config = config if config is not None else SYSTEM_CONFIG.get('ASYNC_RUNTIME', {})
+        self.system = system
+        self.housekeeping_interval = config.get('HOUSEKEEPING_INTERVAL', 1.0)
+        self.loop = None
+        self.active = False
+        self._stop = None
+        self._tasks = []
+
+        # Una lectura completa a la vez (el SensorManager ya reparte las fuentes en su
+        # pool con plazos) y un hilo propio para el LCD, que serializa sus escrituras
+        self._io = ThreadPoolExecutor(max_workers=1, thread_name_prefix='siepa-io')
+        self._display = ThreadPoolExecutor(max_workers=1, thread_name_prefix='siepa-display')
+
+        self.stats = {
+            'cycles': 0,
+            'commands': 0,
+            'command_latency_ms': None,      # Última espera de un comando en la cola del loop
+            'max_command_latency_ms': 0.0,
+        }
+        # Desde el fin de la lectura hasta los actuadores aplicados / la telemetría publicada
+        self.control_latency = LatencyHistogram()
+        self.telemetry_latency = LatencyHistogram()
+
+    # ============== CICLO DE VIDA ==============
+
+    def run(self):
+        """Ejecuta el runtime hasta que se detenga (bloquea el hilo que llama)"""
+        asyncio.run(self._run())
+
+    async def _run(self):
+        self.loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        self._readings = LatestValue()
+        self._frames = LatestValue()
+        self._outbox = LatestValue()
+        self._commands = asyncio.Queue()
+
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                self.loop.add_signal_handler(signum, self.stop)
+            except (NotImplementedError, RuntimeError, ValueError):
+                pass  # Fuera del hilo principal quedan los manejadores de SIEPASystem
+
+        mqtt = self.system.mqtt_manager
+        if mqtt and mqtt.is_connected():
+            mqtt.subscribe_to_commands(self.submit_command)
+
+        self.active = True
+        self._tasks = [
+            self.loop.create_task(self._supervise(name, step), name=f'siepa-{name}')
+            for name, step in (
+                ('acquisition', self._acquisition),
+                ('control', self._control),
+                ('telemetry', self._telemetry),
+                ('display', self._display_refresh),
+                ('commands', self._command_handler),
+                ('housekeeping', self._housekeeping),
+            )
+        ]
+        print("⚡ Runtime asyncio: adquisición, control, telemetría, display, comandos y mantenimiento en curso")
+
+        try:
+            await self._stop.wait()
+        finally:
+            self.active = False
+            for task in self._tasks:
+                task.cancel()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+            # Esperar la lectura y la escritura del LCD en curso antes de liberar los dispositivos
+            await self.loop.run_in_executor(None, self._shutdown_executors)
+            print(f"⚡ Runtime asyncio detenido: {self.get_stats()}")
+
+    def stop(self):
+        """Pide detener el runtime (seguro desde cualquier hilo)"""
+        loop = self.loop
+        if loop is None or self._stop is None:
+            return
+        try:
+            loop.call_soon_threadsafe(self._stop.set)
+        except RuntimeError:
+            pass  # El loop ya se cerró
+
+    def _shutdown_executors(self):
+        self._io.shutdown(wait=True)
+        self._display.shutdown(wait=True)
+
+    async def _supervise(self, name: str, step):
+        """Ejecuta una tarea; un error inesperado detiene el sistema como en el loop bloqueante"""
+        try:
+            await step()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"❌ Error inesperado en la tarea {name}: {e}")
+            self.stop()
+
+    # ============== TAREAS ==============
+
+    async def _acquisition(self):
+        """Lee todos los sensores en el executor de E/S con periodo fijo READ_INTERVAL"""
+        system = self.system
+        sensor_manager = system.sensor_manager
+        timer = system.loop_timer = system._new_loop_timer()
+        while True:
+            if timer:
+                timer.begin_cycle()  # Retraso del despertar: incluye la latencia del event loop
+            # Un registro nuevo por ciclo: el display y la telemetría pueden seguir usando el
+            # anterior en sus hilos mientras se lee el siguiente (el propio del gestor se sobrescribe)
+            reading = await self.loop.run_in_executor(self._io, sensor_manager.read_all_sensors, SensorReading())
+            if sensor_manager.replay_finished:
+                print(f"⏹️  Reproducción terminada: {sensor_manager.replay.get_stats()}")
+                self.stop()
+                return
+            self.stats['cycles'] += 1
+            self._readings.put((reading, time.monotonic()))
+
+            # Siguiente vencimiento de la grilla; en replay el ritmo lo marca la grabación
+            await asyncio.sleep(timer.end_cycle() if timer else 0)
+
+    async def _control(self):
+        """Etapa de control: actuadores y alertas de cada lectura, sin esperar a la telemetría"""
+        system = self.system
+        while True:
+            reading, acquired = await self._readings.get()
+            led_states, alerts = system._control(reading)
+            self.control_latency.record(time.monotonic() - acquired)
+            self._outbox.put((reading, led_states, acquired))
+            self._frames.put((reading, alerts.lcd_messages))
+
+    async def _display_refresh(self):
+        """Muestra la última lectura; las pausas del LCD corren en su propio hilo"""
+        while True:
+            reading, alerts = await self._frames.get()
+            await self.loop.run_in_executor(self._display, self.system._display, reading, alerts)
+
+    async def _telemetry(self):
+        """Etapa de telemetría: publica cada lectura controlada, con o sin alertas activas"""
+        while True:
+            reading, led_states, acquired = await self._outbox.get()
+            self.system._publish(reading, led_states)
+            self.telemetry_latency.record(time.monotonic() - acquired)
+
+    def submit_command(self, topic: str, payload: Dict[str, Any]):
+        """Callback de comandos MQTT (hilo de paho): encola el comando en el event loop"""
+        loop = self.loop
+        if loop is None or not self.active:
+            return
+        try:
+            loop.call_soon_threadsafe(self._commands.put_nowait, (topic, payload, time.monotonic()))
+        except RuntimeError:
+            pass  # El loop ya se cerró
+
+    async def _command_handler(self):
+        """Aplica los comandos en el loop: sin carreras con la evaluación de lecturas"""
+        while True:
+            topic, payload, received = await self._commands.get()
+            latency_ms = (time.monotonic() - received) * 1000
+            self.stats['commands'] += 1
+            self.stats['command_latency_ms'] = round(latency_ms, 2)
+            self.stats['max_command_latency_ms'] = round(max(self.stats['max_command_latency_ms'], latency_ms), 2)
+            try:
+                self.system._handle_mqtt_command(topic, payload)
+            except Exception as e:
+                print(f"❌ Error procesando comando {topic}: {e}")
+
+    async def _housekeeping(self):
+        """Tareas periódicas: publicación de la salud de los sensores"""
+        while True:
+            await asyncio.sleep(self.housekeeping_interval)
+            self.system._publish_health_if_due()
+
+    # ============== CONSULTA ==============
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Ciclos, comandos, latencias de control y telemetría y valores descartados por consumidores lentos"""
+        stats = dict(self.stats)
+        stats['control'] = self.control_latency.to_dict()
+        stats['telemetry'] = self.telemetry_latency.to_dict()
+        if self.loop is not None and self._stop is not None:
+            stats['display_dropped'] = self._frames.dropped
+            stats['telemetry_dropped'] = self._outbox.dropped
+            stats['control_dropped'] = self._readings.dropped
+        return stats
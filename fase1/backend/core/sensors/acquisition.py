@@ -0,0 +1,133 @@
+"""
+Adquisición concurrente de sensores del Sistema SIEPA
+Cada sensor se lee en su propio hilo y deja su último valor en un snapshot compartido,
+de modo que un dispositivo lento (reintentos del DHT11 o del BMP180) no retrasa a los demás
+"""
+
+import itertools
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+# Identificador de muestra único en el proceso (no se repite entre snapshots)
+_SAMPLE_IDS = itertools.count(1)
+
+
+class SensorSnapshot:
+    """Último valor leído de cada sensor, protegido por un lock"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values: Dict[str, Any] = {}
+        self._timestamps: Dict[str, float] = {}  # time.monotonic() de la última lectura
+        self._samples: Dict[str, int] = {}       # Identificador de la última muestra
+
+    def update(self, name: str, value: Any):
+        """Guarda el valor más reciente de un sensor"""
+        now = time.monotonic()
+        with self._lock:
+            self._values[name] = value
+            self._timestamps[name] = now
+            self._samples[name] = next(_SAMPLE_IDS)
+
+    def get(self, name: str) -> Tuple[Any, Optional[float]]:
+        """Obtiene (valor, antigüedad en segundos) de un sensor"""
+        now = time.monotonic()
+        with self._lock:
+            if name not in self._values:
+                return None, None
+            return self._values[name], now - self._timestamps[name]
+
+    def read(self) -> Tuple[Dict[str, Any], Dict[str, Optional[float]]]:
+        """Copia consistente de todos los valores y sus antigüedades"""
+        values, ages, _ = self.read_samples()
+        return values, ages
+
+    def read_samples(self) -> Tuple[Dict[str, Any], Dict[str, Optional[float]], Dict[str, int]]:
+        """
+        Como read(), más el identificador de muestra de cada sensor
+
+        El identificador cambia solo cuando llega una lectura nueva: el consumidor que
+        consulta más seguido que el periodo del sensor distingue así una muestra repetida.
+        """
+        now = time.monotonic()
+        with self._lock:
+            values = dict(self._values)
+            ages = {name: now - ts for name, ts in self._timestamps.items()}
+            samples = dict(self._samples)
+        return values, ages, samples
+
+
+class ConcurrentAcquisition:
+    """Lanza un hilo por sensor que lee periódicamente y actualiza el snapshot"""
+
+    def __init__(self,
+                 readers: Dict[str, Callable[[], Any]],
+                 intervals: Dict[str, float],
+                 is_enabled: Callable[[str], bool]):
+        """
+        Args:
+            readers: nombre de la fuente -> función que realiza la lectura física
+            intervals: nombre de la fuente -> periodo de lectura de su hilo (segundos)
+            is_enabled: indica si una fuente debe leerse en este momento
+        """
+        self.readers = readers
+        self.intervals = dict(intervals)
+        self.is_enabled = is_enabled
+        self.snapshot = SensorSnapshot()
+        self._stop_event = threading.Event()
+        self._threads: Dict[str, threading.Thread] = {}
+
+    def start(self):
+        """Inicia un hilo de lectura por cada sensor"""
+        if self._threads:
+            return
+        self._stop_event.clear()
+        for name in self.readers:
+            thread = threading.Thread(
+                target=self._worker,
+                args=(name,),
+                name=f"siepa-acq-{name}",
+                daemon=True
+            )
+            self._threads[name] = thread
+            thread.start()
+        print(f"🧵 Adquisición concurrente iniciada: {list(self.readers)}")
+
+    def stop(self, timeout: float = 2.0):
+        """Detiene los hilos de lectura"""
+        self._stop_event.set()
+        for thread in self._threads.values():
+            thread.join(timeout)
+        self._threads.clear()
+
+    def is_running(self) -> bool:
+        """Indica si los hilos de lectura están activos"""
+        return bool(self._threads)
+
+    def set_interval(self, name: str, interval: float):
+        """Cambia el periodo de lectura de un sensor (aplica desde su próxima espera)"""
+        if name not in self.readers:
+            raise KeyError(name)
+        self.intervals[name] = interval
+
+    def get_intervals(self) -> Dict[str, float]:
+        """Periodos de lectura actuales"""
+        return dict(self.intervals)
+
+    def _worker(self, name: str):
+        """Bucle de lectura de un sensor"""
+        reader = self.readers[name]
+        while not self._stop_event.is_set():
+            started = time.monotonic()
+            if self.is_enabled(name):
+                try:
+                    value = reader()
+                except Exception as e:
+                    print(f"⚠️ [Adquisición] Error leyendo {name}: {e}")
+                    value = None
+                self.snapshot.update(name, value)
+
+            elapsed = time.monotonic() - started
+            self._stop_event.wait(max(0.0, self.intervals[name] - elapsed))
@@ -0,0 +1,133 @@
+"""
+Muestreo adaptativo de sensores del Sistema SIEPA
+Ajusta el intervalo de cada fuente según la velocidad de cambio reciente de su señal:
+se acorta (multiplicativamente) cuando la señal cambia rápido y se alarga cuando está
+estable, siempre entre un mínimo y un máximo por fuente
+"""
+
+import time
+from typing import Any, Dict, Optional, Tuple
+
+
+class AdaptiveRate:
+    """Controlador del intervalo de muestreo de una fuente"""
+
+    def __init__(self, min_interval: float, max_interval: float,
+                 change_threshold: float, stable_threshold: float,
+                 speedup: float = 0.5, slowdown: float = 1.5, smoothing: float = 0.5,
+                 interval: Optional[float] = None):
+        """
+        Args:
+            min_interval: intervalo mínimo (frecuencia máxima) en segundos
+            max_interval: intervalo máximo (frecuencia mínima) en segundos
+            change_threshold: velocidad de cambio (unidades/s) a partir de la cual se acelera
+            stable_threshold: velocidad de cambio por debajo de la cual se desacelera
+            speedup: factor aplicado al intervalo al acelerar (< 1)
+            slowdown: factor aplicado al intervalo al desacelerar (> 1)
+            smoothing: peso de la muestra nueva en el promedio exponencial de la velocidad
+            interval: intervalo inicial (por defecto min_interval)
+        """
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.change_threshold = change_threshold
+        self.stable_threshold = stable_threshold
+        self.speedup = speedup
+        self.slowdown = slowdown
+        self.smoothing = smoothing
+        self.interval = min(max(interval or min_interval, min_interval), max_interval)
+        self.rate_of_change: Optional[float] = None
+        self._last: Optional[Tuple[float, Tuple[float, ...]]] = None
+
+    def update(self, values: Tuple[float, ...], now: float) -> float:
+        """Registra una muestra y devuelve el intervalo hasta la siguiente"""
+        if self._last is not None:
+            last_time, last_values = self._last
+            dt = now - last_time
+            if dt > 0:
+                speed = max(abs(v - w) for v, w in zip(values, last_values)) / dt
+                if self.rate_of_change is None:
+                    self.rate_of_change = speed
+                else:
+                    self.rate_of_change += self.smoothing * (speed - self.rate_of_change)
+
+                if self.rate_of_change >= self.change_threshold:
+                    self.interval = max(self.min_interval, self.interval * self.speedup)
+                elif self.rate_of_change <= self.stable_threshold:
+                    self.interval = min(self.max_interval, self.interval * self.slowdown)
+        self._last = (now, values)
+        return self.interval
+
+    def reset(self):
+        """Olvida la historia (al rehabilitar el sensor) y vuelve a la frecuencia máxima"""
+        self._last = None
+        self.rate_of_change = None
+        self.interval = self.min_interval
+
+
+class AdaptiveSampler:
+    """Intervalos adaptativos de todas las fuentes configuradas"""
+
+    def __init__(self, config: Dict[str, Dict[str, Any]], clock=time.monotonic):
+        """
+        Args:
+            config: fuente -> {'MIN_INTERVAL', 'MAX_INTERVAL', 'CHANGE_THRESHOLD',
+                    'STABLE_THRESHOLD', y opcionales 'SPEEDUP', 'SLOWDOWN', 'SMOOTHING'}
+            clock: reloj monotónico (inyectable para pruebas)
+        """
+        self.clock = clock
+        self.controllers: Dict[str, AdaptiveRate] = {
+            source: AdaptiveRate(
+                options['MIN_INTERVAL'],
+                options['MAX_INTERVAL'],
+                options['CHANGE_THRESHOLD'],
+                options['STABLE_THRESHOLD'],
+                speedup=options.get('SPEEDUP', 0.5),
+                slowdown=options.get('SLOWDOWN', 1.5),
+                smoothing=options.get('SMOOTHING', 0.5)
+            )
+            for source, options in config.items()
+        }
+
+    @staticmethod
+    def _values(value: Any) -> Optional[Tuple[float, ...]]:
+        """Componentes numéricos de una lectura cruda (el DHT11 aporta temperatura y humedad)"""
+        if value is None:
+            return None
+        if isinstance(value, (int, float)):
+            return (float(value),)
+        components = tuple(
+            getattr(value, name) for name in ('temperature', 'humidity') if getattr(value, name, None) is not None
+        )
+        return components or None
+
+    def update(self, source: str, value: Any) -> Optional[float]:
+        """
+        Registra la lectura cruda de una fuente
+
+        Returns:
+            nuevo intervalo de la fuente, o None si no es adaptativa o la lectura no es válida
+        """
+        controller = self.controllers.get(source)
+        if controller is None:
+            return None
+        values = self._values(value)
+        if values is None:
+            return controller.interval
+        return controller.update(values, self.clock())
+
+    def reset(self, source: str):
+        controller = self.controllers.get(source)
+        if controller is not None:
+            controller.reset()
+
+    def get_status(self) -> Dict[str, Dict[str, Any]]:
+        """Intervalo actual y velocidad de cambio estimada por fuente"""
+        return {
+            source: {
+                'interval': round(controller.interval, 3),
+                'rate_hz': round(1.0 / controller.interval, 3),
+                'rate_of_change': round(controller.rate_of_change, 4)
+                if controller.rate_of_change is not None else None,
+            }
+            for source, controller in self.controllers.items()
+        }
@@ -0,0 +1,84 @@
+"""
+Front-end del ADC MCP3008 del Sistema SIEPA
+Lee todos los canales configurados en una sola ráfaga por ciclo, con sobremuestreo y
+promedio recortado, y convierte el código crudo a voltaje una única vez
+"""
+
+import threading
+import time
+from collections import namedtuple
+from typing import Dict, Optional
+
+# code: código crudo promedio (0 - 1023 para 10 bits), voltage: voltaje equivalente
+ADCSample = namedtuple('ADCSample', ['code', 'voltage'])
+
+
+class ADCFrontEnd:
+    """Lectura en ráfaga y sobremuestreada de los canales del MCP3008"""
+
+    def __init__(self, mcp, channels: Dict[str, int],
+                 vref: float = 3.3,
+                 oversample: int = 8,
+                 max_age: float = 0.05,
+                 resolution_bits: int = 10):
+        """
+        Args:
+            mcp: instancia de adafruit_mcp3xxx.mcp3008.MCP3008
+            channels: nombre lógico -> canal del MCP3008
+            vref: voltaje de referencia del ADC
+            oversample: conversiones por canal en cada ráfaga
+            max_age: antigüedad máxima (s) para reutilizar la última ráfaga
+            resolution_bits: resolución del ADC
+        """
+        self.mcp = mcp
+        self.channels = dict(channels)
+        self.vref = vref
+        self.oversample = max(1, int(oversample))
+        self.max_age = max_age
+        self.max_code = (1 << resolution_bits) - 1
+
+        self._lock = threading.Lock()
+        self._samples: Dict[str, ADCSample] = {}
+        self._sampled_at: Optional[float] = None  # monotonic
+        self.bursts = 0
+
+    def sample(self) -> Dict[str, ADCSample]:
+        """Realiza una ráfaga sobre todos los canales y devuelve sus muestras"""
+        with self._lock:
+            return self._sample_locked()
+
+    def read(self, name: str) -> ADCSample:
+        """
+        Devuelve la muestra de un canal, reutilizando la ráfaga del ciclo actual
+
+        Lanza KeyError si el canal no está configurado.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self._sampled_at is None or now - self._sampled_at > self.max_age:
+                self._sample_locked()
+            return self._samples[name]
+
+    def _sample_locked(self) -> Dict[str, ADCSample]:
+        """Ráfaga de conversiones intercaladas entre canales (llamar con lock)"""
+        codes = {name: [] for name in self.channels}
+        for _ in range(self.oversample):
+            for name, channel in self.channels.items():
+                codes[name].append(self.mcp.read(channel))
+
+        samples = {}
+        for name, values in codes.items():
+            code = self._trimmed_mean(values)
+            samples[name] = ADCSample(code, code * self.vref / self.max_code)
+
+        self._samples = samples
+        self._sampled_at = time.monotonic()
+        self.bursts += 1
+        return samples
+
+    @staticmethod
+    def _trimmed_mean(values):
+        """Promedio descartando el mínimo y el máximo cuando hay suficientes muestras"""
+        if len(values) >= 4:
+            values = sorted(values)[1:-1]
+        return sum(values) / len(values)
@@ -0,0 +1,150 @@
+"""
+Calibración de sensores analógicos del Sistema SIEPA
+Construye una sola vez, al iniciar, tablas indexadas por código crudo del ADC para
+convertir el LDR a lux y el MQ135 a ppm (curva log-log calibrada). En el camino
+crítico, en replay y al recalcular historial la conversión es una simple búsqueda,
+también aplicable a arreglos de NumPy
+"""
+
+import math
+from array import array
+from typing import Any, Dict, Optional
+
+from config import CALIBRATION_CONFIG, SENSOR_CONFIG, SYSTEM_CONFIG
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    np = None
+
+
+def _device_config(config: Dict[str, Any], device_id: Optional[str]) -> Dict[str, Dict[str, Any]]:
+    """Constantes por sensor con los ajustes propios del dispositivo aplicados encima"""
+    overrides = config.get('DEVICES', {}).get(device_id, {})
+    return {
+        sensor: {**config[sensor], **overrides.get(sensor, {})}
+        for sensor in ('LDR', 'MQ135')
+    }
+
+
+class CalibrationTables:
+    """Tablas de conversión código ADC -> lux / ppm"""
+
+    def __init__(self, config: Dict[str, Any] = None,
+                 device_id: Optional[str] = None,
+                 vref: Optional[float] = None,
+                 resolution_bits: int = 10):
+        """
+        Args:
+            config: constantes de calibración (por defecto CALIBRATION_CONFIG)
+            device_id: dispositivo cuyos ajustes aplicar (por defecto SYSTEM_CONFIG['DEVICE_ID'])
+            vref: referencia del ADC (por defecto SENSOR_CONFIG['ADC_VREF'])
+            resolution_bits: resolución del ADC
+        """
+        config = config or CALIBRATION_CONFIG
+        device_id = device_id or SYSTEM_CONFIG.get('DEVICE_ID')
+        constants = _device_config(config, device_id)
+        self.ldr = constants['LDR']
+        self.mq135 = constants['MQ135']
+        self.device_id = device_id
+
+        self.vref = vref if vref is not None else SENSOR_CONFIG.get('ADC_VREF', 3.3)
+        self.max_code = (1 << resolution_bits) - 1
+        self._volts_per_code = self.vref / self.max_code
+
+        # Tablas precalculadas para cada código posible del ADC
+        voltages = [code * self._volts_per_code for code in range(self.max_code + 1)]
+        self.lux_table = array('d', (self._lux_formula(v) for v in voltages))
+        self.ppm_table = array('l', (self._ppm_formula(v) for v in voltages))
+
+        if NUMPY_AVAILABLE:
+            self._lux_np = np.frombuffer(self.lux_table, dtype=np.float64)
+            self._ppm_np = np.array(self.ppm_table, dtype=np.int64)
+
+    # ============== FÓRMULAS (solo se evalúan al construir las tablas) ==============
+
+    def _lux_formula(self, voltaje: float) -> float:
+        """LDR: voltaje bajo = mucha luz, voltaje alto = poca luz"""
+        vcc = self.ldr['VCC']
+        max_lux = self.ldr['MAX_LUX']
+        if voltaje <= self.ldr['BRIGHT_MARGIN']:
+            return float(max_lux)  # Voltaje muy bajo = máxima luz
+        if voltaje >= vcc - self.ldr['DARK_MARGIN']:
+            return 0.0  # Voltaje máximo = sin luz
+        return round(max(0.0, max_lux * (vcc - voltaje) / vcc), 1)
+
+    def _rs_over_r0(self, voltaje: float) -> float:
+        """MQ135: relación Rs/R0 a partir del voltaje sobre la resistencia de carga"""
+        vc = self.mq135['VC']
+        rs = self.mq135['RL'] * (vc - voltaje) / voltaje
+        return rs / self.mq135['R0']
+
+    def _ppm_formula(self, voltaje: float) -> int:
+        """MQ135: curva log-log del datasheet, ppm = A * (Rs/R0)^B"""
+        if voltaje <= 0:
+            return 0
+        if voltaje >= self.mq135['VC']:
+            return self.mq135['MAX_PPM']
+        ppm = self.mq135['A'] * self._rs_over_r0(voltaje) ** self.mq135['B']
+        return int(round(min(ppm, self.mq135['MAX_PPM'])))
+
+    # ============== BÚSQUEDAS ==============
+
+    def code_from_voltage(self, voltaje: float) -> int:
+        """Código ADC más cercano a un voltaje"""
+        code = int(voltaje / self._volts_per_code + 0.5)
+        return 0 if code < 0 else (self.max_code if code > self.max_code else code)
+
+    def lux_from_code(self, code: int) -> float:
+        """Lux para un código crudo del ADC"""
+        return self.lux_table[code]
+
+    def ppm_from_code(self, code: int) -> int:
+        """ppm para un código crudo del ADC"""
+        return self.ppm_table[code]
+
+    def lux_from_voltage(self, voltaje: float) -> float:
+        """Lux para un voltaje del LDR"""
+        return self.lux_table[self.code_from_voltage(voltaje)]
+
+    def ppm_from_voltage(self, voltaje: float) -> int:
+        """ppm para un voltaje del MQ135"""
+        return self.ppm_table[self.code_from_voltage(voltaje)]
+
+    def lux_from_codes(self, codes):
+        """Lux para un arreglo de códigos (NumPy) o una secuencia"""
+        if NUMPY_AVAILABLE:
+            return self._lux_np[np.clip(np.asarray(codes, dtype=np.int64), 0, self.max_code)]
+        return [self.lux_table[int(c)] for c in codes]
+
+    def ppm_from_codes(self, codes):
+        """ppm para un arreglo de códigos (NumPy) o una secuencia"""
+        if NUMPY_AVAILABLE:
+            return self._ppm_np[np.clip(np.asarray(codes, dtype=np.int64), 0, self.max_code)]
+        return [self.ppm_table[int(c)] for c in codes]
+
+    def codes_from_voltages(self, voltages):
+        """Códigos ADC para un arreglo de voltajes (NumPy) o una secuencia"""
+        if NUMPY_AVAILABLE:
+            codes = np.rint(np.asarray(voltages, dtype=np.float64) / self._volts_per_code)
+            return np.clip(codes, 0, self.max_code).astype(np.int64)
+        return [self.code_from_voltage(v) for v in voltages]
+
+    # ============== INVERSAS (simulación y replay) ==============
+
+    def voltage_from_lux(self, lux: float) -> float:
+        """Voltaje del LDR que produce una iluminación dada"""
+        vcc = self.ldr['VCC']
+        lux = min(max(lux, 0.0), self.ldr['MAX_LUX'])
+        return vcc * (1 - lux / self.ldr['MAX_LUX'])
+
+    def voltage_from_ppm(self, ppm: float) -> float:
+        """Voltaje del MQ135 que produce una concentración dada"""
+        if ppm <= 0:
+            return 0.0
+        ppm = min(ppm, self.mq135['MAX_PPM'])
+        ratio = math.exp(math.log(ppm / self.mq135['A']) / self.mq135['B'])
+        rs = ratio * self.mq135['R0']
+        return self.mq135['VC'] * self.mq135['RL'] / (rs + self.mq135['RL'])
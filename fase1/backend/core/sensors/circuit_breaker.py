@@ -0,0 +1,106 @@
+"""
+Circuit breaker para dispositivos del Sistema SIEPA
+Tras varios fallos seguidos deja de usar el dispositivo (abierto), espera un tiempo que
+crece exponencialmente y vuelve a probar una vez (medio abierto) antes de cerrarse
+"""
+
+import threading
+import time
+from typing import Any, Dict, Optional
+
+
+class CircuitBreaker:
+    """Circuit breaker con estados cerrado, abierto y medio abierto"""
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name: str,
+                 failure_threshold: int = 3,
+                 base_backoff: float = 2.0,
+                 max_backoff: float = 120.0):
+        """
+        Args:
+            name: nombre del dispositivo (para mensajes)
+            failure_threshold: fallos consecutivos que abren el circuito
+            base_backoff: primera espera en estado abierto (segundos)
+            max_backoff: espera máxima en estado abierto (segundos)
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+
+        self._lock = threading.Lock()
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.consecutive_trips = 0   # Aperturas seguidas sin recuperación (define el backoff)
+        self.total_trips = 0
+        self.backoff: Optional[float] = None
+        self._retry_at: Optional[float] = None  # monotonic
+
+    def allow(self) -> bool:
+        """
+        Indica si se puede usar el dispositivo ahora
+
+        En estado abierto, al vencer el backoff pasa a medio abierto y permite un único intento.
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() >= self._retry_at:
+                self.state = self.HALF_OPEN
+                print(f"🔌 {self.name}: reintentando tras {self.backoff:.1f}s (medio abierto)")
+                return True
+            return False
+
+    def record_success(self):
+        """Registra una operación exitosa y cierra el circuito"""
+        with self._lock:
+            if self.state != self.CLOSED:
+                print(f"✅ {self.name}: recuperado, circuito cerrado")
+            self.state = self.CLOSED
+            self.consecutive_failures = 0
+            self.consecutive_trips = 0
+            self.backoff = None
+            self._retry_at = None
+
+    def record_failure(self):
+        """Registra un fallo; abre el circuito si se supera el umbral o si falló el intento de prueba"""
+        with self._lock:
+            self.consecutive_failures += 1
+            if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                self._trip_locked()
+
+    def trip(self):
+        """Abre el circuito inmediatamente (p. ej. si falla la inicialización)"""
+        with self._lock:
+            self._trip_locked()
+
+    def is_open(self) -> bool:
+        """True si el dispositivo está fuera de servicio (abierto o medio abierto)"""
+        return self.state != self.CLOSED
+
+    def _trip_locked(self):
+        """Pasa a estado abierto con backoff exponencial (llamar con lock)"""
+        self.consecutive_trips += 1
+        self.total_trips += 1
+        self.backoff = min(self.base_backoff * (2 ** (self.consecutive_trips - 1)), self.max_backoff)
+        self._retry_at = time.monotonic() + self.backoff
+        self.state = self.OPEN
+        print(f"⛔ {self.name}: circuito abierto, nuevo intento en {self.backoff:.1f}s")
+
+    def get_status(self) -> Dict[str, Any]:
+        """Estado actual del circuito"""
+        with self._lock:
+            retry_in = None
+            if self.state == self.OPEN:
+                retry_in = round(max(0.0, self._retry_at - time.monotonic()), 1)
+            return {
+                'state': self.state,
+                'consecutive_failures': self.consecutive_failures,
+                'trips': self.total_trips,
+                'backoff': self.backoff,
+                'retry_in': retry_in,
+            }
@@ -0,0 +1,106 @@
+"""
+Caché de lecturas del DHT11 del Sistema SIEPA
+El DHT11 no admite más de una lectura por segundo aproximadamente: consultarlo más rápido
+solo produce errores de checksum y gasta CPU en el bit-banging. Esta capa nunca consulta
+el sensor antes de su intervalo mínimo y devuelve la última lectura válida con su frescura
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+@dataclass
+class DHTReading:
+    temperature: Optional[float]
+    humidity: Optional[float]
+    timestamp: Optional[float]   # time.time() de la última lectura válida
+    age: Optional[float]         # segundos desde la última lectura válida
+    stale: bool                  # True si la lectura supera DHT11_STALE_AFTER
+    from_cache: bool             # True si no se consultó el sensor en esta llamada
+
+
+class DHT11Cache:
+    """Limita la frecuencia de consulta del DHT11 y conserva la última lectura válida"""
+
+    def __init__(self,
+                 reader: Callable[[], Tuple[Optional[float], Optional[float]]],
+                 min_interval: float = 1.0,
+                 stale_after: float = 5.0,
+                 max_age: float = 60.0):
+        """
+        Args:
+            reader: función que consulta el sensor y retorna (temperatura, humedad)
+            min_interval: tiempo mínimo entre consultas al sensor (segundos)
+            stale_after: antigüedad a partir de la cual la lectura se marca como vieja
+            max_age: antigüedad a partir de la cual la lectura se descarta (retorna None)
+        """
+        self.reader = reader
+        self.min_interval = min_interval
+        self.stale_after = stale_after
+        self.max_age = max_age
+
+        self._lock = threading.Lock()
+        self._last_attempt: Optional[float] = None  # monotonic
+        self._last_good: Optional[float] = None     # monotonic
+        self._last_good_wall: Optional[float] = None
+        self._temperature: Optional[float] = None
+        self._humidity: Optional[float] = None
+
+        self.successes = 0
+        self.failures = 0
+        self.cache_hits = 0
+
+    def read(self) -> DHTReading:
+        """Devuelve la lectura más reciente, consultando el sensor solo si ya se permite"""
+        with self._lock:
+            now = time.monotonic()
+            if self._last_attempt is not None and now - self._last_attempt < self.min_interval:
+                self.cache_hits += 1
+                return self._cached(now, from_cache=True)
+
+            self._last_attempt = now
+            try:
+                temp, hum = self.reader()
+            except Exception:
+                temp, hum = None, None
+
+            if temp is None or hum is None:
+                self.failures += 1
+                return self._cached(now, from_cache=True)
+
+            self.successes += 1
+            self._temperature = temp
+            self._humidity = hum
+            self._last_good = now
+            self._last_good_wall = time.time()
+            return self._cached(now, from_cache=False)
+
+    def _cached(self, now: float, from_cache: bool) -> DHTReading:
+        """Construye la lectura a partir del último valor válido (llamar con lock)"""
+        if self._last_good is None or now - self._last_good > self.max_age:
+            return DHTReading(None, None, self._last_good_wall, None, True, from_cache)
+        age = now - self._last_good
+        return DHTReading(
+            self._temperature,
+            self._humidity,
+            self._last_good_wall,
+            round(age, 3),
+            age > self.stale_after,
+            from_cache
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Contadores de consultas exitosas, fallidas y atendidas desde caché"""
+        with self._lock:
+            total = self.successes + self.failures + self.cache_hits
+            attempts = self.successes + self.failures
+            return {
+                'successes': self.successes,
+                'failures': self.failures,
+                'cache_hits': self.cache_hits,
+                'success_rate': round(self.successes / attempts, 3) if attempts else None,
+                'failure_rate': round(self.failures / attempts, 3) if attempts else None,
+                'cache_hit_rate': round(self.cache_hits / total, 3) if total else None,
+            }
@@ -0,0 +1,202 @@
+"""
+Acondicionamiento de señal del Sistema SIEPA
+Etapa de filtrado entre la adquisición y la evaluación de alertas: mediana de N,
+media móvil exponencial (EMA) y rechazo de valores atípicos de Hampel. Cada sensor
+usa buffers circulares de tamaño fijo (array) que se actualizan sin crear objetos nuevos
+"""
+
+from array import array
+from bisect import bisect_left, insort
+from typing import Any, Dict, List, Optional
+
+
+class RingBuffer:
+    """Buffer circular de tamaño fijo sobre array('d')"""
+
+    def __init__(self, size: int):
+        self.size = size
+        self.data = array('d', bytes(8 * size))
+        self.head = 0   # Próxima posición a escribir
+        self.count = 0
+
+    def push(self, value: float) -> Optional[float]:
+        """Agrega un valor; devuelve el valor desplazado si el buffer estaba lleno"""
+        evicted = self.data[self.head] if self.count == self.size else None
+        self.data[self.head] = value
+        self.head = (self.head + 1) % self.size
+        if self.count < self.size:
+            self.count += 1
+        return evicted
+
+    def last(self) -> Optional[float]:
+        """Último valor agregado"""
+        return self.data[self.head - 1] if self.count else None
+
+
+class SortedWindow:
+    """Ventana deslizante que mantiene además una copia ordenada para mediana y MAD"""
+
+    def __init__(self, size: int):
+        self.ring = RingBuffer(size)
+        self.sorted = array('d')
+
+    def __len__(self) -> int:
+        return self.ring.count
+
+    def push(self, value: float):
+        """Desplaza el valor más viejo e inserta el nuevo en su posición ordenada"""
+        evicted = self.ring.push(value)
+        if evicted is not None:
+            del self.sorted[bisect_left(self.sorted, evicted)]
+        insort(self.sorted, value)
+
+    def median(self) -> float:
+        """Mediana de la ventana (no vacía)"""
+        s = self.sorted
+        n = len(s)
+        mid = n // 2
+        return s[mid] if n % 2 else (s[mid - 1] + s[mid]) / 2
+
+    def mad(self, center: float) -> float:
+        """
+        Desviación absoluta mediana respecto a center
+
+        Las desviaciones crecen al alejarse de center hacia ambos lados de la copia
+        ordenada, así que se recorren en orden mezclando los dos lados sin ordenar nada.
+        """
+        s = self.sorted
+        n = len(s)
+        right = bisect_left(s, center)
+        left = right - 1
+        lower = upper = 0.0
+        for k in range(n // 2 + 1):
+            if right >= n or (left >= 0 and center - s[left] <= s[right] - center):
+                deviation = center - s[left]
+                left -= 1
+            else:
+                deviation = s[right] - center
+                right += 1
+            if k == (n - 1) // 2:
+                lower = deviation
+            upper = deviation
+        return (lower + upper) / 2
+
+
+class MedianFilter:
+    """Mediana de las últimas N muestras"""
+
+    def __init__(self, window: int = 5):
+        self.window = SortedWindow(window)
+
+    def update(self, value: float) -> float:
+        self.window.push(value)
+        return self.window.median()
+
+
+class EMAFilter:
+    """Media móvil exponencial: y = alpha * x + (1 - alpha) * y"""
+
+    def __init__(self, alpha: float = 0.3):
+        self.alpha = alpha
+        self.value: Optional[float] = None
+
+    def update(self, value: float) -> float:
+        if self.value is None:
+            self.value = value
+        else:
+            self.value += self.alpha * (value - self.value)
+        return self.value
+
+
+class HampelFilter:
+    """
+    Rechazo de valores atípicos de Hampel
+
+    Una muestra que se aleja de la mediana de la ventana más de threshold desviaciones
+    (MAD escalada) se reemplaza por la mediana. La muestra cruda sí entra a la ventana,
+    de modo que un cambio real y sostenido se acepta tras media ventana. min_deviation
+    evita rechazar cualquier cambio cuando la ventana es constante (MAD = 0).
+    """
+
+    MAD_SCALE = 1.4826  # MAD -> desviación estándar para ruido gaussiano
+
+    def __init__(self, window: int = 7, threshold: float = 3.0, min_samples: int = 3,
+                 min_deviation: float = 0.0):
+        self.window = SortedWindow(window)
+        self.threshold = threshold
+        self.min_deviation = min_deviation
+        self.min_samples = min_samples
+        self.rejected = 0
+
+    def update(self, value: float) -> float:
+        output = value
+        if len(self.window) >= self.min_samples:
+            median = self.window.median()
+            limit = max(self.threshold * self.MAD_SCALE * self.window.mad(median), self.min_deviation)
+            if abs(value - median) > limit:
+                output = median
+                self.rejected += 1
+        self.window.push(value)
+        return output
+
+
+# Filtros disponibles por nombre (SENSOR_CONFIG['FILTERS'][sensor]['type'])
+FILTER_TYPES = {
+    'median': MedianFilter,
+    'ema': EMAFilter,
+    'hampel': HampelFilter,
+}
+
+
+def build_filter(spec: Dict[str, Any]):
+    """Crea un filtro a partir de su configuración {'type': ..., parámetros...}"""
+    params = dict(spec)
+    filter_type = params.pop('type')
+    if filter_type not in FILTER_TYPES:
+        raise ValueError(f"Tipo de filtro desconocido: {filter_type}")
+    return FILTER_TYPES[filter_type](**params)
+
+
+class SignalConditioner:
+    """Cadenas de filtros por sensor lógico"""
+
+    def __init__(self, config: Dict[str, Any], decimals: int = 4):
+        """
+        Args:
+            config: {sensor: etapa o lista de etapas}, cada etapa {'type': 'median'|'ema'|'hampel', ...}
+            decimals: redondeo de la salida filtrada
+        """
+        self.config = config or {}
+        self.decimals = decimals
+        self.chains: Dict[str, List[Any]] = {}
+        for sensor in self.config:
+            self.reset(sensor)
+
+    def update(self, sensor: str, value: Optional[float]) -> Optional[float]:
+        """Pasa una muestra por la cadena del sensor (None y sensores sin filtro pasan tal cual)"""
+        chain = self.chains.get(sensor)
+        if value is None or not chain:
+            return value
+        for stage in chain:
+            value = stage.update(value)
+        return round(value, self.decimals)
+
+    def reset(self, sensor: Optional[str] = None):
+        """Reinicia el estado de un sensor (o de todos) reconstruyendo sus filtros"""
+        for name in ([sensor] if sensor else list(self.config)):
+            stages = self.config.get(name)
+            if stages is None:
+                continue
+            if isinstance(stages, dict):
+                stages = [stages]
+            self.chains[name] = [build_filter(stage) for stage in stages]
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Configuración efectiva y muestras rechazadas por sensor"""
+        return {
+            sensor: {
+                'filters': [type(stage).__name__ for stage in chain],
+                'rejected': sum(getattr(stage, 'rejected', 0) for stage in chain),
+            }
+            for sensor, chain in self.chains.items()
+        }
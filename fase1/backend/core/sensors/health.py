@@ -0,0 +1,185 @@
+"""
+Salud de los sensores del Sistema SIEPA
+Contadores y histogramas de latencia por fuente en una ventana deslizante (cubetas de
+tiempo que se descartan al salir de la ventana) más los totales desde el arranque:
+lecturas, fallos, timeouts, lecturas omitidas, reintentos de inicialización y
+valores entregados fuera de plazo. Clasifica cada fuente como ok, degradada o fallando
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Iterable, Optional
+
+from .watchdog import LatencyHistogram
+
+# Resultados de una lectura de dispositivo
+OUTCOME_OK = 'ok'
+OUTCOME_FAILURE = 'failure'   # Excepción o lectura inválida (el lector devolvió None)
+OUTCOME_TIMEOUT = 'timeout'   # Excedió su plazo y se abandonó
+OUTCOME_SKIPPED = 'skipped'   # No se lanzó: la lectura anterior sigue colgada
+
+# Estado de salud de una fuente
+HEALTH_OK = 'ok'
+HEALTH_DEGRADED = 'degraded'
+HEALTH_FAILING = 'failing'
+HEALTH_IDLE = 'idle'          # Sin lecturas en la ventana (deshabilitada o aún sin leer)
+
+_COUNTERS = ('reads', OUTCOME_OK, 'failures', 'timeouts', OUTCOME_SKIPPED, 'retries', 'stale')
+_OUTCOME_COUNTER = {
+    OUTCOME_OK: OUTCOME_OK,
+    OUTCOME_FAILURE: 'failures',
+    OUTCOME_TIMEOUT: 'timeouts',
+    OUTCOME_SKIPPED: OUTCOME_SKIPPED,
+}
+
+
+class _Bucket:
+    """Contadores y latencias de un intervalo de tiempo"""
+
+    __slots__ = ('start', 'counters', 'latency')
+
+    def __init__(self, start: float):
+        self.start = start
+        self.counters = dict.fromkeys(_COUNTERS, 0)
+        self.latency = LatencyHistogram()
+
+
+class SourceHealth:
+    """Estadísticas de una fuente: ventana deslizante y totales"""
+
+    def __init__(self, window: float, bucket: float):
+        self.window = window
+        self.bucket = bucket
+        self.buckets: deque = deque()
+        self.totals = dict.fromkeys(_COUNTERS, 0)
+        self.total_latency = LatencyHistogram()
+        self.last_ok: Optional[float] = None
+        self.last_outcome: Optional[str] = None
+
+    def _current(self, now: float) -> _Bucket:
+        """Cubeta del instante actual, descartando las que salieron de la ventana"""
+        while self.buckets and self.buckets[0].start <= now - self.window:
+            self.buckets.popleft()
+        if not self.buckets or now - self.buckets[-1].start >= self.bucket:
+            self.buckets.append(_Bucket(now - now % self.bucket))
+        return self.buckets[-1]
+
+    def count(self, counter: str, now: float, latency: Optional[float] = None):
+        bucket = self._current(now)
+        bucket.counters[counter] += 1
+        self.totals[counter] += 1
+        if latency is not None:
+            bucket.latency.record(latency)
+            self.total_latency.record(latency)
+
+    def window_stats(self, now: float) -> Dict[str, Any]:
+        """Contadores e histograma combinados de las cubetas dentro de la ventana"""
+        counters = dict.fromkeys(_COUNTERS, 0)
+        latency = LatencyHistogram()
+        for bucket in self.buckets:
+            if bucket.start > now - self.window:
+                for name, n in bucket.counters.items():
+                    counters[name] += n
+                latency.merge(bucket.latency)
+        return {'counters': counters, 'latency': latency}
+
+
+class SensorHealthMonitor:
+    """Salud de todas las fuentes de lectura"""
+
+    def __init__(self, sources: Iterable[str], window: float = 300.0, bucket: float = 10.0,
+                 degraded_rate: float = 0.1, failing_rate: float = 0.5, clock=time.monotonic):
+        """
+        Args:
+            sources: fuentes a seguir ('dht11', 'ultrasonic', ...)
+            window: duración de la ventana deslizante (s)
+            bucket: resolución de la ventana (s)
+            degraded_rate: fracción de lecturas sin éxito a partir de la cual la fuente está degradada
+            failing_rate: fracción a partir de la cual la fuente está fallando
+            clock: reloj monotónico (inyectable para pruebas)
+        """
+        self.window = window
+        self.degraded_rate = degraded_rate
+        self.failing_rate = failing_rate
+        self.clock = clock
+        self.started = clock()
+        self._lock = threading.Lock()
+        self.sources: Dict[str, SourceHealth] = {source: SourceHealth(window, bucket) for source in sources}
+
+    # ============== REGISTRO ==============
+
+    def record(self, source: str, outcome: str, latency: Optional[float] = None):
+        """Registra una lectura de dispositivo con su resultado y duración (segundos)"""
+        health = self.sources.get(source)
+        if health is None:
+            return
+        now = self.clock()
+        with self._lock:
+            if outcome != OUTCOME_SKIPPED:
+                health.count('reads', now, latency)
+            health.count(_OUTCOME_COUNTER[outcome], now)
+            health.last_outcome = outcome
+            if outcome == OUTCOME_OK:
+                health.last_ok = now
+
+    def record_retry(self, sources: Iterable[str]):
+        """Reintento de inicialización del dispositivo detrás de las fuentes"""
+        self._count_each(sources, 'retries')
+
+    def record_stale(self, source: str):
+        """El consumidor recibió un valor más viejo que su umbral de frescura"""
+        self._count_each((source,), 'stale')
+
+    def _count_each(self, sources: Iterable[str], counter: str):
+        now = self.clock()
+        with self._lock:
+            for source in sources:
+                health = self.sources.get(source)
+                if health is not None:
+                    health.count(counter, now)
+
+    # ============== CONSULTA ==============
+
+    def _classify(self, counters: Dict[str, int]) -> str:
+        attempts = counters['reads'] + counters[OUTCOME_SKIPPED]
+        if not attempts:
+            return HEALTH_IDLE
+        unsuccessful = (attempts - counters[OUTCOME_OK]) / attempts
+        if unsuccessful >= self.failing_rate:
+            return HEALTH_FAILING
+        if unsuccessful >= self.degraded_rate:
+            return HEALTH_DEGRADED
+        return HEALTH_OK
+
+    def get_health(self) -> Dict[str, Dict[str, Any]]:
+        """Estado, contadores de la ventana, percentiles de latencia y totales por fuente"""
+        now = self.clock()
+        with self._lock:
+            result = {}
+            for source, health in self.sources.items():
+                window = health.window_stats(now)
+                counters = window['counters']
+                latency = window['latency'].to_dict()
+                attempts = counters['reads'] + counters[OUTCOME_SKIPPED]
+                result[source] = {
+                    'status': self._classify(counters),
+                    **counters,
+                    'failure_rate': round((attempts - counters[OUTCOME_OK]) / attempts, 3) if attempts else None,
+                    'p50_ms': latency['p50_ms'],
+                    'p95_ms': latency['p95_ms'],
+                    'p99_ms': latency['p99_ms'],
+                    'max_ms': latency['max_ms'],
+                    'last_outcome': health.last_outcome,
+                    'last_ok_age_s': round(now - health.last_ok, 1) if health.last_ok is not None else None,
+                    'totals': dict(health.totals),
+                }
+            return result
+
+    def summary(self) -> Dict[str, Any]:
+        """Ventana, tiempo en marcha y salud por fuente (carga útil del tópico de estado)"""
+        return {
+            'window_s': self.window,
+            'uptime_s': round(self.clock() - self.started, 1),
+            'sensors': self.get_health(),
+        }
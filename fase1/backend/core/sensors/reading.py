@@ -0,0 +1,121 @@
+"""
+Registro de lectura de sensores del Sistema SIEPA
+Un único objeto con __slots__ que SensorManager rellena en cada ciclo y que el loop
+principal, el display y MQTT se pasan entre sí, en lugar de crear y copiar diccionarios
+en cada ciclo. to_payload() es el único borde de serialización: MQTT publica
+json.dumps(reading.to_payload(...))
+"""
+
+from typing import Any, Dict, Iterator, Optional
+
+
+class SensorReading:
+    """Lectura completa de un ciclo con campos de disposición fija"""
+
+    __slots__ = (
+        'temperature',
+        'humidity',
+        'dht11_timestamp',
+        'dht11_age',
+        'dht11_stale',
+        'dht11_from_cache',
+        'distance',
+        'distance_spread',
+        'light',
+        'light_lux',
+        'light_voltage',
+        'air_quality_bad',
+        'air_quality_ppm',
+        'air_quality_voltage',
+        'pressure',
+        'no_hay_luz',
+        'mode',
+        'timestamp',
+        'buzzer_state',
+        'buzzer_manual_control',
+        'acquisition_mode',
+        'reading_age',
+        'read_timeouts',
+        'sample_rates',
+        'motor_state',
+    )
+
+    # Campos que solo se serializan cuando el loop principal los asignó
+    OPTIONAL_FIELDS = ('motor_state',)
+
+    def __init__(self, **values):
+        self.clear()
+        for name, value in values.items():
+            setattr(self, name, value)
+
+    def clear(self):
+        """Deja todos los campos en su valor inicial para reutilizar el registro"""
+        for name in self.__slots__:
+            setattr(self, name, None)
+        self.light = False
+        self.air_quality_bad = False
+        self.no_hay_luz = False
+        self.buzzer_state = False
+        self.buzzer_manual_control = False
+
+    def copy(self) -> 'SensorReading':
+        """Copia independiente (el registro de SensorManager se sobrescribe en el siguiente ciclo)"""
+        other = SensorReading.__new__(SensorReading)
+        for name in self.__slots__:
+            setattr(other, name, getattr(self, name))
+        return other
+
+    def to_payload(self, **extra) -> Dict[str, Any]:
+        """Dict serializable con todos los campos (y los extra indicados)"""
+        payload = {}
+        for name in self.__slots__:
+            value = getattr(self, name)
+            if value is None and name in self.OPTIONAL_FIELDS:
+                continue
+            payload[name] = value
+        payload.update(extra)
+        return payload
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any]) -> 'SensorReading':
+        """Registro a partir de un dict de lectura (ignora claves desconocidas)"""
+        return cls(**{k: v for k, v in payload.items() if k in cls.__slots__})
+
+    # ============== COMPATIBILIDAD CON EL ACCESO TIPO DICT ==============
+
+    def get(self, name: str, default: Optional[Any] = None) -> Any:
+        if name not in self.__slots__:
+            return default
+        value = getattr(self, name)
+        if value is None and name in self.OPTIONAL_FIELDS:
+            return default
+        return value
+
+    def __getitem__(self, name: str) -> Any:
+        if name not in self.__slots__:
+            raise KeyError(name)
+        return getattr(self, name)
+
+    def __setitem__(self, name: str, value: Any):
+        if name not in self.__slots__:
+            raise KeyError(name)
+        setattr(self, name, value)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.__slots__
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__slots__)
+
+    def __len__(self) -> int:
+        return len(self.__slots__)
+
+    def keys(self):
+        return self.__slots__
+
+    def items(self):
+        return ((name, getattr(self, name)) for name in self.__slots__)
+
+    def __repr__(self) -> str:
+        fields = ', '.join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"SensorReading({fields})"
@@ -0,0 +1,169 @@
+"""
+Fuente de reproducción de datos grabados del Sistema SIEPA
+Alimenta al sistema con lecturas históricas (tabla sensor_data de HistoryManager o
+lecturas_sensores de core/mqtt/subscriber.py) en tiempo real o acelerado, leyendo
+la base de datos por lotes en lugar de cargarla completa en memoria
+"""
+
+import sqlite3
+import time
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+# Nombres de sensor de cada tabla -> nombres lógicos de SensorManager
+_SENSOR_NAMES = {
+    'sensor_data': {
+        'temperature': 'temperature',
+        'humidity': 'humidity',
+        'distance': 'distance',
+        'light': 'light_lux',
+        'air_quality': 'air_quality_ppm',
+        'pressure': 'pressure',
+    },
+    'lecturas_sensores': {
+        'temperatura': 'temperature',
+        'humedad': 'humidity',
+        'distancia': 'distance',
+        'luz': 'light_lux',
+        'gas': 'air_quality_ppm',
+        'presion': 'pressure',
+    },
+}
+
+_QUERIES = {
+    'sensor_data': """
+        SELECT sensor_type, value, timestamp
+        FROM sensor_data
+        WHERE timestamp >= ?
+        ORDER BY timestamp
+    """,
+    'lecturas_sensores': """
+        SELECT sensor, valor, CAST(timestamp AS REAL) AS ts
+        FROM lecturas_sensores
+        WHERE ts >= ? AND (? IS NULL OR dispositivo = ?)
+        ORDER BY ts
+    """,
+}
+
+
+class ReplaySource:
+    """Reproduce lecturas grabadas como una secuencia de cuadros con ritmo controlado"""
+
+    def __init__(self, db_path: str,
+                 table: Optional[str] = None,
+                 speed: float = 1.0,
+                 start_time: float = 0.0,
+                 device: Optional[str] = None,
+                 frame_window: float = 0.5,
+                 batch_size: int = 500):
+        """
+        Args:
+            db_path: base de datos SQLite grabada
+            table: 'sensor_data' o 'lecturas_sensores' (None = detectar)
+            speed: factor de aceleración (1 = tiempo real, 10 = 10x); 0 = lo más rápido posible
+            start_time: reproducir solo filas con timestamp >= start_time
+            device: filtrar por dispositivo (solo lecturas_sensores)
+            frame_window: filas con timestamps dentro de esta ventana forman un cuadro
+            batch_size: filas leídas por lote desde SQLite
+        """
+        self.db_path = db_path
+        self.speed = speed
+        self.start_time = start_time
+        self.device = device
+        self.frame_window = frame_window
+        self.batch_size = batch_size
+
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.table = table or self._detect_table()
+        if self.table not in _QUERIES:
+            raise ValueError(f"Tabla de reproducción no soportada: {self.table}")
+
+        self._frames = self._iter_frames()
+        self._first_ts: Optional[float] = None
+        self._wall_start: Optional[float] = None
+        self.frames_replayed = 0
+        self.finished = False
+
+    def _detect_table(self) -> str:
+        """Elige la tabla grabada disponible en la base de datos"""
+        tables = {row[0] for row in self._conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        for table in _QUERIES:
+            if table in tables:
+                return table
+        raise ValueError(f"La base {self.db_path} no contiene sensor_data ni lecturas_sensores")
+
+    def _iter_rows(self) -> Iterator[Tuple[str, float, float]]:
+        """Filas (sensor lógico, valor, timestamp) en orden temporal, leídas por lotes"""
+        names = _SENSOR_NAMES[self.table]
+        if self.table == 'lecturas_sensores':
+            params = (self.start_time, self.device, self.device)
+        else:
+            params = (self.start_time,)
+        cursor = self._conn.execute(_QUERIES[self.table], params)
+        while True:
+            rows = cursor.fetchmany(self.batch_size)
+            if not rows:
+                break
+            for sensor, value, ts in rows:
+                name = names.get(sensor)
+                if name is not None and value is not None and ts is not None:
+                    yield name, float(value), float(ts)
+        cursor.close()
+
+    def _iter_frames(self) -> Iterator[Tuple[float, Dict[str, float]]]:
+        """
+        Agrupa filas cercanas en cuadros
+
+        Cada cuadro contiene el último valor conocido de todos los sensores vistos hasta ese momento.
+        """
+        state: Dict[str, float] = {}
+        frame_ts = None
+        for name, value, ts in self._iter_rows():
+            if frame_ts is not None and ts - frame_ts > self.frame_window:
+                yield frame_ts, dict(state)
+                frame_ts = None
+            if frame_ts is None:
+                frame_ts = ts
+            state[name] = value
+        if frame_ts is not None:
+            yield frame_ts, dict(state)
+
+    def next_frame(self) -> Optional[Tuple[float, Dict[str, Any]]]:
+        """
+        Devuelve el siguiente cuadro (timestamp original, valores), esperando hasta su hora
+
+        Returns:
+            None cuando se terminaron los datos grabados
+        """
+        try:
+            frame_ts, values = next(self._frames)
+        except StopIteration:
+            self.finished = True
+            return None
+
+        if self._first_ts is None:
+            self._first_ts = frame_ts
+            self._wall_start = time.monotonic()
+        elif self.speed > 0:
+            due = self._wall_start + (frame_ts - self._first_ts) / self.speed
+            delay = due - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+        self.frames_replayed += 1
+        return frame_ts, values
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Progreso de la reproducción"""
+        elapsed = time.monotonic() - self._wall_start if self._wall_start is not None else 0.0
+        return {
+            'table': self.table,
+            'speed': self.speed,
+            'frames': self.frames_replayed,
+            'elapsed': round(elapsed, 2),
+            'frames_per_second': round(self.frames_replayed / elapsed, 1) if elapsed > 0 else None,
+            'finished': self.finished,
+        }
+
+    def close(self):
+        """Cierra la conexión a la base de datos"""
+        self._conn.close()
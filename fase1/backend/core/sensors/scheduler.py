@@ -0,0 +1,137 @@
+"""
+Planificador multi-frecuencia de sensores del Sistema SIEPA
+Cola de prioridad ordenada por el próximo vencimiento de cada sensor:
+un solo hilo duerme hasta el siguiente sensor pendiente, lo lee y lo reprograma
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .acquisition import SensorSnapshot
+
+
+class SensorScheduler:
+    """Lee cada sensor con su propio intervalo usando una cola de vencimientos"""
+
+    def __init__(self,
+                 readers: Dict[str, Callable[[], Any]],
+                 intervals: Dict[str, float],
+                 is_enabled: Callable[[str], bool],
+                 snapshot: SensorSnapshot = None,
+                 adapt: Optional[Callable[[str, Any], Optional[float]]] = None):
+        """
+        Args:
+            readers: nombre de la fuente -> función que realiza la lectura física
+            intervals: nombre de la fuente -> intervalo de muestreo (segundos)
+            is_enabled: indica si una fuente debe leerse en este momento
+            snapshot: snapshot compartido donde se dejan las lecturas
+            adapt: recibe (fuente, valor) tras cada lectura y devuelve el nuevo intervalo
+                   de la fuente, o None para conservarlo (muestreo adaptativo)
+        """
+        self.readers = readers
+        self.intervals = dict(intervals)
+        self.is_enabled = is_enabled
+        self.snapshot = snapshot or SensorSnapshot()
+        self.adapt = adapt
+
+        self._cond = threading.Condition()
+        self._heap: List[Tuple[float, int, str, int]] = []  # (vencimiento, seq, fuente, generación)
+        self._seq = itertools.count()
+        self._generation = {name: 0 for name in readers}
+        self._next_due: Dict[str, float] = {}
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        """Programa todos los sensores para lectura inmediata e inicia el hilo"""
+        if self._running:
+            return
+        now = time.monotonic()
+        with self._cond:
+            self._heap.clear()
+            for name in self.readers:
+                self._push(name, now)
+            self._running = True
+        self._thread = threading.Thread(target=self._run, name="siepa-scheduler", daemon=True)
+        self._thread.start()
+        print(f"⏱️  Planificador de sensores iniciado: {self.intervals}")
+
+    def stop(self, timeout: float = 2.0):
+        """Detiene el hilo del planificador"""
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def is_running(self) -> bool:
+        """Indica si el planificador está activo"""
+        return self._running
+
+    def set_interval(self, name: str, interval: float):
+        """
+        Cambia el intervalo de un sensor en caliente
+
+        Si el nuevo intervalo es más corto, la siguiente lectura se adelanta.
+        """
+        if name not in self.readers:
+            raise KeyError(name)
+        now = time.monotonic()
+        with self._cond:
+            self.intervals[name] = interval
+            if self._running:
+                due = min(self._next_due.get(name, now), now + interval)
+                self._push(name, due)
+                self._cond.notify()
+
+    def get_intervals(self) -> Dict[str, float]:
+        """Intervalos de muestreo actuales"""
+        with self._cond:
+            return dict(self.intervals)
+
+    def _push(self, name: str, due: float):
+        """Agrega un vencimiento invalidando los anteriores del mismo sensor (llamar con lock)"""
+        self._generation[name] += 1
+        self._next_due[name] = due
+        heapq.heappush(self._heap, (due, next(self._seq), name, self._generation[name]))
+
+    def _run(self):
+        """Bucle del planificador"""
+        while True:
+            with self._cond:
+                if not self._running:
+                    return
+                # Descartar entradas invalidadas por set_interval
+                while self._heap and self._heap[0][3] != self._generation[self._heap[0][2]]:
+                    heapq.heappop(self._heap)
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+                delay = self._heap[0][0] - time.monotonic()
+                if delay > 0:
+                    self._cond.wait(delay)
+                    continue
+                due, _, name, generation = heapq.heappop(self._heap)
+
+            new_interval = None
+            if self.is_enabled(name):
+                try:
+                    value = self.readers[name]()
+                except Exception as e:
+                    print(f"⚠️ [Planificador] Error leyendo {name}: {e}")
+                    value = None
+                self.snapshot.update(name, value)
+                if self.adapt is not None:
+                    new_interval = self.adapt(name, value)
+
+            with self._cond:
+                if new_interval is not None:
+                    self.intervals[name] = new_interval
+                if generation == self._generation[name]:
+                    # Mantener la cadencia; si vamos atrasados, reprogramar desde ahora
+                    next_due = max(due + self.intervals[name], time.monotonic())
+                    self._push(name, next_due)
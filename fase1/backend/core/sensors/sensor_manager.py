@@ -7,21 +7,62 @@ Implementa EXACTAMENTE la misma lógica que allin_w_display.py
 import time
 import random
 from typing import Dict, Any, Optional, Tuple
-from config import SENSOR_CONFIG, SIMULATION_RANGES, ALERT_CONFIG, SENSOR_THRESHOLDS
+from config import SENSOR_CONFIG, SIMULATION_RANGES, SIMULATION_CONFIG, ALERT_CONFIG, SENSOR_THRESHOLDS
+
+from .acquisition import ConcurrentAcquisition
+from .scheduler import SensorScheduler
+from .adaptive import AdaptiveSampler
+from .ultrasonic import UltrasonicRanger
+from .dht_cache import DHT11Cache, DHTReading
+from .adc import ADCFrontEnd
+from .circuit_breaker import CircuitBreaker
+from .simulation import SimulationEngine, NUMPY_AVAILABLE
+from .calibration import CalibrationTables
+from .filters import SignalConditioner
+from .reading import SensorReading
+from .watchdog import ReadWatchdog
+from .health import SensorHealthMonitor, OUTCOME_OK, OUTCOME_FAILURE, OUTCOME_TIMEOUT, OUTCOME_SKIPPED
+from ..hardware.gpio_outputs import GPIOOutputs
+from ..hardware.timers import TimerWheel
+from ..hardware.led_patterns import LEDPatternEngine
+from ..hardware.i2c_bus import PRIORITY_SENSOR, get_i2c_bus
+from ..hardware.faults import FaultInjector, FaultyGPIO
+
+# LEDs de alerta: tipo de LED -> clave del pin en SENSOR_CONFIG
+LED_PINS = {
+    'temperature': 'LED_TEMP',    # LED Rojo
+    'humidity': 'LED_HUM',        # LED Amarillo
+    'light': 'LED_LUZ',           # LED Verde
+    'air_quality': 'LED_AIRE',    # LED Azul
+}
+
+# Fuentes físicas de lectura y los sensores lógicos que alimenta cada una
+SENSOR_SOURCES = {
+    'dht11': ('temperature', 'humidity'),
+    'ultrasonic': ('distance',),
+    'ldr': ('light',),
+    'mq135': ('air_quality',),
+    'bmp180': ('pressure',),
+}
+
+# Dispositivo (circuit breaker) detrás de cada fuente
+SOURCE_DEVICES = {
+    'dht11': 'dht11',
+    'ldr': 'mcp3008',
+    'mq135': 'mcp3008',
+    'bmp180': 'bmp180',
+}
 
 class SensorManager:
     """Gestor principal de sensores"""
     
-    def __init__(self, mode: str = 'testing'):
+    def __init__(self, mode: str = 'testing', acquisition_mode: Optional[str] = None, replay_source=None):
         self.mode = mode
         self.config = SENSOR_CONFIG
         self.simulation_ranges = SIMULATION_RANGES
         self.alert_config = ALERT_CONFIG
         self.thresholds = SENSOR_THRESHOLDS
         
-        # Sistema de gestión de LEDs EXACTO de allin_w_display.py
-        self.leds_activos = {}  # Diccionario para manejar los LEDs activos y su tiempo de apagado
-        
         # Control manual de LEDs
         self.manual_led_control = False  # Si está en modo manual, no controlar automáticamente
         self.manual_led_states = {  # Estado manual de cada LED
@@ -46,8 +87,112 @@ class SensorManager:
             'pressure': True,  # Sensor BMP180
         }
         
+        # Dispersión (cm) de la última ráfaga del HC-SR04, None si fue un disparo simple
+        self.distance_spread = None
+        
+        # Circuit breakers de los dispositivos con inicialización o bus propensos a fallar
+        breaker_config = self.config.get('CIRCUIT_BREAKER', {})
+        self.breakers = {
+            device: CircuitBreaker(
+                device.upper(),
+                failure_threshold=breaker_config.get('FAILURE_THRESHOLD', 3),
+                base_backoff=breaker_config.get('BASE_BACKOFF', 2.0),
+                max_backoff=breaker_config.get('MAX_BACKOFF', 120.0)
+            )
+            for device in ('dht11', 'bmp180', 'mcp3008')
+        }
+        
+        # Tablas de conversión LDR -> lux y MQ135 -> ppm, construidas una sola vez
+        self.calibration = CalibrationTables(vref=self.config.get('ADC_VREF', 3.3))
+        
+        # Filtrado de señal por sensor entre la adquisición y la evaluación de alertas
+        self.filters = SignalConditioner(self.config.get('FILTERS', {}))
+        self._last_dht_filtered = None
+        self._dht_filtered = (None, None)
+        self._filtered: Dict[str, Tuple[int, Optional[float]]] = {}  # fuente -> (muestra, valor filtrado)
+        
+        # Registro de lectura reutilizado en cada ciclo (ver read_all_sensors)
+        self.reading = SensorReading()
+        
+        # Motor de simulación realista (solo modo testing, requiere NumPy)
+        self.simulation = None
+        
+        # Inyección de fallos en sensores y salidas (SENSOR_CONFIG['FAULT_INJECTION'])
+        self.faults = FaultInjector(self.config.get('FAULT_INJECTION'))
+        
+        # Fuente de datos grabados (solo modo replay)
+        self.replay = replay_source
+        self.replay_finished = False
+        
         if mode == 'real':
             self._init_real_sensors()
+        elif mode == 'replay':
+            if self.replay is None:
+                raise ValueError("El modo 'replay' requiere una fuente de reproducción")
+        else:
+            self._init_simulation()
+        
+        # Salidas GPIO con registro sombra
+        self._init_outputs()
+        
+        # Temporizadores de apagado de LEDs de alerta y buzzer (hilo propio, independiente del loop)
+        self.timers = TimerWheel(
+            tick=self.config.get('TIMER_TICK', 0.01),
+            slots=self.config.get('TIMER_SLOTS', 512)
+        )
+        self.timers.start()
+        
+        # Plazo por lectura de dispositivo: una lectura colgada se abandona y el ciclo sigue
+        self.watchdog = ReadWatchdog(
+            self.config.get('READ_DEADLINES', {}),
+            default_deadline=self.config.get('READ_DEADLINE_DEFAULT', 1.0),
+            workers=self.config.get('READ_WORKERS')
+        )
+        self.watchdog.on_timeout = self._lectura_abandonada
+        self.watchdog.on_result = self._registrar_lectura
+        
+        # Salud por fuente: contadores y latencias en ventana deslizante (ver get_sensor_health)
+        health_config = self.config.get('HEALTH', {})
+        self.health = SensorHealthMonitor(
+            SENSOR_SOURCES,
+            window=health_config.get('WINDOW', 300.0),
+            bucket=health_config.get('BUCKET', 10.0),
+            degraded_rate=health_config.get('DEGRADED_RATE', 0.1),
+            failing_rate=health_config.get('FAILING_RATE', 0.5)
+        )
+        self.stale_factor = health_config.get('STALE_FACTOR', 3.0)
+        
+        # Caché del DHT11: nunca se consulta más rápido de lo que admite el sensor
+        self.dht_cache = DHT11Cache(
+            lambda: self.watchdog.call('dht11', self._leer_dht11_dispositivo, (None, None)),
+            min_interval=self.config.get('DHT11_MIN_INTERVAL', 1.0),
+            stale_after=self.config.get('DHT11_STALE_AFTER', 5.0),
+            max_age=self.config.get('DHT11_MAX_AGE', 60.0)
+        )
+        
+        # Intervalos de muestreo por fuente (usados por los modos 'concurrent' y 'scheduled')
+        default_interval = self.config.get('READ_INTERVAL', 1.0)
+        self.sample_intervals = {
+            source: self.config.get('SAMPLE_INTERVALS', {}).get(source, default_interval)
+            for source in SENSOR_SOURCES
+        }
+        
+        # Intervalos adaptativos por fuente (modo 'adaptive')
+        self.adaptive = AdaptiveSampler(self.config.get('ADAPTIVE_SAMPLING', {}))
+        
+        # Modo de adquisición: 'sequential' (lectura en el loop), 'concurrent' (un hilo por sensor),
+        # 'scheduled' (un hilo con cola de vencimientos por sensor) o 'adaptive' (como 'scheduled'
+        # con intervalos que siguen la velocidad de cambio de cada señal)
+        self.acquisition_mode = acquisition_mode or self.config.get('ACQUISITION_MODE', 'sequential')
+        if mode == 'replay':
+            self.acquisition_mode = 'sequential'  # El ritmo lo marca la grabación
+        self.acquisition = None
+        if self.acquisition_mode == 'concurrent':
+            self.start_concurrent_acquisition()
+        elif self.acquisition_mode == 'scheduled':
+            self.start_scheduled_acquisition()
+        elif self.acquisition_mode == 'adaptive':
+            self.start_adaptive_acquisition()
         
     def _init_real_sensors(self):
         """Inicializa los sensores físicos"""
@@ -59,255 +204,443 @@ class SensorManager:
             import bmp180
             import RPi.GPIO as GPIO
             from adafruit_mcp3xxx.mcp3008 import MCP3008
-            from adafruit_mcp3xxx.analog_in import AnalogIn
-            
-            # Configurar GPIO
-            GPIO.setmode(GPIO.BCM)
-            
-            # DHT11
-            try:
-                self.dht_sensor = adafruit_dht.DHT11(board.D4)
-                print("✅ Sensor DHT11 inicializado correctamente")
-            except (ValueError, OSError, RuntimeError) as e:
-                self.dht_sensor = None
-                self.enable_sensor('temperature', False)
-                self.enable_sensor('humidity', False)
-                print(f"⚠️  Sensor DHT11 no encontrado en pin D4")
-                print(f"   Error: {e}")
-                print("   Los sensores de temperatura y humedad serán deshabilitados")
-            
-            # HC-SR04
-            GPIO.setup(self.config['ULTRASONIC_TRIG_PIN'], GPIO.OUT)
-            GPIO.setup(self.config['ULTRASONIC_ECHO_PIN'], GPIO.IN)
-            
-            # Buzzer
-            GPIO.setup(self.config['BUZZER_PIN'], GPIO.OUT, initial=GPIO.HIGH)  # Buzzer apagado al inicio
-            
-            # LEDs de Alerta
-            GPIO.setup(self.config['LED_TEMP'], GPIO.OUT, initial=GPIO.LOW)
-            GPIO.setup(self.config['LED_HUM'], GPIO.OUT, initial=GPIO.LOW)
-            GPIO.setup(self.config['LED_LUZ'], GPIO.OUT, initial=GPIO.LOW)
-            GPIO.setup(self.config['LED_AIRE'], GPIO.OUT, initial=GPIO.LOW)
-            
-            # Motor pin (igual que allin_w_display.py)
-            GPIO.setup(self.config['MOTOR_PIN'], GPIO.OUT, initial=GPIO.LOW)
-            print(f"✅ Motor configurado en pin {self.config['MOTOR_PIN']}")
-            
-            # I2C para BMP180 - Inicialización igual que allin_w_display.py
-            try:
-                i2c = busio.I2C(board.SCL, board.SDA)
-                self.bmp180_sensor = bmp180.BMP180(i2c)
-                print("✅ Sensor BMP180 inicializado correctamente")
-                self.bmp180_disponible = True
-            except Exception as e:
-                print(f"⚠️ Error al inicializar BMP180: {e}")
-                self.bmp180_sensor = None
-                self.bmp180_disponible = False
-                self.enable_sensor('pressure', False)
-                print("   El sensor de presión será deshabilitado")
-            
-            # MCP3008 CONFIG
-            try:
-                spi = busio.SPI(clock=board.SCK, MISO=board.MISO, MOSI=board.MOSI)
-                cs = digitalio.DigitalInOut(board.D8)  # CE0 (GPIO8)
-                mcp = MCP3008(spi, cs)
-                
-                # Canales analógicos (igual que allin_w_display.py)
-                self.canal_ldr = AnalogIn(mcp, 0)      # CH0 = A0 del LDR
-                self.canal_mq135 = AnalogIn(mcp, 1)    # CH1 = A0 del MQ135
-                print("✅ Sensor MCP3008 inicializado correctamente")
-            except (ValueError, OSError, RuntimeError) as e:
-                self.canal_ldr = None
-                self.canal_mq135 = None
-                self.enable_sensor('light', False)
-                self.enable_sensor('air_quality', False)
-                print(f"⚠️  Sensor MCP3008 no encontrado")
-                print(f"   Error: {e}")
-                print("   Los sensores de luz y calidad de aire serán deshabilitados")
-            
-            self.GPIO = GPIO
-            
         except ImportError:
             raise ImportError("Librerías de Raspberry Pi no disponibles. Use modo 'testing'")
+        
+        # Módulos de hardware guardados para poder reinicializar dispositivos al recuperarse
+        self._board = board
+        self._busio = busio
+        self._digitalio = digitalio
+        self._adafruit_dht = adafruit_dht
+        self._bmp180 = bmp180
+        self._MCP3008 = MCP3008
+        
+        # Configurar GPIO
+        GPIO.setmode(GPIO.BCM)
+        self.GPIO = GPIO
+        
+        # DHT11
+        self.dht_sensor = None
+        self._init_device('dht11')
+        
+        # HC-SR04
+        GPIO.setup(self.config['ULTRASONIC_TRIG_PIN'], GPIO.OUT)
+        GPIO.setup(self.config['ULTRASONIC_ECHO_PIN'], GPIO.IN)
+        self.ultrasonic = UltrasonicRanger(
+            GPIO,
+            self.config['ULTRASONIC_TRIG_PIN'],
+            self.config['ULTRASONIC_ECHO_PIN'],
+            timeout=self.config.get('ULTRASONIC_TIMEOUT', 0.04),
+            ping_interval=self.config.get('ULTRASONIC_PING_INTERVAL', 0.06)
+        )
+        # Fallos por disparo (measure_burst llama a measure del propio objeto)
+        self.ultrasonic.measure = self.faults.wrap(self.ultrasonic, {'measure': 'ultrasonic'}).measure
+        
+        # I2C para BMP180 (bus compartido con el LCD: transacciones por su gestor)
+        self.i2c_bus = get_i2c_bus(self.config.get('BMP180_I2C_BUS', 1))
+        self.bmp180_sensor = None
+        self._init_device('bmp180')
+        
+        # MCP3008 CONFIG
+        self.adc = None
+        self._init_device('mcp3008')
 
-    # ============== SISTEMA DE GESTIÓN DE LEDS (EXACTO DE ALLIN_W_DISPLAY.PY) ==============
-    
-    def gestionar_leds(self):
-        """
-        Gestiona el apagado automático de LEDs después de 5 segundos
-        FUNCIÓN EXACTA de allin_w_display.py
+    def _init_outputs(self):
+        """Registra buzzer, LEDs y motor en el registro sombra (escribe en GPIO solo en modo real)"""
+        gpio = None
+        if self.mode == 'real':
+            pin_targets = {self.config['BUZZER_PIN']: 'buzzer', self.config['MOTOR_PIN']: 'motor'}
+            pin_targets.update({self.config[pin_key]: 'leds' for pin_key in LED_PINS.values()})
+            gpio = FaultyGPIO(self.faults, self.GPIO, pin_targets)
+        self.outputs = GPIOOutputs(gpio)
+        
+        # Buzzer (activo bajo: apagado al inicio con nivel HIGH)
+        self.outputs.setup(self.config['BUZZER_PIN'], 'buzzer', initial=False, active_low=True)
+        
+        # LEDs de Alerta
+        for led_type, pin_key in LED_PINS.items():
+            self.outputs.setup(self.config[pin_key], f'led_{led_type}', initial=False)
+        self.outputs.alias('led_pressure', 'led_air_quality')  # Presión comparte el LED azul
+        
+        # Motor pin (igual que allin_w_display.py)
+        self.outputs.setup(self.config['MOTOR_PIN'], 'motor', initial=False)
+        if self.mode == 'real':
+            print(f"✅ Motor configurado en pin {self.config['MOTOR_PIN']}")
+        
+        # Patrones animados de LEDs (hilo propio, se inicia con el primer patrón)
+        self.led_patterns = LEDPatternEngine(
+            self.outputs,
+            [f'led_{led_type}' for led_type in LED_PINS],
+            pwm_period=self.config.get('LED_PWM_PERIOD', 0.01),
+            max_frames=self.config.get('LED_PATTERN_MAX_FRAMES', 256)
+        )
+        self.led_patterns.on_finish = self._restaurar_leds_manuales
+
+    def get_output_states(self) -> Dict[str, bool]:
+        """Estado real de las salidas (buzzer, motor, LEDs) según el registro sombra"""
+        return self.outputs.snapshot()
+
+    def _init_simulation(self):
+        """Inicializa el motor de series simuladas si está configurado y NumPy está disponible"""
+        if SIMULATION_CONFIG.get('ENGINE') != 'realistic':
+            return
+        if not NUMPY_AVAILABLE:
+            print("⚠️  NumPy no disponible - simulación con valores uniformes independientes")
+            return
+        self.simulation = SimulationEngine(seed=SIMULATION_CONFIG.get('SEED'))
+        print("🎲 Simulación realista habilitada (series correlacionadas con ciclo diario)")
+
+    def _simulated_value(self, channel: str, range_key: str) -> float:
+        """Valor simulado de un canal: del motor realista o uniforme dentro de SIMULATION_RANGES"""
+        if self.simulation is not None:
+            return self.simulation.sample()[channel]
+        return random.uniform(
+            self.simulation_ranges[range_key]['min'],
+            self.simulation_ranges[range_key]['max']
+        )
+
+    def _init_dht11(self):
+        """Crea el objeto del DHT11 (lanza excepción si falla), liberando el anterior"""
+        self._liberar_dht11()
+        self.dht_sensor = self.faults.wrap(
+            self._adafruit_dht.DHT11(self._board.D4), {'temperature': 'dht11', 'humidity': 'dht11'}
+        )
+
+    def _liberar_dht11(self):
+        """Libera el pin (pulseio / libgpiod) del objeto DHT11 actual"""
+        anterior, self.dht_sensor = self.dht_sensor, None
+        if anterior is None:
+            return
+        try:
+            anterior.exit()
+        except Exception as e:
+            print(f"⚠️ DHT11: Error al liberar el sensor - {e}")
+
+    def _init_bmp180(self):
+        """Crea el bus I2C y el objeto del BMP180 (lanza excepción si falla)"""
+        def crear():
+            i2c = self._busio.I2C(self._board.SCL, self._board.SDA)
+            return self.faults.wrap(self._bmp180.BMP180(i2c), {'pressure': 'bmp180'})
+        self.bmp180_sensor = self.i2c_bus.execute(crear, priority=PRIORITY_SENSOR, client='bmp180')
+
+    def _init_mcp3008(self):
+        """Crea el bus SPI, el MCP3008 y su front-end de ráfagas (lanza excepción si falla)"""
+        spi = self._busio.SPI(clock=self._board.SCK, MISO=self._board.MISO, MOSI=self._board.MOSI)
+        cs = self._digitalio.DigitalInOut(self._board.D8)  # CE0 (GPIO8)
+        mcp = self._MCP3008(spi, cs)
+        
+        # Front-end del ADC: todos los canales en una ráfaga sobremuestreada por ciclo
+        adc = ADCFrontEnd(
+            mcp,
+            self._adc_channels(),
+            vref=self.config.get('ADC_VREF', 3.3),
+            oversample=self.config.get('ADC_OVERSAMPLE', 8),
+            max_age=self.config.get('ADC_BURST_MAX_AGE', 0.05)
+        )
+        self.adc = self.faults.wrap(adc, {'read': None})  # Fallos por canal ('ldr', 'mq135')
+
+    def _init_device(self, device: str) -> bool:
         """
-        if self.mode == 'testing':
-            return  # En modo testing no manejamos LEDs físicos
-            
-        tiempo_actual = time.time()
-        leds_a_apagar = []
+        Inicializa un dispositivo registrando el resultado en su circuit breaker
         
-        for gpio_led, tiempo_apagado in self.leds_activos.items():
-            if tiempo_actual >= tiempo_apagado:
-                self.GPIO.output(gpio_led, self.GPIO.LOW)
-                leds_a_apagar.append(gpio_led)
+        Si falla, el circuito se abre y la inicialización se reintenta con backoff
+        exponencial desde _ensure_device en lugar de deshabilitar el sensor para siempre.
+        Si la inicialización funciona, el circuito no se cierra aquí: en medio abierto lo
+        decide la lectura de prueba (un dispositivo que inicia pero no lee vuelve a abrirse
+        con el backoff duplicado).
+        """
+        initializers = {
+            'dht11': self._init_dht11,
+            'bmp180': self._init_bmp180,
+            'mcp3008': self._init_mcp3008,
+        }
+        breaker = self.breakers[device]
+        try:
+            self.faults.check_init(device, [s for s, d in SOURCE_DEVICES.items() if d == device])
+            initializers[device]()
+        except Exception as e:
+            print(f"⚠️  Error al inicializar {device}: {e}")
+            breaker.trip()
+            return False
+        print(f"✅ Sensor {device.upper()} inicializado correctamente")
+        return True
+
+    def _device_ready(self, device: str) -> bool:
+        """Indica si el objeto del dispositivo existe"""
+        if device == 'dht11':
+            return self.dht_sensor is not None
+        if device == 'bmp180':
+            return self.bmp180_sensor is not None
+        if device == 'mcp3008':
+            return self.adc is not None
+        return False
+
+    def _ensure_device(self, device: str) -> bool:
+        """
+        Verifica que el dispositivo pueda usarse en este ciclo
         
-        # Remover LEDs que ya se apagaron
-        for led in leds_a_apagar:
-            del self.leds_activos[led]
+        Con el circuito abierto retorna False sin tocar el bus; al vencer el backoff
+        re-crea el dispositivo y permite un intento de prueba.
+        """
+        breaker = self.breakers[device]
+        if not breaker.allow():
+            return False
+        if breaker.state == CircuitBreaker.HALF_OPEN or not self._device_ready(device):
+            self.health.record_retry(s for s, d in SOURCE_DEVICES.items() if d == device)
+            return self._init_device(device)
+        return True
 
-    def activar_alerta(self, mensaje, gpio_led):
+    @property
+    def bmp180_disponible(self) -> bool:
+        """Compatibilidad: el BMP180 está disponible si su circuito está cerrado"""
+        return self.bmp180_sensor is not None and not self.breakers['bmp180'].is_open()
+
+    def get_breaker_status(self) -> Dict[str, Dict[str, Any]]:
+        """Estado de los circuit breakers de cada dispositivo"""
+        return {device: breaker.get_status() for device, breaker in self.breakers.items()}
+
+    def _adc_channels(self) -> Dict[str, int]:
+        """Canales del MCP3008 leídos en cada ráfaga"""
+        return {
+            'ldr': self.config['LDR_CHANNEL'],
+            'mq135': self.config['MQ135_CHANNEL'],
+            **self.config.get('ADC_EXTRA_CHANNELS', {})
+        }
+
+    # ============== SISTEMA DE GESTIÓN DE LEDS (EXACTO DE ALLIN_W_DISPLAY.PY) ==============
+    
+    def activar_alerta(self, mensaje, gpio_led, notificar=True):
         """
         Activa una alerta encendiendo el LED por 5 segundos
         FUNCIÓN EXACTA de allin_w_display.py
+        
+        Con notificar=False solo renueva el LED de una alerta ya anunciada
         """
-        print(f"🚨 ALERTA: {mensaje}")
+        if notificar:
+            print(f"🚨 ALERTA: {mensaje}")
         
         # Solo activar alertas automáticas si no está en modo manual
-        if not self.manual_led_control and self.mode == 'real':
-            # Encender el LED y programar su apagado en 5 segundos
-            self.GPIO.output(gpio_led, self.GPIO.HIGH)
-            self.leds_activos[gpio_led] = time.time() + 5.0  # 5 segundos desde ahora
-        elif self.manual_led_control:
+        if not self.manual_led_control:
+            # Encender el LED y (re)programar su apagado en ALERT_DURATION segundos
+            duracion = self.config.get('ALERT_DURATION', 5)
+            self.outputs.set(gpio_led, True)
+            self.timers.arm(('led', gpio_led), duracion, lambda: self._expirar_led(gpio_led))
+        elif notificar:
             print("   ⚠️ Control manual activo - alerta no aplicada a LEDs")
 
+    def _expirar_led(self, gpio_led):
+        """Apaga un LED de alerta al vencer su temporizador (hilo de la rueda)"""
+        if not self.manual_led_control:
+            self.outputs.set(gpio_led, False)
+
+    def _apagar_buzzer_automatico(self):
+        """Apaga el buzzer automático si no se renovó a tiempo (hilo de la rueda)"""
+        if not self.manual_buzzer_control and self.outputs.set('buzzer', False):
+            print("🔕 Buzzer: OFF (plazo vencido sin renovación)")
+
     # ============== FUNCIONES IGUALES A ALLIN_W_DISPLAY.PY ==============
     
     def leer_dht11(self):
-        """Función igual que en allin_w_display.py"""
+        """
+        Lee temperatura y humedad a través de la caché del DHT11
+        Retorna la última lectura válida si el sensor aún no puede consultarse
+        """
+        lectura = self.dht_cache.read()
+        return lectura.temperature, lectura.humidity
+
+    def _leer_dht11_dispositivo(self):
+        """Consulta directa al DHT11 (solo la invoca DHT11Cache)"""
         if self.mode == 'real':
+            if not self._ensure_device('dht11'):
+                return None, None
+            breaker = self.breakers['dht11']
             try:
                 temp = self.dht_sensor.temperature
                 hum = self.dht_sensor.humidity
-                return temp, hum
-            except:
+            except (RuntimeError, OSError):
+                breaker.record_failure()
+                return None, None
+            if temp is None or hum is None:
+                breaker.record_failure()
                 return None, None
+            breaker.record_success()
+            return temp, hum
+        else:
+            return self.faults.inject('dht11', self._read_dht11_simulated)
+
+    def get_dht11_stats(self) -> Dict[str, Any]:
+        """Tasas de éxito, fallo y aciertos de caché del DHT11"""
+        return self.dht_cache.get_stats()
+
+    def get_read_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Latencia (histograma) y lecturas completas, abandonadas o con error por fuente"""
+        return self.watchdog.get_stats()
+
+    def _lectura_abandonada(self, source: str):
+        """Una lectura que excede su plazo cuenta como fallo del dispositivo"""
+        device = SOURCE_DEVICES.get(source)
+        if device is not None:
+            self.breakers[device].record_failure()
+
+    def _registrar_lectura(self, source: str, status: str, value: Any, latency: Optional[float]):
+        """Resultado de cada lectura de dispositivo para la salud del sensor (hilo del watchdog)"""
+        if status == 'ok':
+            # Los lectores devuelven None (o (None, None) el DHT11) cuando la lectura no es válida
+            invalid = value is None or (isinstance(value, tuple) and None in value)
+            outcome = OUTCOME_FAILURE if invalid else OUTCOME_OK
+        elif status == 'timeout':
+            outcome = OUTCOME_TIMEOUT
+        elif status == 'busy':
+            outcome = OUTCOME_SKIPPED
         else:
-            return self._read_dht11_simulated()
+            outcome = OUTCOME_FAILURE
+        self.health.record(source, outcome, latency)
+
+    def get_sensor_health(self) -> Dict[str, Any]:
+        """
+        Salud por fuente en la ventana deslizante: estado (ok, degraded, failing, idle),
+        lecturas, fallos, timeouts, omitidas, reintentos, valores viejos y p50/p95/p99 de latencia
+        """
+        summary = self.health.summary()
+        breakers = self.get_breaker_status()
+        for source, health in summary['sensors'].items():
+            health['enabled'] = self._is_source_enabled(source)
+            device = SOURCE_DEVICES.get(source)
+            health['breaker'] = breakers[device]['state'] if device in breakers else None
+        summary['mode'] = self.mode
+        summary['acquisition_mode'] = self.acquisition_mode
+        return summary
+
+    def get_i2c_stats(self) -> Dict[str, Any]:
+        """Utilización del bus I2C del BMP180 (vacío fuera del modo real)"""
+        return self.i2c_bus.get_stats() if self.mode == 'real' else {}
+
+    def get_fault_stats(self) -> Dict[str, Any]:
+        """Fallos inyectados por dispositivo"""
+        return self.faults.get_stats()
+
+    def get_filter_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Filtros activos y muestras rechazadas por sensor"""
+        return self.filters.get_stats()
 
     def leer_ultrasonico(self):
-        """Función igual que en allin_w_display.py"""
+        """
+        Mide la distancia con el HC-SR04 por interrupciones y con timeout
+        Con ULTRASONIC_BURST_SIZE > 1 devuelve la mediana de la ráfaga
+        """
         if self.mode == 'real':
-            self.GPIO.output(self.config['ULTRASONIC_TRIG_PIN'], True)
-            time.sleep(0.00001)
-            self.GPIO.output(self.config['ULTRASONIC_TRIG_PIN'], False)
-
-            while self.GPIO.input(self.config['ULTRASONIC_ECHO_PIN']) == 0:
-                start = time.time()
-            while self.GPIO.input(self.config['ULTRASONIC_ECHO_PIN']) == 1:
-                end = time.time()
-
-            duracion = end - start
-            distancia = (duracion * 34300) / 2
-            return round(distancia, 2)
+            burst_size = self.config.get('ULTRASONIC_BURST_SIZE', 1)
+            if burst_size > 1:
+                distancia, self.distance_spread = self.ultrasonic.measure_burst(burst_size)
+            else:
+                distancia = self.ultrasonic.measure()
+                self.distance_spread = None
+            
+            if distancia is None:
+                print(f"⚠️ HC-SR04: Eco no recibido (timeout {self.ultrasonic.timeout}s)")
+            return distancia
         else:
-            return self._read_ultrasonic_simulated()
+            return self.faults.inject('ultrasonic', self._read_ultrasonic_simulated)
 
     def leer_ldr(self):
-        """Función igual que en allin_w_display.py"""
+        """Lee el voltaje del LDR desde la ráfaga sobremuestreada del MCP3008"""
         if self.mode == 'real':
             try:
-                # Leer tanto el valor ADC crudo como el voltaje
-                valor_adc = self.canal_ldr.value
-                voltaje = self.canal_ldr.voltage
-                
-                # Validar que los valores sean razonables
-                if valor_adc is None or voltaje is None:
+                if not self._ensure_device('mcp3008'):
                     print("⚠️ Sensor LDR: No se puede leer el valor")
                     return None
+                
+                # Código crudo promedio y voltaje de la ráfaga del ciclo actual
+                valor_adc, voltaje = self.adc.read('ldr')
+                self.breakers['mcp3008'].record_success()
                     
-                if valor_adc < 0 or valor_adc > 65535:
+                if valor_adc < 0 or valor_adc > self.adc.max_code:
                     print(f"⚠️ Sensor LDR: Valor ADC fuera de rango ({valor_adc})")
                     return None
                     
-                print(f"DEBUG ADC: Valor crudo = {valor_adc}, Voltaje = {voltaje:.4f}V")
+                print(f"DEBUG ADC: Valor crudo = {valor_adc:.1f}, Voltaje = {voltaje:.4f}V")
                 return voltaje
                 
             except Exception as e:
                 print(f"⚠️ Sensor LDR: Error al leer sensor - {e}")
+                self.breakers['mcp3008'].record_failure()
                 return None
         else:
             # En modo simulado, retornamos un voltaje simulado realista
-            lux = round(random.uniform(self.simulation_ranges['LIGHT']['min'], self.simulation_ranges['LIGHT']['max']))
+            lux = round(self._simulated_value('light', 'LIGHT'))
             # Conversión inversa para simular voltaje (voltaje bajo = mucha luz)
-            voltaje_ldr = round(3.3 - (lux / 2000) * 3.3, 4)
+            voltaje_ldr = self.faults.inject('ldr', lambda: round(self.calibration.voltage_from_lux(lux), 4))
             print(f"DEBUG LDR: Voltaje raw = {voltaje_ldr:.4f}V, Lux calculado = {lux}")
             return voltaje_ldr
 
-    def calcular_lux(self, voltaje, vcc_max=3.3):
+    def calcular_lux(self, voltaje):
         """
-        Función igual que en allin_w_display.py
-        Convierte el voltaje del sensor LDR a lux
+        Convierte el voltaje del sensor LDR a lux (búsqueda en la tabla de calibración)
         Sensor LDR: voltaje bajo = mucha luz, voltaje alto = poca luz
         """
-        if voltaje <= 0.1:
-            return 2000  # Voltaje muy bajo = máxima luz
-        
-        if voltaje >= vcc_max - 0.1:
-            return 0  # Voltaje máximo = sin luz
-        
-        # Conversión inversa: menor voltaje = más luz
-        # Basado en observaciones: 0.45V = luz, 1.8V+ = oscuro
-        lux = 2000 * (vcc_max - voltaje) / vcc_max
-        
-        return round(max(0, lux), 1)
+        return self.calibration.lux_from_voltage(voltaje)
+
+    def calcular_ppm(self, voltaje):
+        """Convierte el voltaje del MQ135 a ppm con la curva calibrada (0 si no hay lectura)"""
+        return self.calibration.ppm_from_voltage(voltaje) if voltaje else 0
 
     def leer_mq135(self):
-        """Función igual que en allin_w_display.py"""
+        """Lee el voltaje del MQ135 desde la ráfaga sobremuestreada del MCP3008"""
         if self.mode == 'real':
-            return self.canal_mq135.voltage
+            if not self._ensure_device('mcp3008'):
+                return None
+            try:
+                voltaje = self.adc.read('mq135').voltage
+            except Exception as e:
+                print(f"⚠️ Sensor MQ135: Error al leer sensor - {e}")
+                self.breakers['mcp3008'].record_failure()
+                return None
+            self.breakers['mcp3008'].record_success()
+            return voltaje
         else:
             # En modo simulado, simular voltaje MQ135
-            ppm = round(random.uniform(200, 600))
-            voltaje_mq135 = round((ppm / 1000) * 3.3, 4)
+            if self.simulation is not None:
+                ppm = round(self.simulation.sample()['air_quality'])
+            else:
+                ppm = round(random.uniform(200, 600))
+            voltaje_mq135 = self.faults.inject('mq135', lambda: round(self.calibration.voltage_from_ppm(ppm), 4))
             return voltaje_mq135
 
     def leer_presion(self):
         """
-        Función igual que en allin_w_display.py
-        Lee la presión del sensor BMP180 con manejo robusto de errores
+        Lee la presión del sensor BMP180 protegida por circuit breaker
+        
+        Un solo intento por ciclo, sin esperas: los fallos abren el circuito, que se
+        reintenta con backoff exponencial re-creando el bus I2C y el sensor.
         """
         if self.mode == 'real':
+            if not self._ensure_device('bmp180'):
+                return None
+            
+            breaker = self.breakers['bmp180']
             try:
-                if not self.bmp180_disponible or self.bmp180_sensor is None:
-                    return None
-                
-                # Intentar lectura con reintentos
-                max_intentos = 3
-                for intento in range(max_intentos):
-                    try:
-                        presion = self.bmp180_sensor.pressure  # Retorna en hPa
-                        
-                        # Validar que el valor sea razonable (rango típico: 300-1100 hPa)
-                        if presion < 300 or presion > 1100:
-                            print(f"⚠️ Sensor BMP180: Valor de presión fuera de rango ({presion:.1f} hPa)")
-                            return None
-                            
-                        return presion
-                        
-                    except OSError as e:
-                        if "Input/output error" in str(e) or e.errno == 5:
-                            if intento < max_intentos - 1:
-                                print(f"⚠️ BMP180: Error I/O en intento {intento + 1}, reintentando...")
-                                time.sleep(0.1)  # Esperar un poco antes de reintentar
-                                continue
-                            else:
-                                print(f"❌ BMP180: Error I/O persistente después de {max_intentos} intentos")
-                                print("💡 Verificar conexiones I2C (SDA, SCL, VCC, GND)")
-                                self.bmp180_disponible = False  # Marcar como no disponible
-                                return None
-                        else:
-                            raise e  # Re-lanzar otros errores OSError
-                            
-                    except Exception as e:
-                        if intento < max_intentos - 1:
-                            print(f"⚠️ BMP180: Error en intento {intento + 1}: {e}")
-                            time.sleep(0.1)
-                            continue
-                        else:
-                            raise e
-                            
+                # Retorna en hPa; va antes que las escrituras del LCD en la cola del bus
+                presion = self.i2c_bus.execute(
+                    lambda: self.bmp180_sensor.pressure, priority=PRIORITY_SENSOR, client='bmp180'
+                )
             except Exception as e:
-                print(f"⚠️ Sensor BMP180: Error al leer presión - {e}")
+                if isinstance(e, OSError) and e.errno == 5:
+                    print("⚠️ BMP180: Error I/O - verificar conexiones I2C (SDA, SCL, VCC, GND)")
+                else:
+                    print(f"⚠️ Sensor BMP180: Error al leer presión - {e}")
+                breaker.record_failure()
                 return None
+            
+            # Validar que el valor sea razonable (rango típico: 300-1100 hPa)
+            if presion is None or presion < 300 or presion > 1100:
+                print(f"⚠️ Sensor BMP180: Valor de presión fuera de rango ({presion} hPa)")
+                breaker.record_failure()
+                return None
+            
+            breaker.record_success()
+            return presion
         else:
-            return self._read_bmp180_simulated()
+            return self.faults.inject('bmp180', self._read_bmp180_simulated)
 
     def controlar_buzzer(self, estado):
         """Función igual que en allin_w_display.py"""
@@ -316,46 +649,60 @@ class SensorManager:
             print(f"⚠️ Buzzer en modo manual - ignorando control automático")
             return
             
-        if self.mode == 'real':
-            self.GPIO.output(self.config['BUZZER_PIN'], self.GPIO.LOW if estado else self.GPIO.HIGH)
-            print(f"🔔 Buzzer: {'ON' if estado else 'OFF'} (automático)")
+        # Mientras el aire siga malo cada llamada rearma el apagado; si el loop se detiene
+        # el buzzer se apaga solo al vencer BUZZER_HOLD
+        if estado:
+            self.timers.arm('buzzer', self.config.get('BUZZER_HOLD', 10.0), self._apagar_buzzer_automatico)
         else:
-            # En modo testing, solo mostrar estado
-            print(f"🔔 Buzzer: {'ON' if estado else 'OFF'} (modo simulado, automático)")
+            self.timers.cancel('buzzer')
+        
+        # El registro sombra solo escribe el pin cuando el estado cambia
+        if self.outputs.set('buzzer', estado):
+            simulado = "" if self.mode == 'real' else "modo simulado, "
+            print(f"🔔 Buzzer: {'ON' if estado else 'OFF'} ({simulado}automático)")
 
     def controlar_motor(self, estado):
         """Función igual que en allin_w_display.py"""
-        if self.mode == 'real':
-            self.GPIO.output(self.config['MOTOR_PIN'], self.GPIO.HIGH if estado else self.GPIO.LOW)
-        else:
+        if self.outputs.set('motor', estado) and self.mode != 'real':
             # En modo testing, solo mostrar estado
             print(f"🔧 Motor: {'ON' if estado else 'OFF'} (modo simulado)")
 
     # ============== FUNCIONES DE LECTURA ADAPTADAS ==============
 
-    def read_all_sensors(self) -> Dict[str, Any]:
+    def read_all_sensors(self, reading: Optional[SensorReading] = None) -> SensorReading:
         """
         Lee todos los sensores usando las funciones exactas de allin_w_display.py
-        """
-        # Gestionar LEDs activos (apagar después de 5 segundos)
-        self.gestionar_leds()
         
-        # Debug: Mostrar estado de sensores habilitados
+        Args:
+            reading: registro a rellenar; por defecto el registro propio del gestor, que se
+                     reutiliza y sobrescribe en cada llamada (usar reading.copy() para conservarlo)
+        """
+        # Debug: resumen de salud de las fuentes (cada HEALTH['LOG_INTERVAL'] segundos)
         if hasattr(self, '_last_sensors_status_print'):
-            if time.time() - self._last_sensors_status_print > 10:  # Cada 10 segundos
-                enabled_sensors = [k for k, v in self.sensors_enabled.items() if v]
-                disabled_sensors = [k for k, v in self.sensors_enabled.items() if not v]
-                print(f"📊 [Sensores] Habilitados: {enabled_sensors}")
-                if disabled_sensors:
-                    print(f"📊 [Sensores] Deshabilitados: {disabled_sensors}")
+            if time.time() - self._last_sensors_status_print > self.config.get('HEALTH', {}).get('LOG_INTERVAL', 10):
+                self._imprimir_salud()
                 self._last_sensors_status_print = time.time()
         else:
             self._last_sensors_status_print = time.time()
         
-        # Leer sensores verificando si están habilitados
-        temp, hum = self.leer_dht11() if self.is_sensor_enabled('temperature') or self.is_sensor_enabled('humidity') else (None, None)
-        distancia = self.leer_ultrasonico() if self.is_sensor_enabled('distance') else None
-        voltaje_ldr = self.leer_ldr() if self.is_sensor_enabled('light') else None
+        # Obtener lecturas crudas (del snapshot concurrente o leyendo en este momento)
+        raw, ages, samples = self._acquire_raw()
+        
+        lectura_dht = raw['dht11']
+        if lectura_dht is not None and lectura_dht.stale and lectura_dht.temperature is not None:
+            self.health.record_stale('dht11')
+        if lectura_dht is not None:
+            temp, hum = lectura_dht.temperature, lectura_dht.humidity
+            # Las lecturas repetidas de la caché no vuelven a entrar a los filtros
+            if lectura_dht.timestamp != self._last_dht_filtered:
+                self._last_dht_filtered = lectura_dht.timestamp
+                self._dht_filtered = (self.filters.update('temperature', temp),
+                                      self.filters.update('humidity', hum))
+            temp, hum = self._dht_filtered
+        else:
+            temp, hum = None, None
+        distancia = self._filtrar('distance', 'ultrasonic', raw, samples)
+        voltaje_ldr = self._filtrar('light', 'ldr', raw, samples)
         
         # Calcular lux igual que allin_w_display.py
         if voltaje_ldr is not None:
@@ -363,9 +710,9 @@ class SensorManager:
         else:
             lux = None
             
-        voltaje_mq135 = self.leer_mq135() if self.is_sensor_enabled('air_quality') else None
-        ppm = round((voltaje_mq135 / 3.3) * 1000) if voltaje_mq135 else 0
-        presion = self.leer_presion() if self.is_sensor_enabled('pressure') else None
+        voltaje_mq135 = self._filtrar('air_quality', 'mq135', raw, samples)
+        ppm = self.calcular_ppm(voltaje_mq135)
+        presion = self._filtrar('pressure', 'bmp180', raw, samples)
 
         # Determinar si hay luz basándose en voltaje del LDR (EXACTO de allin_w_display.py)
         if voltaje_ldr is not None:
@@ -375,7 +722,7 @@ class SensorManager:
             hay_luz = False
             no_hay_luz = False
         
-        aire_malo = ppm > 400
+        aire_malo = ppm > self.thresholds['AIR_QUALITY']['BAD_AIR_THRESHOLD']
 
         # Determinar el estado del buzzer
         if self.manual_buzzer_control:
@@ -383,23 +730,283 @@ class SensorManager:
         else:
             buzzer_state = aire_malo  # Automático: se activa cuando el aire es malo
 
-        return {
-            'temperature': temp,
-            'humidity': hum,
-            'distance': distancia,
-            'light': hay_luz,
-            'light_lux': lux,
-            'light_voltage': voltaje_ldr,
-            'air_quality_bad': aire_malo,
-            'air_quality_ppm': ppm,
-            'air_quality_voltage': voltaje_mq135,
-            'pressure': presion,
-            'no_hay_luz': no_hay_luz,  # Variable adicional para alertas
-            'mode': self.mode,
-            'timestamp': time.time(),
-            'buzzer_state': buzzer_state,
-            'buzzer_manual_control': self.manual_buzzer_control
+        r = self.reading if reading is None else reading
+        r.temperature = temp
+        r.humidity = hum
+        r.dht11_timestamp = lectura_dht.timestamp if lectura_dht else None
+        r.dht11_age = lectura_dht.age if lectura_dht else None
+        r.dht11_stale = lectura_dht.stale if lectura_dht else None
+        r.dht11_from_cache = lectura_dht.from_cache if lectura_dht else None
+        r.distance = distancia
+        r.distance_spread = self.distance_spread if distancia is not None else None
+        r.light = hay_luz
+        r.light_lux = lux
+        r.light_voltage = voltaje_ldr
+        r.air_quality_bad = aire_malo
+        r.air_quality_ppm = ppm
+        r.air_quality_voltage = voltaje_mq135
+        r.pressure = presion
+        r.no_hay_luz = no_hay_luz  # Variable adicional para alertas
+        r.mode = self.mode
+        r.timestamp = time.time()
+        r.buzzer_state = buzzer_state
+        r.buzzer_manual_control = self.manual_buzzer_control
+        r.acquisition_mode = self.acquisition_mode
+        r.reading_age = ages
+        r.sample_rates = self.get_sample_rates()
+        r.read_timeouts = [source for source in self.watchdog.timed_out() if self._is_source_enabled(source)]
+        r.motor_state = None  # Lo asigna el loop principal
+        return r
+
+    def _filtrar(self, sensor: str, source: str, raw: Dict[str, Any],
+                 samples: Optional[Dict[str, int]]) -> Optional[float]:
+        """
+        Pasa a los filtros solo las muestras nuevas de una fuente
+        
+        En modo concurrente, planificado o adaptativo el snapshot repite la última muestra
+        hasta la siguiente lectura del sensor; volver a filtrarla llenaría la ventana de la
+        mediana y de Hampel con el mismo valor (un pico retenido terminaría aceptado).
+        Una muestra repetida devuelve el valor ya filtrado.
+        
+        Args:
+            samples: identificador de muestra por fuente; None si cada valor es una lectura nueva
+        """
+        value = raw[source]
+        if value is None:
+            return None
+        sample = samples.get(source) if samples is not None else None
+        if sample is not None:
+            cached = self._filtered.get(source)
+            if cached is not None and cached[0] == sample:
+                return cached[1]
+        filtered = self.filters.update(sensor, value)
+        if sample is not None:
+            self._filtered[source] = (sample, filtered)
+        return filtered
+
+    # ============== ADQUISICIÓN DE LECTURAS CRUDAS ==============
+
+    def _imprimir_salud(self):
+        """Una línea por fuente con problemas y la lista de sensores deshabilitados"""
+        for source, health in self.health.get_health().items():
+            if health['status'] in ('degraded', 'failing'):
+                print(f"📊 [Sensores] {source}: {health['status']} - {health['failure_rate']:.0%} sin éxito, "
+                      f"{health['timeouts']} timeouts, p95 {health['p95_ms']} ms")
+        disabled_sensors = [k for k, v in self.sensors_enabled.items() if not v]
+        if disabled_sensors:
+            print(f"📊 [Sensores] Deshabilitados: {disabled_sensors}")
+
+    def _read_source(self, source: str):
+        """
+        Lee una fuente de SENSOR_SOURCES respetando su plazo
+        
+        El DHT11 aplica el plazo dentro de su caché, que devuelve la última lectura válida.
+        """
+        if source == 'dht11':
+            return self.dht_cache.read()
+        if source not in SENSOR_SOURCES:
+            raise ValueError(f"Fuente de sensor desconocida: {source}")
+        return self.watchdog.call(source, lambda: self._read_device(source))
+
+    def _read_device(self, source: str):
+        """Realiza la lectura física de una fuente (se ejecuta en un hilo del watchdog)"""
+        if source == 'ultrasonic':
+            return self.leer_ultrasonico()
+        if source == 'ldr':
+            return self.leer_ldr()
+        if source == 'mq135':
+            return self.leer_mq135()
+        if source == 'bmp180':
+            return self.leer_presion()
+        raise ValueError(f"Fuente de sensor desconocida: {source}")
+
+    def _is_source_enabled(self, source: str) -> bool:
+        """Una fuente se lee si alguno de sus sensores lógicos está habilitado"""
+        return any(self.is_sensor_enabled(sensor) for sensor in SENSOR_SOURCES[source])
+
+    def _acquire_raw(self) -> Tuple[Dict[str, Any], Dict[str, Optional[float]], Optional[Dict[str, int]]]:
+        """
+        Obtiene la lectura cruda de cada fuente, su antigüedad en segundos y su identificador de muestra
+        
+        En modo concurrente o planificado no bloquea: devuelve el último valor de cada fuente
+        (el identificador de muestra solo cambia con una lectura nueva). En modo secuencial
+        y replay cada valor es una lectura nueva y no hay identificadores (None).
+        En modo replay espera al siguiente cuadro de la grabación.
+        """
+        if self.mode == 'replay':
+            raw, ages = self._acquire_replay()
+            return raw, ages, None
+        
+        if self.acquisition is not None:
+            values, snapshot_ages, samples = self.acquisition.snapshot.read_samples()
+            raw = {}
+            ages = {}
+            for source in SENSOR_SOURCES:
+                enabled = self._is_source_enabled(source)
+                raw[source] = values.get(source) if enabled else None
+                age = snapshot_ages.get(source) if enabled else None
+                ages[source] = round(age, 3) if age is not None else None
+                if age is not None and source != 'dht11' and age > self.stale_factor * self.sample_intervals[source]:
+                    self.health.record_stale(source)
+            return raw, ages, samples
+        
+        # Secuencial: todas las fuentes en paralelo en el pool del watchdog, de modo que el
+        # ciclo dura a lo sumo el mayor plazo aunque un bus se cuelgue
+        raw = {source: None for source in SENSOR_SOURCES}
+        ages = {source: None for source in SENSOR_SOURCES}
+        enabled = [source for source in SENSOR_SOURCES if self._is_source_enabled(source)]
+        handles = {
+            source: self.watchdog.submit(source, lambda s=source: self._read_device(s))
+            for source in enabled if source != 'dht11'
         }
+        if 'dht11' in enabled:
+            raw['dht11'] = self.dht_cache.read()  # Su consulta al sensor también va al pool
+            ages['dht11'] = 0.0
+        for source, handle in handles.items():
+            raw[source] = self.watchdog.collect(source, handle)
+            if self.watchdog.last_status.get(source) == 'ok':
+                ages[source] = 0.0
+        return raw, ages, None
+
+    def _acquire_replay(self) -> Tuple[Dict[str, Any], Dict[str, Optional[float]]]:
+        """Convierte el siguiente cuadro grabado en lecturas crudas por fuente"""
+        frame = self.replay.next_frame()
+        if frame is None:
+            self.replay_finished = True
+            return {source: None for source in SENSOR_SOURCES}, {source: None for source in SENSOR_SOURCES}
+        
+        frame_ts, values = frame
+        temp = values.get('temperature')
+        hum = values.get('humidity')
+        lux = values.get('light_lux')
+        ppm = values.get('air_quality_ppm')
+        
+        raw = {
+            'dht11': DHTReading(temp, hum, frame_ts, 0.0, False, False) if temp is not None or hum is not None else None,
+            'ultrasonic': values.get('distance'),
+            # Voltajes reconstruidos con la inversa de las curvas de calibración
+            'ldr': self.calibration.voltage_from_lux(lux) if lux is not None else None,
+            'mq135': self.calibration.voltage_from_ppm(ppm) if ppm is not None else None,
+            'bmp180': values.get('pressure'),
+        }
+        ages = {}
+        for source in SENSOR_SOURCES:
+            if not self._is_source_enabled(source):
+                raw[source] = None
+            ages[source] = 0.0 if raw[source] is not None else None
+        return raw, ages
+
+    def _source_readers(self) -> Dict[str, Any]:
+        """Funciones de lectura por fuente para los hilos de adquisición"""
+        return {source: (lambda s=source: self._read_source(s)) for source in SENSOR_SOURCES}
+
+    def start_concurrent_acquisition(self):
+        """Inicia la lectura concurrente: un hilo por sensor escribiendo en un snapshot compartido"""
+        self.stop_acquisition()
+        self.acquisition = ConcurrentAcquisition(
+            readers=self._source_readers(),
+            intervals=self.sample_intervals,
+            is_enabled=self._is_source_enabled
+        )
+        self.acquisition.start()
+        self.acquisition_mode = 'concurrent'
+
+    def start_scheduled_acquisition(self):
+        """Inicia la lectura multi-frecuencia: cada sensor se lee con su propio intervalo"""
+        self.stop_acquisition()
+        self.acquisition = SensorScheduler(
+            readers=self._source_readers(),
+            intervals=self.sample_intervals,
+            is_enabled=self._is_source_enabled
+        )
+        self.acquisition.start()
+        self.acquisition_mode = 'scheduled'
+
+    def start_adaptive_acquisition(self):
+        """Inicia la lectura adaptativa: cada fuente acelera al cambiar y desacelera al estabilizarse"""
+        self.stop_acquisition()
+        for source in self.adaptive.controllers:
+            self.adaptive.reset(source)
+            self.sample_intervals[source] = self.adaptive.controllers[source].interval
+        self.acquisition = SensorScheduler(
+            readers=self._source_readers(),
+            intervals=self.sample_intervals,
+            is_enabled=self._is_source_enabled,
+            adapt=self._adaptar_intervalo
+        )
+        self.acquisition.start()
+        self.acquisition_mode = 'adaptive'
+
+    def _adaptar_intervalo(self, source: str, value: Any) -> Optional[float]:
+        """Nuevo intervalo de una fuente tras su lectura (hilo del planificador)"""
+        interval = self.adaptive.update(source, value)
+        if interval is not None:
+            self.sample_intervals[source] = interval
+        return interval
+
+    def get_sample_rates(self) -> Optional[Dict[str, float]]:
+        """Frecuencia de muestreo vigente (Hz) por fuente; None en modo secuencial (la marca el loop)"""
+        if self.acquisition is None:
+            return None
+        return {source: round(1.0 / interval, 3) for source, interval in self.sample_intervals.items()}
+
+    def stop_acquisition(self):
+        """Detiene la lectura en segundo plano y vuelve a la lectura secuencial"""
+        if self.acquisition is not None:
+            self.acquisition.stop()
+            self.acquisition = None
+        self.acquisition_mode = 'sequential'
+
+    def resolve_source(self, name: str) -> Optional[str]:
+        """Acepta el nombre de una fuente ('mq135') o de un sensor lógico ('air_quality')"""
+        if name in SENSOR_SOURCES:
+            return name
+        for source, sensors in SENSOR_SOURCES.items():
+            if name in sensors:
+                return source
+        return None
+
+    def set_sample_interval(self, name: str, interval: float) -> bool:
+        """
+        Cambia el intervalo de muestreo de un sensor en tiempo de ejecución
+        
+        Args:
+            name: fuente ('dht11', 'mq135', ...) o sensor lógico ('temperature', ...)
+            interval: nuevo intervalo en segundos
+            
+        Returns:
+            bool: True si se aplicó el cambio
+        """
+        source = self.resolve_source(name)
+        if source is None:
+            print(f"❌ Sensor desconocido para intervalo: {name}")
+            return False
+        
+        try:
+            interval = float(interval)
+        except (TypeError, ValueError):
+            print(f"❌ Intervalo inválido para {name}: {interval}")
+            return False
+        
+        min_interval = self.config.get('MIN_SAMPLE_INTERVAL', 0.05)
+        if interval < min_interval:
+            print(f"❌ Intervalo {interval}s menor que el mínimo permitido ({min_interval}s)")
+            return False
+        
+        controller = self.adaptive.controllers.get(source)
+        if self.acquisition_mode == 'adaptive' and controller is not None:
+            # En modo adaptativo el valor es el punto de partida; luego sigue a la señal
+            interval = min(max(interval, controller.min_interval), controller.max_interval)
+            controller.interval = interval
+        self.sample_intervals[source] = interval
+        if self.acquisition is not None:
+            self.acquisition.set_interval(source, interval)
+        print(f"⏱️  Intervalo de {source}: {interval}s")
+        return True
+
+    def get_sample_intervals(self) -> Dict[str, float]:
+        """Obtiene los intervalos de muestreo actuales por fuente"""
+        return self.sample_intervals.copy()
 
     # ============== FUNCIONES SIMULADAS ==============
 
@@ -407,6 +1014,10 @@ class SensorManager:
         """Habilita o deshabilita un sensor"""
         if sensor_type in self.sensors_enabled:
             self.sensors_enabled[sensor_type] = enabled
+            if enabled:
+                self.filters.reset(sensor_type)  # No mezclar muestras viejas con las nuevas
+                self._filtered.pop(self.resolve_source(sensor_type), None)
+                self.adaptive.reset(self.resolve_source(sensor_type))
             status = "habilitado" if enabled else "deshabilitado"
             print(f"📊 Sensor {sensor_type}: {status}")
             return True
@@ -425,15 +1036,8 @@ class SensorManager:
         if not self.is_sensor_enabled('temperature') or not self.is_sensor_enabled('humidity'):
             return None, None
         
-        temp = round(random.uniform(
-            self.simulation_ranges['TEMPERATURE']['min'],
-            self.simulation_ranges['TEMPERATURE']['max']
-        ), 1)
-        
-        humidity = round(random.uniform(
-            self.simulation_ranges['HUMIDITY']['min'],
-            self.simulation_ranges['HUMIDITY']['max']
-        ), 1)
+        temp = round(self._simulated_value('temperature', 'TEMPERATURE'), 1)
+        humidity = round(self._simulated_value('humidity', 'HUMIDITY'), 1)
         
         return temp, humidity
 
@@ -442,33 +1046,30 @@ class SensorManager:
         if not self.is_sensor_enabled('distance'):
             return 0.0
         
-        return round(random.uniform(
-            self.simulation_ranges['DISTANCE']['min'],
-            self.simulation_ranges['DISTANCE']['max']
-        ), 2)
+        return round(self._simulated_value('distance', 'DISTANCE'), 2)
 
     def _read_bmp180_simulated(self) -> float:
         """Simula lectura de presión BMP180"""
         if not self.is_sensor_enabled('pressure'):
             return None
         
-        return round(random.uniform(
-            self.simulation_ranges['PRESSURE']['min'],
-            self.simulation_ranges['PRESSURE']['max']
-        ), 1)
+        return round(self._simulated_value('pressure', 'PRESSURE'), 1)
 
     def cleanup(self):
         """Limpia recursos del sensor manager"""
+        self.stop_acquisition()
+        self.watchdog.shutdown()
+        self.timers.stop()
+        self.led_patterns.shutdown()
+        
+        if self.replay is not None:
+            self.replay.close()
+        
         if self.mode == 'real':
+            self._liberar_dht11()
             try:
-                # Apagar todos los LEDs activos
-                for gpio_led in self.leds_activos:
-                    self.GPIO.output(gpio_led, self.GPIO.LOW)
-                self.leds_activos.clear()
-                
-                # Apagar otros componentes
-                self.GPIO.output(self.config['BUZZER_PIN'], self.GPIO.HIGH)  # Apagar buzzer
-                self.GPIO.output(self.config['MOTOR_PIN'], self.GPIO.LOW)    # Apagar motor
+                # Apagar LEDs, buzzer y motor en una sola escritura
+                self.outputs.all_off()
                 
                 self.GPIO.cleanup()
                 print("✅ Recursos GPIO limpiados correctamente")
@@ -483,10 +1084,24 @@ class SensorManager:
         status = "MANUAL" if enabled else "AUTOMÁTICO"
         print(f"🔧 Control de LEDs: {status}")
         
+        if enabled:
+            # El modo manual toma los LEDs: cancelar apagados pendientes de alertas automáticas
+            self.timers.cancel_where(lambda key: isinstance(key, tuple) and key[0] == 'led')
+            self._restaurar_leds_manuales()
+        
         if not enabled:
+            self.led_patterns.stop()
             # Al deshabilitar control manual, apagar todos los LEDs manuales
             self.turn_off_all_manual_leds()
     
+    def _restaurar_leds_manuales(self):
+        """Lleva los pines de los LEDs a los estados manuales (p. ej. al terminar un patrón)"""
+        pines = {}
+        for led_type, state in self.manual_led_states.items():
+            pin = self.outputs.pin(f'led_{led_type}')
+            pines[pin] = pines.get(pin, False) or state  # 'pressure' comparte pin
+        self.outputs.set_many(pines)
+    
     def is_manual_led_control(self) -> bool:
         """Verifica si el control de LEDs está en modo manual"""
         return self.manual_led_control
@@ -506,32 +1121,28 @@ class SensorManager:
             print(f"❌ Tipo de LED inválido: {led_type}")
             return False
         
-        # Mapeo de tipos de LED a pines GPIO
-        led_pin_map = {
-            'temperature': self.config['LED_TEMP'],    # LED Rojo
-            'humidity': self.config['LED_HUM'],        # LED Amarillo
-            'light': self.config['LED_LUZ'],           # LED Verde
-            'air_quality': self.config['LED_AIRE'],    # LED Azul
-            'pressure': self.config['LED_AIRE']        # LED Azul (compartido con air_quality)
-        }
+        # Salida del LED ('pressure' comparte el LED azul de air_quality)
+        output = f'led_{led_type}'
         
-        pin = led_pin_map[led_type]
+        # Un control individual reemplaza al patrón animado en curso
+        if self.led_patterns.is_playing():
+            self.led_patterns.stop()
+            self._restaurar_leds_manuales()
         
         # Actualizar estado interno
         self.manual_led_states[led_type] = state
         
+        try:
+            self.outputs.set(output, state)
+        except Exception as e:
+            print(f"❌ Error controlando LED {led_type}: {e}")
+            return False
         if self.mode == 'real':
-            try:
-                self.GPIO.output(pin, self.GPIO.HIGH if state else self.GPIO.LOW)
-                print(f"💡 LED {led_type}: {'ON' if state else 'OFF'} (pin {pin})")
-                return True
-            except Exception as e:
-                print(f"❌ Error controlando LED {led_type}: {e}")
-                return False
+            print(f"💡 LED {led_type}: {'ON' if state else 'OFF'} (pin {self.outputs.pin(output)})")
         else:
             # En modo testing, solo mostrar estado
             print(f"💡 LED {led_type}: {'ON' if state else 'OFF'} (modo simulado)")
-            return True
+        return True
     
     def toggle_led(self, led_type: str) -> bool:
         """
@@ -555,23 +1166,57 @@ class SensorManager:
     
     def turn_off_all_manual_leds(self):
         """Apaga todos los LEDs en modo manual"""
-        for led_type in self.manual_led_states.keys():
-            self.set_led_state(led_type, False)
+        with self.outputs.batch():
+            for led_type in self.manual_led_states.keys():
+                self.set_led_state(led_type, False)
         print("🔴 Todos los LEDs manuales apagados")
     
     def turn_on_all_manual_leds(self):
         """Enciende todos los LEDs en modo manual"""
-        for led_type in self.manual_led_states.keys():
-            self.set_led_state(led_type, True)
+        with self.outputs.batch():
+            for led_type in self.manual_led_states.keys():
+                self.set_led_state(led_type, True)
         print("🔴 Todos los LEDs manuales encendidos")
     
-    def set_led_pattern(self, pattern: str):
+    def set_led_pattern(self, pattern: str, options: Optional[Dict[str, Any]] = None) -> bool:
         """
         Establece un patrón específico de LEDs
         
         Args:
-            pattern: 'all_on', 'all_off', 'alternate', 'sequence'
+            pattern: estáticos 'all_on', 'all_off', 'alternate'; animados 'chase'
+                     ('sequence'), 'blink', 'breathe', 'strobe'; o el nombre de un patrón
+                     definido con una tabla de cuadros
+            options: opciones del comando ('hz', 'period', 'interval', 'repeat') o una tabla
+                     'frames' que define (o redefine) el patrón con ese nombre
+        
+        Returns:
+            bool: True si el patrón se aplicó
         """
+        options = options or {}
+        engine = self.led_patterns
+        try:
+            if 'frames' in options:
+                engine.define(pattern, options)
+            if pattern in engine.patterns:
+                spec = engine.patterns[pattern]
+                frames, repeat = engine.parse_frames(spec), spec.get('repeat')
+            else:
+                frames, repeat = engine.builtin(pattern, options), options.get('repeat')
+        except (TypeError, ValueError) as e:
+            print(f"❌ Patrón {pattern} inválido: {e}")
+            return False
+        
+        if frames is not None:
+            engine.play(pattern, frames, int(repeat) if repeat else None)
+            print(f"🎞️  Patrón animado '{pattern}' activado ({len(frames)} cuadros)")
+            return True
+        
+        engine.stop()
+        with self.outputs.batch():
+            return self._apply_led_pattern(pattern)
+
+    def _apply_led_pattern(self, pattern: str) -> bool:
+        """Aplica un patrón estático (dentro de un batch de salidas)"""
         if pattern == 'all_on':
             self.turn_on_all_manual_leds()
         elif pattern == 'all_off':
@@ -584,13 +1229,10 @@ class SensorManager:
             self.set_led_state('air_quality', False)
             self.set_led_state('pressure', False)
             print("🔄 Patrón alternado activado")
-        elif pattern == 'sequence':
-            # Secuencia: solo temperatura encendida
-            self.turn_off_all_manual_leds()
-            self.set_led_state('temperature', True)
-            print("📶 Patrón secuencial activado")
         else:
             print(f"❌ Patrón desconocido: {pattern}")
+            return False
+        return True
 
     # ============== FUNCIONES DE COMPATIBILIDAD (para mantener API existente) ==============
 
@@ -615,8 +1257,8 @@ class SensorManager:
     def read_air_quality(self) -> Tuple[bool, int, float]:
         """Función de compatibilidad"""
         voltaje_mq135 = self.leer_mq135()
-        ppm = round((voltaje_mq135 / 3.3) * 1000) if voltaje_mq135 else 0
-        aire_malo = ppm > 400
+        ppm = self.calcular_ppm(voltaje_mq135)
+        aire_malo = ppm > self.thresholds['AIR_QUALITY']['BAD_AIR_THRESHOLD']
         return aire_malo, ppm, voltaje_mq135
 
     def read_pressure(self) -> float:
@@ -639,6 +1281,9 @@ class SensorManager:
         status = "MANUAL" if enabled else "AUTOMÁTICO"
         print(f"🔧 Control del Buzzer: {status}")
         
+        if enabled:
+            self.timers.cancel('buzzer')  # El apagado automático no aplica en modo manual
+        
         if not enabled:
             # Al deshabilitar control manual, apagar el buzzer
             self.set_buzzer_state(False)
@@ -658,12 +1303,13 @@ class SensorManager:
         
         if self.mode == 'real':
             try:
-                # El buzzer es activo bajo, así que invertimos la lógica
-                self.GPIO.output(self.config['BUZZER_PIN'], self.GPIO.LOW if state else self.GPIO.HIGH)
+                # El buzzer es activo bajo: GPIOOutputs invierte el nivel
+                self.outputs.set('buzzer', state)
                 print(f"🔔 Buzzer: {'ON' if state else 'OFF'} (manual)")
             except Exception as e:
                 print(f"❌ Error controlando buzzer: {e}")
         else:
+            self.outputs.set('buzzer', state)
             # En modo testing, solo mostrar estado
             print(f"🔔 Buzzer: {'ON' if state else 'OFF'} (modo simulado, manual)")
     
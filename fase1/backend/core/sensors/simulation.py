@@ -0,0 +1,176 @@
+"""
+Motor de simulación realista del Sistema SIEPA (modo testing)
+Genera con NumPy bloques de series de tiempo correlacionadas para uno o miles de
+dispositivos virtuales: paseo aleatorio con reversión a la media, ciclo diario,
+correlación entre sensores y eventos de contaminación inyectados
+"""
+
+import threading
+import time
+from typing import Dict, Optional
+
+from config import SIMULATION_RANGES, SIMULATION_CONFIG
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    np = None
+
+# Orden de los canales en los bloques generados
+CHANNELS = ('temperature', 'humidity', 'distance', 'light', 'air_quality', 'pressure')
+_RANGE_KEYS = ('TEMPERATURE', 'HUMIDITY', 'DISTANCE', 'LIGHT', 'AIR_QUALITY', 'PRESSURE')
+
+# Forma del ciclo diario por canal: (amplitud relativa, hora del máximo, periodo en horas)
+_DAILY_SHAPE = {
+    'temperature': (1.0, 15, 24),
+    'humidity': (1.0, 5, 24),      # Máxima de madrugada: opuesta a la temperatura
+    'distance': (0.0, 0, 24),
+    'light': (4.0, 13, 24),        # Se recorta a 0 durante la noche
+    'air_quality': (0.5, 18, 24),  # Hora pico de la tarde
+    'pressure': (0.3, 10, 12),     # Marea barométrica semidiurna
+}
+
+# Límites físicos de cada canal
+_LIMITS = {
+    'temperature': (-10.0, 50.0),
+    'humidity': (0.0, 100.0),
+    'distance': (2.0, 400.0),
+    'light': (0.0, 2000.0),
+    'air_quality': (0.0, 5000.0),
+    'pressure': (300.0, 1100.0),
+}
+
+
+class SimulationEngine:
+    """Generador vectorizado de lecturas simuladas correlacionadas"""
+
+    def __init__(self, n_devices: int = 1,
+                 seed: Optional[int] = None,
+                 config: Dict = None,
+                 ranges: Dict = None,
+                 start_time: Optional[float] = None):
+        """
+        Args:
+            n_devices: número de dispositivos virtuales por bloque
+            seed: semilla del generador (reproducible); None usa SIMULATION_CONFIG['SEED']
+            config: parámetros del modelo (por defecto SIMULATION_CONFIG)
+            ranges: rangos de cada sensor (por defecto SIMULATION_RANGES)
+            start_time: instante (time.time()) del primer paso de la serie
+        """
+        if not NUMPY_AVAILABLE:
+            raise ImportError("NumPy no disponible. Instale numpy o use SIMULATION_CONFIG['ENGINE'] = 'uniform'")
+
+        self.config = config or SIMULATION_CONFIG
+        ranges = ranges or SIMULATION_RANGES
+        self.n_devices = n_devices
+        self.block_size = int(self.config.get('BLOCK_SIZE', 256))
+        self.dt = float(self.config.get('TIME_STEP', 1.0))
+        self.rng = np.random.default_rng(seed if seed is not None else self.config.get('SEED'))
+        self.start_time = start_time if start_time is not None else time.time()
+
+        n_channels = len(CHANNELS)
+        lows = np.array([ranges[k]['min'] for k in _RANGE_KEYS], dtype=float)
+        highs = np.array([ranges[k]['max'] for k in _RANGE_KEYS], dtype=float)
+        span = highs - lows
+
+        # Media y amplitud del ciclo diario derivadas de SIMULATION_RANGES
+        self.mean = (lows + highs) / 2
+        shapes = [_DAILY_SHAPE[c] for c in CHANNELS]
+        self.daily_amplitude = np.array([s[0] for s in shapes]) * span / 4
+        self.daily_peak_hour = np.array([s[1] for s in shapes], dtype=float)
+        self.daily_period = np.array([s[2] for s in shapes], dtype=float) * 3600
+        self.light_index = CHANNELS.index('light')
+        self.air_index = CHANNELS.index('air_quality')
+        # La luz varía entre 0 y el máximo: centrar el ciclo en el mínimo del rango
+        self.mean[self.light_index] = lows[self.light_index]
+
+        # Paseo aleatorio AR(1): desviación estacionaria = span / 8
+        self.phi = float(self.config.get('WALK_PERSISTENCE', 0.98))
+        self.sigma = (span / 8) * np.sqrt(1 - self.phi ** 2)
+
+        # Ruido correlacionado entre canales vía factor de Cholesky
+        corr = np.eye(n_channels)
+        for (a, b), value in self.config.get('CORRELATIONS', {}).items():
+            i, j = CHANNELS.index(a), CHANNELS.index(b)
+            corr[i, j] = corr[j, i] = value
+        self.cholesky = np.linalg.cholesky(corr)
+
+        # Eventos de contaminación: inicio Poisson, caída exponencial
+        self.event_probability = float(self.config.get('POLLUTION_EVENT_RATE', 0.0)) * self.dt
+        self.event_ppm = float(self.config.get('POLLUTION_EVENT_PPM', 500))
+        self.event_decay = float(np.exp(-self.dt / float(self.config.get('POLLUTION_EVENT_DECAY', 120))))
+
+        self.lower = np.array([_LIMITS[c][0] for c in CHANNELS])
+        self.upper = np.array([_LIMITS[c][1] for c in CHANNELS])
+
+        # Estado entre bloques
+        self._walk = self.rng.standard_normal((n_devices, n_channels)) * (span / 8)
+        self._events = np.zeros(n_devices)
+        self._next_step = 0
+        self.block_time = self.start_time  # Instante del primer paso del último bloque generado
+
+        # Bloque actual para consultas por tiempo (sample)
+        self._lock = threading.Lock()
+        self._block = None
+        self._block_start = 0
+
+    def generate_block(self) -> 'np.ndarray':
+        """
+        Genera el siguiente bloque de la serie
+
+        Returns:
+            array (block_size, n_devices, len(CHANNELS)) con las lecturas de cada paso
+        """
+        steps = self.block_size
+        n_channels = len(CHANNELS)
+
+        # Ruido correlacionado para todo el bloque de una sola vez
+        noise = self.rng.standard_normal((steps, self.n_devices, n_channels)) @ self.cholesky.T
+        noise *= self.sigma
+        event_starts = self.rng.random((steps, self.n_devices)) < self.event_probability
+        event_sizes = self.rng.exponential(self.event_ppm, (steps, self.n_devices))
+
+        walk = np.empty((steps, self.n_devices, n_channels))
+        events = np.empty((steps, self.n_devices))
+        state = self._walk
+        level = self._events
+        for k in range(steps):
+            state = self.phi * state + noise[k]
+            level = level * self.event_decay + np.where(event_starts[k], event_sizes[k], 0.0)
+            walk[k] = state
+            events[k] = level
+        self._walk = state
+        self._events = level
+
+        # Ciclo diario (hora local) para cada paso del bloque
+        self.block_time = self.start_time + self._next_step * self.dt
+        t = self.block_time + np.arange(steps) * self.dt
+        local_seconds = t - time.timezone
+        phase = 2 * np.pi * (local_seconds[:, None] - self.daily_peak_hour * 3600) / self.daily_period
+        daily = self.daily_amplitude * np.cos(phase)
+        daily[:, self.light_index] = np.maximum(daily[:, self.light_index], 0)
+
+        block = self.mean + daily[:, None, :] + walk
+        block[:, :, self.air_index] += events
+        np.clip(block, self.lower, self.upper, out=block)
+
+        self._next_step += steps
+        return block
+
+    def sample(self, device: int = 0, now: Optional[float] = None) -> Dict[str, float]:
+        """
+        Lectura de un dispositivo en el instante indicado
+
+        La serie avanza con el reloj, por lo que sensores leídos a distintas frecuencias
+        ven valores coherentes entre sí.
+        """
+        now = time.time() if now is None else now
+        step = max(0, int((now - self.start_time) / self.dt))
+        with self._lock:
+            while self._block is None or step >= self._block_start + self.block_size:
+                self._block_start = self._next_step
+                self._block = self.generate_block()
+            row = self._block[max(0, step - self._block_start), device]
+        return dict(zip(CHANNELS, row.tolist()))
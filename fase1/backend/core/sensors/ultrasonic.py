@@ -0,0 +1,128 @@
+"""
+Medición del sensor ultrasónico HC-SR04 del Sistema SIEPA
+Usa detección de flancos por interrupción (GPIO.add_event_detect) con marcas de tiempo
+monotónicas, de modo que la CPU no queda ocupada esperando el eco y un eco perdido
+termina en timeout en lugar de bloquear el sistema
+"""
+
+import statistics
+import threading
+import time
+from typing import List, Optional, Tuple
+
+SPEED_OF_SOUND_CM_S = 34300  # Velocidad del sonido (cm/s) igual que allin_w_display.py
+
+
+class UltrasonicRanger:
+    """Medición de distancia del HC-SR04 con timeout y modo ráfaga"""
+
+    def __init__(self, gpio, trig_pin: int, echo_pin: int,
+                 timeout: float = 0.04, ping_interval: float = 0.06):
+        """
+        Args:
+            gpio: módulo RPi.GPIO ya configurado (pines en modo OUT/IN)
+            trig_pin: pin TRIG del sensor
+            echo_pin: pin ECHO del sensor
+            timeout: tiempo máximo de espera del eco completo (segundos)
+            ping_interval: separación mínima entre disparos en modo ráfaga (segundos)
+        """
+        self.gpio = gpio
+        self.trig_pin = trig_pin
+        self.echo_pin = echo_pin
+        self.timeout = timeout
+        self.ping_interval = ping_interval
+
+        self._lock = threading.Lock()
+        self._echo_done = threading.Event()
+        self._rise: Optional[float] = None
+        self._fall: Optional[float] = None
+        self.timeouts = 0
+
+        # Preferir interrupciones; si no están disponibles usar sondeo acotado por tiempo
+        try:
+            gpio.add_event_detect(echo_pin, gpio.BOTH, callback=self._on_edge)
+            self.interrupt_mode = True
+        except (RuntimeError, AttributeError) as e:
+            print(f"⚠️ HC-SR04: Detección de flancos no disponible ({e}), usando sondeo con timeout")
+            self.interrupt_mode = False
+
+    def _on_edge(self, channel):
+        """Callback de flanco en ECHO (hilo de RPi.GPIO)"""
+        now = time.monotonic()
+        if self.gpio.input(self.echo_pin):
+            self._rise = now
+        elif self._rise is not None:
+            self._fall = now
+            self._echo_done.set()
+
+    def _trigger(self):
+        """Pulso de 10 µs en TRIG"""
+        self.gpio.output(self.trig_pin, True)
+        time.sleep(0.00001)
+        self.gpio.output(self.trig_pin, False)
+
+    def _measure_echo_interrupt(self) -> Optional[float]:
+        """Duración del pulso ECHO usando interrupciones"""
+        self._rise = None
+        self._fall = None
+        self._echo_done.clear()
+        self._trigger()
+        if not self._echo_done.wait(self.timeout):
+            return None
+        return self._fall - self._rise
+
+    def _measure_echo_polling(self) -> Optional[float]:
+        """Duración del pulso ECHO por sondeo, acotada por un deadline"""
+        self._trigger()
+        deadline = time.monotonic() + self.timeout
+        start = time.monotonic()
+        while self.gpio.input(self.echo_pin) == 0:
+            start = time.monotonic()
+            if start > deadline:
+                return None
+        end = start
+        while self.gpio.input(self.echo_pin) == 1:
+            end = time.monotonic()
+            if end > deadline:
+                return None
+        return end - start
+
+    def measure(self) -> Optional[float]:
+        """
+        Realiza un disparo y devuelve la distancia en cm
+
+        Returns:
+            float: distancia en cm, o None si el eco no llegó antes del timeout
+        """
+        with self._lock:
+            if self.interrupt_mode:
+                duracion = self._measure_echo_interrupt()
+            else:
+                duracion = self._measure_echo_polling()
+
+        if duracion is None:
+            self.timeouts += 1
+            return None
+        return round((duracion * SPEED_OF_SOUND_CM_S) / 2, 2)
+
+    def measure_burst(self, count: int) -> Tuple[Optional[float], Optional[float]]:
+        """
+        Realiza una ráfaga de disparos y devuelve la mediana y su dispersión
+
+        Returns:
+            (mediana en cm, desviación absoluta mediana en cm); (None, None) si ningún eco llegó
+        """
+        distancias: List[float] = []
+        for i in range(count):
+            if i:
+                time.sleep(self.ping_interval)  # Dejar que se apaguen los ecos anteriores
+            distancia = self.measure()
+            if distancia is not None:
+                distancias.append(distancia)
+
+        if not distancias:
+            return None, None
+
+        mediana = statistics.median(distancias)
+        dispersion = statistics.median(abs(d - mediana) for d in distancias)
+        return round(mediana, 2), round(dispersion, 2)
@@ -0,0 +1,251 @@
+"""
+Watchdog de lecturas de dispositivos del Sistema SIEPA
+Cada lectura de hardware (I2C del BMP180, SPI del MCP3008, bit-banging del DHT11, eco del
+HC-SR04) se ejecuta en un pool pequeño de hilos con un plazo por fuente. Si el plazo vence
+la lectura se abandona y se reporta como timeout; mientras siga colgada no se vuelve a
+lanzar otra lectura de la misma fuente. Se guarda un histograma de latencia por fuente
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from typing import Any, Callable, Dict, List, Optional
+
+# Límites superiores (ms) de las cubetas del histograma de latencia
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+# Resultado de la última lectura de una fuente
+STATUS_OK = 'ok'
+STATUS_TIMEOUT = 'timeout'   # Excedió su plazo y se abandonó
+STATUS_BUSY = 'busy'         # La lectura anterior sigue colgada: no se lanzó otra
+STATUS_ERROR = 'error'       # La función de lectura lanzó una excepción
+
+
+class LatencyHistogram:
+    """Histograma de latencias con cubetas fijas"""
+
+    def __init__(self, buckets_ms=LATENCY_BUCKETS_MS):
+        self.buckets_ms = tuple(buckets_ms)
+        self.counts = [0] * (len(self.buckets_ms) + 1)  # Última cubeta: mayor al último límite
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        ms = seconds * 1000
+        index = len(self.buckets_ms)
+        for i, limit in enumerate(self.buckets_ms):
+            if ms <= limit:
+                index = i
+                break
+        self.counts[index] += 1
+        self.count += 1
+        self.total += ms
+        if ms > self.max:
+            self.max = ms
+
+    def merge(self, other: 'LatencyHistogram'):
+        """Suma otro histograma con las mismas cubetas"""
+        for i, n in enumerate(other.counts):
+            self.counts[i] += n
+        self.count += other.count
+        self.total += other.total
+        if other.max > self.max:
+            self.max = other.max
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Límite superior de la cubeta que contiene el percentil (None si no hay datos)"""
+        if not self.count:
+            return None
+        target = fraction * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= target:
+                limit = self.buckets_ms[i] if i < len(self.buckets_ms) else self.max
+                return round(min(limit, self.max), 1)
+        return round(self.max, 1)
+
+    def to_dict(self) -> Dict[str, Any]:
+        labels = [f"<={limit}" for limit in self.buckets_ms] + [f">{self.buckets_ms[-1]}"]
+        return {
+            'count': self.count,
+            'mean_ms': round(self.total / self.count, 2) if self.count else None,
+            'p50_ms': self.percentile(0.5),
+            'p95_ms': self.percentile(0.95),
+            'p99_ms': self.percentile(0.99),
+            'max_ms': round(self.max, 1),
+            'buckets_ms': {label: n for label, n in zip(labels, self.counts) if n},
+        }
+
+
+class _ReadFuture(Future):
+    """Future de una lectura con su duración real (segundos) al completarse"""
+    latency: Optional[float] = None
+
+
+class ReadWatchdog:
+    """Ejecuta lecturas de dispositivos con plazo en un pool de hilos"""
+
+    def __init__(self, deadlines: Dict[str, float], default_deadline: float = 1.0,
+                 workers: Optional[int] = None):
+        """
+        Args:
+            deadlines: fuente -> plazo máximo de una lectura (segundos)
+            default_deadline: plazo de las fuentes sin entrada en deadlines
+            workers: hilos del pool; por defecto uno por fuente más uno, de modo que una
+                     lectura colgada por fuente nunca agote el pool
+        """
+        self.deadlines = dict(deadlines)
+        self.default_deadline = default_deadline
+        self.workers = workers or len(self.deadlines) + 1
+
+        # Hilos daemon propios (no ThreadPoolExecutor): una lectura colgada no debe impedir
+        # que el proceso termine
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._threads = [
+            threading.Thread(target=self._worker, name=f'siepa-read-{i}', daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Any] = {}  # fuente -> future de una lectura abandonada
+        self.last_status: Dict[str, str] = {}
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._counters: Dict[str, Dict[str, int]] = {}
+
+        self.on_timeout: Optional[Callable[[str], None]] = None  # Callback al abandonar una lectura
+        # Callback por lectura recogida: (fuente, estado, valor, latencia en s o None)
+        self.on_result: Optional[Callable[[str, str, Any, Optional[float]], None]] = None
+
+    def deadline(self, source: str) -> float:
+        return self.deadlines.get(source, self.default_deadline)
+
+    def submit(self, source: str, reader: Callable[[], Any]):
+        """
+        Lanza la lectura de una fuente sin esperarla
+
+        Returns:
+            (future, plazo absoluto monotónico) o None si la lectura anterior sigue colgada
+        """
+        with self._lock:
+            pending = self._inflight.get(source)
+            if pending is not None and not pending.done():
+                # No se toca el bus mientras la lectura anterior no termine
+                self._count(source, STATUS_BUSY)
+                self.last_status[source] = STATUS_BUSY
+                busy = True
+            else:
+                busy = False
+                self._inflight.pop(source, None)
+        if busy:
+            self._notify(source, STATUS_BUSY, None, None)
+            return None
+
+        started = time.monotonic()
+        future = _ReadFuture()
+        self._queue.put((future, source, reader, started))
+        return future, started + self.deadline(source)
+
+    def collect(self, source: str, handle, default: Any = None) -> Any:
+        """Espera una lectura lanzada con submit hasta su plazo; default si no llegó a tiempo"""
+        if handle is None:
+            return default
+        future, deadline = handle
+        try:
+            value = future.result(timeout=max(0.0, deadline - time.monotonic()))
+        except FutureTimeout:
+            with self._lock:
+                self._inflight[source] = future
+                self._count(source, STATUS_TIMEOUT)
+                self.last_status[source] = STATUS_TIMEOUT
+            print(f"⏱️ [Watchdog] {source}: lectura abandonada tras {self.deadline(source)}s")
+            if self.on_timeout is not None:
+                self.on_timeout(source)
+            self._notify(source, STATUS_TIMEOUT, default, self.deadline(source))
+            return default
+        except Exception as e:
+            with self._lock:
+                self._count(source, STATUS_ERROR)
+                self.last_status[source] = STATUS_ERROR
+            print(f"⚠️ [Watchdog] {source}: error en la lectura - {e}")
+            self._notify(source, STATUS_ERROR, default, future.latency)
+            return default
+
+        with self._lock:
+            self._count(source, STATUS_OK)
+            self.last_status[source] = STATUS_OK
+        self._notify(source, STATUS_OK, value, future.latency)
+        return value
+
+    def _notify(self, source: str, status: str, value: Any, latency: Optional[float]):
+        if self.on_result is not None:
+            self.on_result(source, status, value, latency)
+
+    def call(self, source: str, reader: Callable[[], Any], default: Any = None) -> Any:
+        """Lee una fuente respetando su plazo"""
+        return self.collect(source, self.submit(source, reader), default)
+
+    def timed_out(self) -> List[str]:
+        """Fuentes cuya última lectura se abandonó o no pudo lanzarse"""
+        with self._lock:
+            return [source for source, status in self.last_status.items()
+                    if status in (STATUS_TIMEOUT, STATUS_BUSY)]
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Histograma de latencia y contadores por fuente"""
+        with self._lock:
+            stats = {}
+            for source in sorted(set(self._histograms) | set(self._counters)):
+                histogram = self._histograms.get(source, LatencyHistogram())
+                stats[source] = {
+                    'deadline_s': self.deadline(source),
+                    'last_status': self.last_status.get(source),
+                    **self._counters.get(source, {}),
+                    'latency': histogram.to_dict(),
+                }
+            return stats
+
+    def shutdown(self):
+        """Detiene los hilos libres del pool sin esperar lecturas colgadas"""
+        for _ in self._threads:
+            self._queue.put(None)
+
+    # ============== INTERNOS ==============
+
+    def _worker(self):
+        """Hilo del pool: ejecuta lecturas hasta recibir None"""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            future, source, reader, started = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(self._timed(source, reader, started, future))
+            except BaseException as e:
+                future.set_exception(e)
+
+    def _timed(self, source: str, reader: Callable[[], Any], started: float, future: _ReadFuture) -> Any:
+        """Ejecuta la lectura registrando su latencia real (incluso si ya se abandonó)"""
+        try:
+            return reader()
+        finally:
+            elapsed = time.monotonic() - started
+            future.latency = elapsed
+            with self._lock:
+                histogram = self._histograms.get(source)
+                if histogram is None:
+                    histogram = self._histograms[source] = LatencyHistogram()
+                histogram.record(elapsed)
+
+    def _count(self, source: str, status: str):
+        """Incrementa el contador de un resultado (llamar con lock)"""
+        counters = self._counters.get(source)
+        if counters is None:
+            counters = self._counters[source] = {STATUS_OK: 0, STATUS_TIMEOUT: 0, STATUS_BUSY: 0, STATUS_ERROR: 0}
+        counters[status] += 1
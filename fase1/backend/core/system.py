@@ -9,22 +9,33 @@ import signal
 import sys
 import json
 import logging
-from typing import Dict, Any
-from config import SENSOR_CONFIG, ALERT_CONFIG
+from typing import Dict, Any, List, Optional, Tuple
+from config import SENSOR_CONFIG, SYSTEM_CONFIG
 
 from .sensors.sensor_manager import SensorManager
+from .sensors.reading import SensorReading
 from .display.display_manager import DisplayManager
 from .mqtt.mqtt_manager import MQTTManager
+from .runtime import AsyncRuntime
+from .loop_timer import FixedRateTimer
+from .alerts import AlertEngine, AlertResult, AlertTracker
+from .alerts.state import EVENT_CLEARED, EVENT_RAISED, EVENT_REMINDER
 
 
 class SIEPASystem:
     """Sistema Principal SIEPA"""
     
-    def __init__(self, mode: str = 'testing', enable_mqtt: bool = False):
+    def __init__(self, mode: str = 'testing', enable_mqtt: bool = False, acquisition_mode: str = None,
+                 replay_source=None, runtime: str = None):
         self.mode = mode
         self.enable_mqtt = enable_mqtt
         self.running = False
         
+        # 'asyncio' (tareas en un event loop) o 'threaded' (loop bloqueante)
+        self.runtime_mode = runtime or SYSTEM_CONFIG.get('RUNTIME', 'asyncio')
+        self.runtime = None
+        self.loop_timer = None  # Cadencia del loop (se crea al arrancar)
+        
         # Configurar logging
         logging.basicConfig(
             level=logging.INFO,
@@ -39,12 +50,23 @@ class SIEPASystem:
         # Estado del motor (para control manual y automático)
         self.motor_state = False
         self.motor_manual_control = False  # Si está en modo manual, no controlar automáticamente
+        self._last_health_publish = float('-inf')
+        
+        # Reglas de alerta compiladas desde ALERT_CONFIG (recargables por MQTT) y su estado
+        self.alerts = AlertEngine()
+        self.alert_tracker = AlertTracker(self.alerts)
         
         # Inicializar componentes
-        self.sensor_manager = SensorManager(mode)
+        self.sensor_manager = SensorManager(mode, acquisition_mode, replay_source)
         self.display_manager = DisplayManager(mode)
         self.mqtt_manager = MQTTManager(mode) if enable_mqtt else None
         
+        # En replay las pausas se escalan con la velocidad de reproducción (0 = sin pausas)
+        self.time_scale = 1.0
+        if mode == 'replay':
+            self.time_scale = 1.0 / replay_source.speed if replay_source.speed > 0 else 0.0
+            self.display_manager.time_scale = self.time_scale
+        
 
         
         # Configurar manejo de señales para shutdown limpio
@@ -64,7 +86,9 @@ class SIEPASystem:
         if self.mqtt_manager:
             mqtt_connected = self.mqtt_manager.connect()
             if mqtt_connected:
-                self.mqtt_manager.subscribe_to_commands(self._handle_mqtt_command)
+                # Con el runtime asyncio los comandos se suscriben al arrancar el event loop
+                if self.runtime_mode != 'asyncio':
+                    self.mqtt_manager.subscribe_to_commands(self._handle_mqtt_command)
                 # Publicar estado inicial de sensores
                 sensor_status = self.sensor_manager.get_sensor_status()
                 self.mqtt_manager.publish_sensor_status(sensor_status)
@@ -72,7 +96,12 @@ class SIEPASystem:
         self.running = True
         
         try:
-            self._main_loop()
+            if self.runtime_mode == 'asyncio':
+                self.runtime = AsyncRuntime(self)
+                self.runtime.run()
+                self._shutdown()
+            else:
+                self._main_loop()
         except KeyboardInterrupt:
             self._shutdown()
         except Exception as e:
@@ -81,134 +110,155 @@ class SIEPASystem:
     
     def _main_loop(self):
         """Loop principal del sistema - estilo allin_w_display.py"""
+        self.loop_timer = self._new_loop_timer()
         while self.running:
+            if self.loop_timer:
+                self.loop_timer.begin_cycle()
+            
             # Leer todos los sensores
             sensor_data = self.sensor_manager.read_all_sensors()
             
-            # Extraer variables igual que allin_w_display.py
-            temp = sensor_data.get('temperature')
-            hum = sensor_data.get('humidity')
-            distancia = sensor_data.get('distance')
-            lux = sensor_data.get('light_lux')
-            voltaje_ldr = sensor_data.get('light_voltage')
-            ppm = sensor_data.get('air_quality_ppm')
-            voltaje_mq135 = sensor_data.get('air_quality_voltage')
-            presion = sensor_data.get('pressure')
-            hay_luz = sensor_data.get('light', False)
-            aire_malo = sensor_data.get('air_quality_bad', False)
-
-            # Controlar buzzer basado en calidad del aire (igual que allin_w_display.py)
-            self.sensor_manager.controlar_buzzer(aire_malo)
-            
-            # Agregar estado del buzzer a los datos
-            sensor_data['buzzer_state'] = aire_malo
+            if self.sensor_manager.replay_finished:
+                print(f"⏹️  Reproducción terminada: {self.sensor_manager.replay.get_stats()}")
+                self._shutdown()
+                return
             
-            # Mostrar en display (que ya tiene el formato de allin_w_display.py)
-            self.display_manager.display_sensor_data(sensor_data)
-
-            # Controlar motor: automático por aire malo o manual desde frontend
-            if not self.motor_manual_control:
-                # Control automático basado en calidad del aire
-                if aire_malo:
-                    self._set_motor_state(True)
-                    self.sensor_manager.activar_alerta("Aire contaminado", SENSOR_CONFIG['LED_AIRE'])
-                    
-                    # Enviar alerta crítica por MQTT
-                    if self.mqtt_manager:
-                        self.mqtt_manager.publish_alert("danger", "air_quality", 
-                                                       f"💨 Aire contaminado detectado: {ppm:.0f} ppm - ¡Ventilación activada!", 
-                                                       ppm, 400)
-                    
-                    # Mostrar mensaje en LCD igual que allin_w_display.py
-                    if hasattr(self.display_manager, 'lcd'):
-                        self.display_manager.clear()
-                        self.display_manager.write_at(0, 0, "⚠️ Aire contaminado ⚠️")
-                        self.display_manager.write_at(1, 0, "Toma precauciones")
-                    
-                    time.sleep(0.5)
-                    continue
-                else:
-                    # Desactivar motor si aire está bien y no hay control manual
-                    self._set_motor_state(False)
+            # Control: buzzer, motor y LEDs de alerta (en todos los ciclos)
+            led_states, alerts = self._control(sensor_data)
             
-            # Agregar estado del motor a los datos de sensores
-            sensor_data['motor_state'] = self.motor_state
+            # Telemetría: se publica en todos los ciclos, también con aire contaminado,
+            # antes del display para que sus pausas no la retrasen
+            self._publish(sensor_data, led_states)
+            self._publish_health_if_due()
             
-
-
-            # Verificar alertas críticas EXACTAMENTE igual que allin_w_display.py
-            if temp is not None and temp > 30:
-                self.sensor_manager.activar_alerta("Temp. muy alta", SENSOR_CONFIG['LED_TEMP'])
-                # Enviar alerta por MQTT
-                if self.mqtt_manager:
-                    self.mqtt_manager.publish_alert("danger", "temperature", 
-                                                   f"🔥 Temperatura muy alta: {temp}°C - ¡Riesgo de sobrecalentamiento!", 
-                                                   temp, 30)
-
-            if hum is not None and hum > 60:  # CAMBIO: 60% como en allin_w_display.py
-                self.sensor_manager.activar_alerta("Humedad alta", SENSOR_CONFIG['LED_HUM'])
-                # Enviar alerta por MQTT
-                if self.mqtt_manager:
-                    self.mqtt_manager.publish_alert("warning", "humidity", 
-                                                   f"☔ Humedad alta: {hum}% - Ambiente húmedo", 
-                                                   hum, 60)
-
-            # Usar no_hay_luz como en allin_w_display.py (basado en voltaje >= 1.2V)
-            no_hay_luz = sensor_data.get('no_hay_luz', False)
-            if voltaje_ldr is not None and no_hay_luz:
-                self.sensor_manager.activar_alerta("No hay luz", SENSOR_CONFIG['LED_LUZ'])
-                # Enviar alerta por MQTT
-                if self.mqtt_manager:
-                    self.mqtt_manager.publish_alert("info", "light", 
-                                                   "💡 No hay luz detectada en el ambiente", 
-                                                   voltaje_ldr, 1.2)
-
-            if presion is not None and (presion < 980 or presion > 1030):
-                self.sensor_manager.activar_alerta("Presion anormal", SENSOR_CONFIG['LED_AIRE'])  # Usar LED azul para presión
-                # Enviar alerta por MQTT
-                if self.mqtt_manager:
-                    alert_type = "danger" if presion < 980 or presion > 1030 else "warning"
-                    message = f"⚠️ Presión atmosférica anormal: {presion:.1f} hPa"
-                    if presion < 980:
-                        message += " - Presión muy baja"
-                    else:
-                        message += " - Presión muy alta"
-                    self.mqtt_manager.publish_alert(alert_type, "pressure", message, presion, 980 if presion < 980 else 1030)
+            # Mostrar en display (que ya tiene el formato de allin_w_display.py)
+            self._display(sensor_data, alerts.lcd_messages)
             
-            # Determinar qué LEDs están activos (automático vs manual)
-            if self.sensor_manager.is_manual_led_control():
-                # En modo manual, usar estados manuales
-                led_states = self.sensor_manager.get_led_states().copy()
-                led_states['manual_control'] = True
+            self._wait_next_cycle()
+    
+    def _new_loop_timer(self) -> Optional[FixedRateTimer]:
+        """
+        Cadencia de periodo fijo SENSOR_CONFIG['READ_INTERVAL'] (escalado por time_scale)
+        
+        Returns:
+            None en replay: el ritmo lo marca la grabación
+        """
+        if self.mode == 'replay' or self.time_scale <= 0:
+            return None
+        loop_config = SYSTEM_CONFIG.get('LOOP', {})
+        return FixedRateTimer(
+            SENSOR_CONFIG['READ_INTERVAL'] * self.time_scale,
+            policy=loop_config.get('OVERRUN_POLICY', 'skip'),
+            max_catch_up=loop_config.get('MAX_CATCH_UP', 3)
+        )
+    
+    def _wait_next_cycle(self):
+        """Espera hasta el siguiente vencimiento de la grilla (no un periodo fijo tras el trabajo)"""
+        if self.loop_timer:
+            time.sleep(self.loop_timer.end_cycle())
+    
+    def get_loop_stats(self) -> Dict[str, Any]:
+        """Runtime, periodo, retraso por ciclo, desbordes y tiempo de trabajo del loop"""
+        stats = {'runtime': self.runtime_mode}
+        if self.loop_timer:
+            stats.update(self.loop_timer.get_stats())
+        if self.runtime is not None:
+            stats['tasks'] = self.runtime.get_stats()
+        return stats
+    
+    def _control(self, sensor_data: SensorReading) -> Tuple[Dict[str, bool], AlertResult]:
+        """
+        Etapa de control: buzzer, motor y LEDs de alerta según una lectura
+        
+        Todas las reglas de ALERT_CONFIG se evalúan en una pasada y el mismo resultado
+        decide LEDs, buzzer, motor, avisos del LCD y alertas MQTT. Las reglas activas (con
+        histéresis) mantienen los actuadores; las alertas se notifican solo al activarse o
+        normalizarse, más los recordatorios. No publica telemetría.
+        
+        Returns:
+            (estados de los LEDs para la telemetría, resultado de las reglas)
+        """
+        alerts = self.alert_tracker.update(sensor_data)
+        
+        # El estado de aire contaminado publicado es el de la regla, no un umbral aparte
+        sensor_data.air_quality_bad = alerts.active.get('air_quality', sensor_data.air_quality_bad)
+        
+        # Buzzer según las reglas con acción 'buzzer' (aire contaminado)
+        self.sensor_manager.controlar_buzzer(alerts.buzzer)
+        sensor_data.buzzer_state = alerts.buzzer
+        
+        # Motor: automático según las reglas con acción 'motor' o manual desde frontend
+        if not self.motor_manual_control:
+            self._set_motor_state(alerts.motor)
+        sensor_data.motor_state = self.motor_state
+        
+        # LEDs de las reglas activas: se renuevan en cada ciclo, se anuncian solo al activarse
+        raised = {rule.id for event, rule, _ in alerts.events if event == EVENT_RAISED}
+        for rule, value in alerts.fired:
+            if 'led' in rule.actions:
+                self.sensor_manager.activar_alerta(rule.lcd, rule.led, notificar=rule.id in raised)
+        
+        # Alertas MQTT solo en las transiciones y recordatorios
+        for event, rule, value in alerts.events:
+            if event == EVENT_CLEARED:
+                print(f"✅ Alerta normalizada: {rule.lcd}")
+            if 'mqtt' not in rule.actions or not self.mqtt_manager:
+                continue
+            if event == EVENT_CLEARED:
+                message = f"✅ {rule.lcd} - valor normalizado: {value}"
+            elif event == EVENT_REMINDER:
+                message = f"🔁 Persiste: {rule.format_message(value)}"
             else:
-                # En modo automático, usar alertas como siempre
-                led_states = {
-                    'temperature': temp is not None and temp > 30,
-                    'humidity': hum is not None and hum > 60,  # 60% como en allin_w_display.py
-                    'light': voltaje_ldr is not None and no_hay_luz,  # Usar no_hay_luz
-                    'air_quality': aire_malo,
-                    'pressure': presion is not None and (presion < 980 or presion > 1030),
-                    'manual_control': False
-                }
-            
-            # Enviar por MQTT si está habilitado
-            if self.mqtt_manager and self.mqtt_manager.is_connected():
-                self.mqtt_manager.publish_sensor_data(sensor_data)
-                
-                # Publicar estado del buzzer solo si no está en modo manual
-                if not self.sensor_manager.is_manual_buzzer_control():
-                    self.mqtt_manager.publish_buzzer_state(aire_malo)
-                else:
-                    # En modo manual, publicar el estado manual actual
-                    self.mqtt_manager.publish_buzzer_state(self.sensor_manager.get_buzzer_state())
-                
-                # Publicar estado del motor
-                self.mqtt_manager.publish_motor_state(self.motor_state)
-                # Publicar estado de los LEDs
-                self.mqtt_manager.publish_led_status(led_states)
-            
-            # Esperar antes de la siguiente lectura (actualización cada 1 segundo)
-            time.sleep(1.0)
+                message = rule.format_message(value)
+            self.mqtt_manager.publish_alert(rule.severity, rule.sensor, message, value, rule.threshold,
+                                            state=event, rule=rule.id)
+        
+        # Determinar qué LEDs están activos (automático vs manual)
+        if self.sensor_manager.is_manual_led_control():
+            # En modo manual, usar estados manuales
+            led_states = self.sensor_manager.get_led_states().copy()
+            led_states['manual_control'] = True
+        else:
+            # En modo automático, una entrada por grupo de reglas
+            led_states = dict(alerts.active)
+            led_states['manual_control'] = False
+        return led_states, alerts
+    
+    def _display(self, sensor_data: SensorReading, alerts: Optional[List[str]] = None):
+        """Muestra la lectura en el display; con reglas 'lcd' activas, el aviso más grave"""
+        self.display_manager.display_sensor_data(sensor_data, alerts)
+    
+    def _publish(self, sensor_data: SensorReading, led_states: Dict[str, bool]):
+        """Etapa de telemetría: publica la lectura y el estado de los actuadores por MQTT"""
+        if not (self.mqtt_manager and self.mqtt_manager.is_connected()):
+            return
+        self.mqtt_manager.publish_sensor_data(sensor_data)
+        
+        # Estado real de las salidas (registro sombra), automático o manual
+        outputs = self.sensor_manager.get_output_states()
+        
+        # Publicar estado del buzzer
+        self.mqtt_manager.publish_buzzer_state(outputs['buzzer'])
+        
+        # Publicar estado del motor
+        self.mqtt_manager.publish_motor_state(outputs['motor'])
+        # Publicar estado de los LEDs
+        self.mqtt_manager.publish_led_status(led_states, outputs)
+    
+    def _get_health(self) -> Dict[str, Any]:
+        """Salud de los sensores más la cadencia del loop (carga útil del tópico de estado)"""
+        health = self.sensor_manager.get_sensor_health()
+        health['loop'] = self.get_loop_stats()
+        return health
+    
+    def _publish_health_if_due(self):
+        """Salud de los sensores cada HEALTH['PUBLISH_INTERVAL'] segundos"""
+        if not (self.mqtt_manager and self.mqtt_manager.is_connected()):
+            return
+        now = time.monotonic()
+        if now - self._last_health_publish >= SENSOR_CONFIG.get('HEALTH', {}).get('PUBLISH_INTERVAL', 30.0):
+            self.mqtt_manager.publish_sensor_health(self._get_health())
+            self._last_health_publish = now
     
     def _handle_mqtt_command(self, topic: str, payload: Dict[str, Any]):
         """Maneja comandos recibidos por MQTT"""
@@ -274,6 +324,26 @@ class SIEPASystem:
                             'timestamp': time.time()
                         }
                         self.mqtt_manager.client.publish(response_topic, json.dumps(response_payload))
+            elif sensor_type == 'interval':
+                # Cambio del intervalo de muestreo: {"sensor": "mq135", "interval": 0.25}
+                sensor_name = payload.get('sensor')
+                interval = payload.get('interval')
+                if sensor_name and interval is not None:
+                    success = self.sensor_manager.set_sample_interval(sensor_name, interval)
+                    if self.mqtt_manager:
+                        # Enviar confirmación con todos los intervalos vigentes
+                        response_payload = {
+                            'sensor': sensor_name,
+                            'success': success,
+                            'intervals': self.sensor_manager.get_sample_intervals(),
+                            'acquisition_mode': self.sensor_manager.acquisition_mode,
+                            'timestamp': time.time()
+                        }
+                        self.mqtt_manager.client.publish('GRUPO2/status/rasp01/sensors/intervals', json.dumps(response_payload))
+            elif sensor_type == 'health':
+                # Salud de los sensores bajo demanda (además de la publicación periódica)
+                if self.mqtt_manager:
+                    self.mqtt_manager.publish_sensor_health(self._get_health())
             else:
                 # Comando específico para un sensor
                 enabled = payload.get('enabled', True)
@@ -293,6 +363,24 @@ class SIEPASystem:
                 else:
                     print(f"❌ [Sensor Control] Error al cambiar estado del sensor {sensor_type}")
         
+        elif topic.startswith('GRUPO2/commands/rasp01/alerts/'):
+            # Reglas de alerta: 'reload' recompila sin reiniciar ({"rules": [...]} o, sin
+            # reglas, vuelve a leer ALERT_CONFIG de config/settings.py); 'rules' las consulta
+            alerts_command = topic.split('/')[-1]
+            success = True
+            if alerts_command == 'reload':
+                success = self.alerts.reload(payload.get('rules'))
+            if alerts_command in ('reload', 'rules') and self.mqtt_manager:
+                response_payload = {
+                    'command': alerts_command,
+                    'success': success,
+                    'reloads': self.alerts.reloads,
+                    'rules': self.alerts.get_rules(),
+                    'state': self.alert_tracker.get_status(),
+                    'timestamp': time.time()
+                }
+                self.mqtt_manager.client.publish('GRUPO2/status/rasp01/alerts/rules', json.dumps(response_payload))
+        
         elif topic.startswith('GRUPO2/commands/rasp01/leds/'):
             # Comandos de control de LEDs
             led_command_type = topic.split('/')[-1]  # control, individual, pattern
@@ -350,7 +438,7 @@ class SIEPASystem:
             
             elif led_command_type == 'pattern':
                 # Patrones de LEDs
-                pattern = payload.get('pattern')  # all_on, all_off, alternate, sequence
+                pattern = payload.get('pattern')  # all_on, all_off, alternate, chase, blink, breathe, strobe o tabla 'frames'
                 
                 print(f"🔧 [LED Backend] Patrón solicitado: {pattern}")
                 
@@ -360,7 +448,8 @@ class SIEPASystem:
                         self.sensor_manager.set_manual_led_control(True)
                         print("🎛️  LEDs cambiados a modo manual por comando de patrón")
                     
-                    self.sensor_manager.set_led_pattern(pattern)
+                    # Patrones animados corren en su propio hilo: este callback no se bloquea
+                    applied = self.sensor_manager.set_led_pattern(pattern, payload)
                     
                     # Enviar confirmación
                     if self.mqtt_manager:
@@ -368,6 +457,8 @@ class SIEPASystem:
                             'manual_mode': self.sensor_manager.is_manual_led_control(),
                             'leds': self.sensor_manager.get_led_states(),
                             'buzzer': self.sensor_manager.get_buzzer_state(),
+                            'pattern': self.sensor_manager.led_patterns.get_status(),
+                            'applied': applied,
                             'timestamp': time.time()
                         }
                         self.mqtt_manager.client.publish('GRUPO2/status/rasp01/leds', json.dumps(response_payload))
@@ -382,6 +473,11 @@ class SIEPASystem:
     
     def _shutdown(self):
         """Apaga el sistema de forma limpia"""
+        # Con el runtime asyncio en marcha se detienen sus tareas; start() termina el apagado
+        if self.runtime is not None and self.runtime.active:
+            self.runtime.stop()
+            return
+        
         print("\n🛑 Finalizando programa...")
         
         self.running = False
@@ -401,9 +497,9 @@ class SIEPASystem:
         print("✅ Sistema SIEPA finalizado correctamente")
         sys.exit(0)
     
-    def get_sensor_reading(self) -> Dict[str, Any]:
+    def get_sensor_reading(self) -> SensorReading:
         """Obtiene una lectura única de sensores (útil para testing)"""
-        return self.sensor_manager.read_all_sensors()
+        return self.sensor_manager.read_all_sensors().copy()
     
     def display_custom_message(self, message: str):
         """Muestra un mensaje personalizado en el display"""
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Prueba de degradación del Sistema SIEPA bajo fallos inyectados
+Ejecuta el loop principal en modo real sobre hardware emulado, con un escenario que alterna
+condiciones normales y de alarma, primero sin fallos y luego con el perfil de
+SENSOR_CONFIG['FAULT_INJECTION'] escalado por cada intensidad. Compara la latencia de
+adquisición, la tasa de publicación, los campos sin dato y la exactitud de las alertas
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+# Agregar el directorio actual al path para imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import SENSOR_CONFIG
+from core.hardware.emulation import install
+from core.sensors.calibration import CalibrationTables
+
+# Valores reales de cada fase del escenario
+PHASES = [
+    {'temperature': 24.0, 'humidity': 50.0, 'air_quality': 250.0, 'pressure': 1013.0, 'light': 600.0, 'distance': 100.0},
+    {'temperature': 34.0, 'humidity': 72.0, 'air_quality': 650.0, 'pressure': 970.0, 'light': 5.0, 'distance': 40.0},
+]
+FIELDS = ('temperature', 'humidity', 'distance', 'light_voltage', 'air_quality_voltage', 'pressure')
+
+
+def expected_alerts(truth, calibration, engine):
+    """Alertas que deberían activarse con los valores reales (mismas reglas que el loop)"""
+    return engine.evaluate({
+        'temperature': truth['temperature'],
+        'humidity': truth['humidity'],
+        'light_voltage': calibration.voltage_from_lux(truth['light']),
+        'air_quality_ppm': truth['air_quality'],
+        'pressure': truth['pressure'],
+    }).active
+
+
+def observed_alerts(reading, engine):
+    """Alertas que el loop activa con la lectura del ciclo"""
+    return engine.evaluate(reading).active
+
+
+class Recorder:
+    """Reemplazo del MQTTManager que cuenta las publicaciones"""
+
+    def __init__(self):
+        self.published = 0
+        self.alerts = 0
+        self.health = None
+
+    def is_connected(self):
+        return True
+
+    def publish_sensor_data(self, reading):
+        self.published += 1
+
+    def publish_alert(self, *args, **kwargs):
+        self.alerts += 1
+
+    def publish_buzzer_state(self, state):
+        pass
+
+    def publish_motor_state(self, state):
+        pass
+
+    def publish_led_status(self, led_states, outputs=None):
+        pass
+
+    def publish_sensor_health(self, health):
+        self.health = health
+
+    def disconnect(self):
+        pass
+
+
+def run(label, faults, args):
+    """Ejecuta el loop durante args.cycles ciclos y devuelve sus métricas"""
+    SENSOR_CONFIG['FAULT_INJECTION'] = faults
+    env = install({'SEED': args.seed})
+    from core.system import SIEPASystem
+
+    system = SIEPASystem(mode='real', enable_mqtt=False)
+    system.mqtt_manager = recorder = Recorder()
+    system.time_scale = args.interval / SENSOR_CONFIG['READ_INTERVAL']
+    system.display_manager.time_scale = system.time_scale  # Pausas del LCD escaladas igual que el loop
+    sensor_manager = system.sensor_manager
+    calibration = CalibrationTables(vref=SENSOR_CONFIG.get('ADC_VREF', 3.3))
+    engine = system.alerts
+
+    latencies, nulls = [], 0
+    matches = {alert: {'correct': 0, 'false_positive': 0, 'missed': 0} for alert in engine.sensors}
+    read = sensor_manager.read_all_sensors
+    state = {'cycle': 0, 'truth': None}
+
+    def timed_read(*a, **kw):
+        # Fase del escenario para este ciclo
+        cycle = state['cycle']
+        truth = PHASES[(cycle // args.phase) % len(PHASES)]
+        if truth is not state['truth']:
+            for channel, value in truth.items():
+                env.set_value(channel, value)
+            state['truth'] = truth
+        start = time.perf_counter()
+        reading = read(*a, **kw)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+        nonlocal nulls
+        nulls += sum(getattr(reading, field) is None for field in FIELDS)
+        if cycle % args.phase >= args.settle:
+            expected = expected_alerts(truth, calibration, engine)
+            for alert, active in observed_alerts(reading, engine).items():
+                if active == expected[alert]:
+                    matches[alert]['correct'] += 1
+                elif active:
+                    matches[alert]['false_positive'] += 1
+                else:
+                    matches[alert]['missed'] += 1
+
+        state['cycle'] += 1
+        if state['cycle'] >= args.cycles:
+            system.running = False
+        return reading
+
+    sensor_manager.read_all_sensors = timed_read
+    system.running = True
+    started = time.perf_counter()
+    system._main_loop()
+    elapsed = time.perf_counter() - started
+
+    fault_stats = sensor_manager.get_fault_stats()
+    breakers = {device: status['state'] for device, status in sensor_manager.get_breaker_status().items()}
+    sensor_manager.cleanup()
+
+    scored = sum(sum(m.values()) for m in matches.values())
+    correct = sum(m['correct'] for m in matches.values())
+    latencies.sort()
+    return {
+        'label': label,
+        'p50_ms': statistics.median(latencies),
+        'p95_ms': latencies[int(0.95 * (len(latencies) - 1))],
+        'max_ms': latencies[-1],
+        'publish_hz': recorder.published / elapsed,
+        'null_fields': nulls / (len(latencies) * len(FIELDS)),
+        'alert_accuracy': correct / scored if scored else None,
+        'alerts': matches,
+        'faults': fault_stats,
+        'breakers': breakers,
+    }
+
+
+def scaled_profile(profile, intensity, seed):
+    """Perfil de fallos con las probabilidades multiplicadas por intensity"""
+    targets = {
+        target: {key: min(1.0, value * intensity) if key in ('IO_ERROR', 'LATENCY', 'STUCK', 'OUT_OF_RANGE', 'DISCONNECT')
+                 else value for key, value in options.items()}
+        for target, options in profile.get('TARGETS', {}).items()
+    }
+    return {'ENABLED': True, 'SEED': seed, 'TARGETS': targets}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Degradación del sistema SIEPA bajo fallos inyectados')
+    parser.add_argument('--cycles', type=int, default=60, help='Ciclos del loop por ejecución')
+    parser.add_argument('--interval', type=float, default=0.5, help='Periodo del loop (s)')
+    parser.add_argument('--phase', type=int, default=15, help='Ciclos por fase del escenario (normal / alarma)')
+    parser.add_argument('--settle', type=int, default=5, help='Ciclos tras cada cambio de fase que no se evalúan')
+    parser.add_argument('--intensity', type=float, nargs='+', default=[1.0],
+                        help='Multiplicadores de las probabilidades de FAULT_INJECTION')
+    parser.add_argument('--seed', type=int, default=1, help='Semilla del hardware emulado y de los fallos')
+    args = parser.parse_args()
+
+    profile = SENSOR_CONFIG.get('FAULT_INJECTION', {})
+    runs = [('sin fallos', {'ENABLED': False})]
+    runs += [(f'x{intensity:g}', scaled_profile(profile, intensity, args.seed)) for intensity in args.intensity]
+
+    results = []
+    for label, faults in runs:
+        print(f"\n🧪 Ejecución '{label}': {args.cycles} ciclos cada {args.interval}s")
+        results.append(run(label, faults, args))
+    SENSOR_CONFIG['FAULT_INJECTION'] = profile
+
+    print("\n" + "=" * 78)
+    print(f"{'Ejecución':<12}{'p50 ms':>9}{'p95 ms':>9}{'max ms':>9}{'pub/s':>8}{'sin dato':>10}{'alertas ok':>12}")
+    print("-" * 78)
+    for r in results:
+        accuracy = f"{r['alert_accuracy']:.1%}" if r['alert_accuracy'] is not None else 'n/a'
+        print(f"{r['label']:<12}{r['p50_ms']:>9.1f}{r['p95_ms']:>9.1f}{r['max_ms']:>9.1f}"
+              f"{r['publish_hz']:>8.2f}{r['null_fields']:>10.1%}{accuracy:>12}")
+    print("=" * 78)
+
+    for r in results[1:]:
+        print(f"\n📋 {r['label']}: breakers {r['breakers']}")
+        for alert, counts in r['alerts'].items():
+            print(f"   - {alert:<12} {counts}")
+        for target, counts in r['faults']['targets'].items():
+            injected = {kind: n for kind, n in counts.items() if n and kind not in ('operations', 'is_disconnected', 'is_stuck')}
+            print(f"   🔧 {target:<11} {counts.get('operations', 0)} operaciones, {injected}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Prueba de carga del Sistema SIEPA con dispositivos virtuales
+Usa el motor de simulación realista (NumPy) para generar lecturas de miles de
+dispositivos y las envía al historial SQLite y/o al broker MQTT desde una sola máquina
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+# Agregar el directorio actual al path para imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import MQTT_CONFIG
+from core.sensors.simulation import SimulationEngine, CHANNELS, NUMPY_AVAILABLE
+from core.history.history_manager import HistoryManager, HistoryPoint
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Prueba de carga SIEPA con dispositivos simulados')
+    parser.add_argument('--devices', type=int, default=1000, help='Número de dispositivos virtuales')
+    parser.add_argument('--blocks', type=int, default=4, help='Bloques de SIMULATION_CONFIG[BLOCK_SIZE] pasos')
+    parser.add_argument('--seed', type=int, default=None, help='Semilla para reproducir la carga')
+    parser.add_argument('--history', metavar='DB', help='Guardar las lecturas en una base de historial')
+    parser.add_argument('--mqtt', action='store_true', help='Publicar las lecturas en el broker MQTT')
+    args = parser.parse_args()
+
+    if not NUMPY_AVAILABLE:
+        print("❌ NumPy no disponible - instale numpy para la prueba de carga")
+        sys.exit(1)
+
+    engine = SimulationEngine(n_devices=args.devices, seed=args.seed)
+    history = HistoryManager(db_path=args.history) if args.history else None
+
+    client = None
+    if args.mqtt:
+        import paho.mqtt.client as mqtt
+        client = mqtt.Client()
+        client.connect(MQTT_CONFIG['BROKER_HOST'], MQTT_CONFIG['BROKER_PORT'], 60)
+        client.loop_start()
+
+    print(f"🎲 Simulando {args.devices} dispositivos x {args.blocks * engine.block_size} pasos")
+
+    total_points = 0
+    gen_time = 0.0
+    sink_time = 0.0
+    for _ in range(args.blocks):
+        started = time.perf_counter()
+        block = engine.generate_block()
+        gen_time += time.perf_counter() - started
+
+        started = time.perf_counter()
+        if history:
+            points = [
+                HistoryPoint(channel, float(block[k, d, c]), engine.block_time + k * engine.dt, {'device': f"sim{d:05d}"})
+                for k in range(block.shape[0])
+                for d in range(block.shape[1])
+                for c, channel in enumerate(CHANNELS)
+            ]
+            history.add_batch_sensor_data(points)
+        if client:
+            for k in range(block.shape[0]):
+                for d in range(block.shape[1]):
+                    payload = dict(zip(CHANNELS, block[k, d].round(2).tolist()))
+                    payload['device'] = f"sim{d:05d}"
+                    client.publish(f"GRUPO2/sensores/sim{d:05d}", json.dumps(payload), qos=0)
+        sink_time += time.perf_counter() - started
+        total_points += block.size
+
+    if client:
+        client.loop_stop()
+        client.disconnect()
+
+    print(f"✅ {total_points} valores generados en {gen_time:.2f}s "
+          f"({total_points / gen_time:,.0f} valores/s)")
+    if history or client:
+        print(f"📤 Envío a historial/MQTT: {sink_time:.2f}s ({total_points / sink_time:,.0f} valores/s)")
+
+
+if __name__ == "__main__":
+    main()
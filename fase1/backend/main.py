@@ -12,6 +12,7 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from core.system import SIEPASystem
+from core.sensors.replay import ReplaySource
 
 def main():
     parser = argparse.ArgumentParser(
@@ -23,14 +24,45 @@ Ejemplos de uso:
   python main.py --mode real        # Modo real (sensores físicos)
   python main.py --mode testing --mqtt  # Testing con MQTT
   python main.py --mode real --mqtt     # Modo completo con MQTT
+  python main.py --mode real --acquisition concurrent  # Un hilo por sensor
+  python main.py --mode real --acquisition scheduled   # Intervalo propio por sensor
+  python main.py --mode real --acquisition adaptive    # Intervalo según la velocidad de cambio
+  python main.py --emulate-hardware --mqtt  # Modo real sobre hardware emulado (sin Raspberry Pi)
+  python main.py --runtime threaded          # Loop bloqueante en lugar del runtime asyncio
+  python main.py --mode replay --replay-db data/sensor_history.db --speed 100
         """
     )
     
     parser.add_argument(
         '--mode', 
-        choices=['real', 'testing'], 
+        choices=['real', 'testing', 'replay'], 
         default='testing',
-        help='Modo de ejecución: real (sensores físicos) o testing (datos simulados)'
+        help='Modo de ejecución: real (sensores físicos), testing (datos simulados) o replay (datos grabados)'
+    )
+    
+    parser.add_argument(
+        '--replay-db',
+        help='Base SQLite grabada para el modo replay (sensor_data o lecturas_sensores)'
+    )
+    
+    parser.add_argument(
+        '--replay-table',
+        choices=['sensor_data', 'lecturas_sensores'],
+        default=None,
+        help='Tabla a reproducir (por defecto se detecta)'
+    )
+    
+    parser.add_argument(
+        '--replay-device',
+        default=None,
+        help='Dispositivo a reproducir (solo lecturas_sensores, p. ej. rasp01)'
+    )
+    
+    parser.add_argument(
+        '--speed',
+        type=float,
+        default=1.0,
+        help='Velocidad de reproducción: 1 = tiempo real, 10 = 10x, 0 = lo más rápido posible'
     )
     
     parser.add_argument(
@@ -39,6 +71,26 @@ Ejemplos de uso:
         help='Habilitar comunicación MQTT con el frontend'
     )
     
+    parser.add_argument(
+        '--acquisition',
+        choices=['sequential', 'concurrent', 'scheduled', 'adaptive'],
+        default=None,
+        help='Modo de adquisición de sensores (por defecto SENSOR_CONFIG[ACQUISITION_MODE])'
+    )
+    
+    parser.add_argument(
+        '--runtime',
+        choices=['asyncio', 'threaded'],
+        default=None,
+        help='Runtime del loop principal (por defecto SYSTEM_CONFIG[RUNTIME])'
+    )
+    
+    parser.add_argument(
+        '--emulate-hardware',
+        action='store_true',
+        help='Ejecutar el modo real sobre hardware emulado (GPIO, I2C, SPI y sensores con sus tiempos)'
+    )
+    
     parser.add_argument(
         '--version',
         action='version',
@@ -47,17 +99,45 @@ Ejemplos de uso:
     
     args = parser.parse_args()
     
+    if args.emulate_hardware:
+        from core.hardware.emulation import install
+        if args.mode != 'real':
+            print(f"ℹ️ --emulate-hardware usa el modo real (se ignora --mode {args.mode})")
+            args.mode = 'real'
+        install()
+    
+    replay_source = None
+    if args.mode == 'replay':
+        if not args.replay_db:
+            parser.error("--mode replay requiere --replay-db")
+        replay_source = ReplaySource(
+            args.replay_db,
+            table=args.replay_table,
+            speed=args.speed,
+            device=args.replay_device
+        )
+    
     # Banner de inicio
     print("=" * 60)
     print("🌟 SISTEMA SIEPA - MONITOREO AMBIENTAL")
     print("=" * 60)
     print(f"📋 Modo: {args.mode.upper()}")
     print(f"📡 MQTT: {'HABILITADO' if args.mqtt else 'DESHABILITADO'}")
+    if args.emulate_hardware:
+        print("🧪 Hardware: EMULADO")
+    if replay_source:
+        print(f"⏯️  Replay: {args.replay_db} ({replay_source.table}) a {args.speed or 'máxima'}x")
     print("=" * 60)
     
     try:
         # Crear e iniciar el sistema
-        system = SIEPASystem(mode=args.mode, enable_mqtt=args.mqtt)
+        system = SIEPASystem(
+            mode=args.mode,
+            enable_mqtt=args.mqtt,
+            acquisition_mode=args.acquisition,
+            replay_source=replay_source,
+            runtime=args.runtime
+        )
         system.start()
         
 
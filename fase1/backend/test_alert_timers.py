@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Script de prueba de los temporizadores de LEDs de alerta
+Verifica sobre el registro sombra (modo testing, sin GPIO real) que la rueda de
+temporizadores apaga el LED en ALERT_DURATION, que rearmar la alerta extiende el plazo
+y que el control manual de LEDs cancela el apagado pendiente
+"""
+
+import sys
+import time
+from core.sensors.sensor_manager import SensorManager
+from config.settings import SENSOR_CONFIG
+
+TOLERANCE = 0.1    # s - tick de la rueda más el intervalo de sondeo y la planificación del hilo
+POLL = 0.005       # s - intervalo de sondeo del registro sombra
+
+
+def wait_until_off(outputs, pin, limit):
+    """Sondea el registro sombra hasta que el LED se apague; devuelve el instante o None"""
+    deadline = time.monotonic() + limit
+    while time.monotonic() < deadline:
+        if not outputs.get(pin):
+            return time.monotonic()
+        time.sleep(POLL)
+    return None
+
+
+def check(description, ok, detail=''):
+    print(f"   {'✅' if ok else '❌'} {description}{f' ({detail})' if detail else ''}")
+    return ok
+
+
+def test_alert_timers():
+    """Apagado en ALERT_DURATION, rearme y cancelación por control manual"""
+    print("🧪 === TEST DE TEMPORIZADORES DE ALERTA ===")
+
+    duration = SENSOR_CONFIG.get('ALERT_DURATION', 5)
+    pin = SENSOR_CONFIG['LED_TEMP']
+    print(f"\n1. Inicializando SensorManager en modo testing (ALERT_DURATION={duration}s, "
+          f"tolerancia {TOLERANCE}s)...")
+    sensor_manager = SensorManager(mode='testing')
+    outputs = sensor_manager.outputs
+    results = []
+
+    try:
+        # Test 1: el LED se apaga en ALERT_DURATION
+        print("\n2. Alerta simple...")
+        started = time.monotonic()
+        sensor_manager.activar_alerta("Prueba de temperatura", pin)
+        results.append(check("LED encendido al activar la alerta", outputs.get(pin)))
+        off_at = wait_until_off(outputs, pin, duration + 1.0)
+        elapsed = off_at - started if off_at is not None else None
+        results.append(check(
+            f"LED apagado a los {duration}s",
+            elapsed is not None and duration <= elapsed <= duration + TOLERANCE,
+            f"{elapsed:.3f}s" if elapsed is not None else "no se apagó"
+        ))
+
+        # Test 2: rearmar a mitad de plazo extiende el apagado
+        print("\n3. Rearme a mitad de plazo...")
+        sensor_manager.activar_alerta("Prueba de temperatura", pin)
+        time.sleep(duration / 2)
+        rearmed = time.monotonic()
+        sensor_manager.activar_alerta("Prueba de temperatura", pin, notificar=False)
+        time.sleep(duration / 2 + TOLERANCE)
+        results.append(check("LED sigue encendido después del plazo original", outputs.get(pin)))
+        off_at = wait_until_off(outputs, pin, duration)
+        elapsed = off_at - rearmed if off_at is not None else None
+        results.append(check(
+            f"LED apagado a los {duration}s del rearme",
+            elapsed is not None and duration <= elapsed <= duration + TOLERANCE,
+            f"{elapsed:.3f}s" if elapsed is not None else "no se apagó"
+        ))
+
+        # Test 3: el control manual cancela el apagado pendiente
+        print("\n4. Cambio a control manual con una alerta activa...")
+        sensor_manager.activar_alerta("Prueba de temperatura", pin)
+        key = ('led', pin)
+        results.append(check("Temporizador armado", sensor_manager.timers.is_armed(key)))
+        sensor_manager.set_manual_led_control(True)
+        results.append(check("Temporizador cancelado", not sensor_manager.timers.is_armed(key)))
+        sensor_manager.set_led_state('temperature', True)
+        time.sleep(duration + TOLERANCE)
+        results.append(check("El LED manual no se apaga al vencer el plazo de la alerta", outputs.get(pin)))
+        sensor_manager.set_manual_led_control(False)
+    finally:
+        sensor_manager.cleanup()
+
+    passed = sum(results)
+    print(f"\n📊 {passed}/{len(results)} verificaciones correctas")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(0 if test_alert_timers() else 1)
+    except KeyboardInterrupt:
+        print("\n🛑 Prueba interrumpida por el usuario")